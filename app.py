@@ -5,6 +5,7 @@ Aplicación Flask para análisis de ensayos de laboratorio de suelos
 
 from flask import Flask, render_template, jsonify, request, send_file
 from datetime import datetime
+from functools import wraps
 import os
 import sys
 import io
@@ -22,6 +23,7 @@ import matplotlib
 matplotlib.use('Agg')  # Backend sin GUI
 import matplotlib.pyplot as plt
 import base64
+import pandas as pd
 
 # Agregar el directorio actual al path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -30,11 +32,24 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from backend.etl.hidrometria_etl import HidrometriaETL
 from backend.etl.clasificacion_etl import ClasificacionETL
 from backend.etl.atterberg_etl import AtterbergETL
+from backend.etl.warmup import DatasetWarmup
+from backend.etl.plantillas import cargar_plantillas
+from backend.etl.snapshot import DIRECTORIO_SNAPSHOTS
+from backend.etl.dataset_cache import datasets
 
 # Importar procesadores
 from backend.processors.humedad_processor import HumedadProcessor
 from backend.processors.atterberg_processor import AtterbergProcessor
 from backend.processors.clasificacion_processor import ClasificacionProcessor
+from backend.processors.hidrometria_processor import HidrometriaProcessor
+from backend.processors.granulometria_processor import GranulometriaProcessor
+from backend.processors.sucs_processor import SucsProcessor
+from backend.processors.aashto_processor import AashtoProcessor
+from backend.processors.fases_processor import FasesProcessor
+from backend.processors.incertidumbre_processor import IncertidumbreProcessor
+from backend.processors.carta_plasticidad import CartaPlasticidad
+from backend.processors.cache import resultados as cache_resultados
+from backend.processors.rejilla_clasificacion import CargadorRejilla, consultar_exacto, describir_consulta
 
 app = Flask(__name__, 
             static_folder='.',
@@ -47,43 +62,87 @@ app.config['JSON_AS_ASCII'] = False
 # Rutas de datos
 DATA_DIR = os.path.join(os.path.dirname(__file__), 'Data')
 
+# Lectura streaming (openpyxl solo lectura) para libros muy grandes
+STREAMING = os.environ.get('HSGVA_STREAMING', '0') == '1'
+
+# Plantillas de disposición adicionales (Data/plantillas/*.json); cada ETL usa
+# la indicada en HSGVA_PLANTILLA_<ENSAYO> o la suya por defecto
+PLANTILLAS_DIR = os.path.join(DATA_DIR, 'plantillas')
+if os.path.isdir(PLANTILLAS_DIR):
+    print(f"🧩 Plantillas cargadas: {cargar_plantillas(PLANTILLAS_DIR)}")
+
 # Inicializar ETLs
-hidrometria_etl = HidrometriaETL(os.path.join(DATA_DIR, 'Hidrometria #4.xlsx'))
-clasificacion_etl = ClasificacionETL(os.path.join(DATA_DIR, 'Clasificacion de Suelos #2.xlsx'))
-atterberg_etl = AtterbergETL(os.path.join(DATA_DIR, 'Limites de Atterberg.xlsx'))
+hidrometria_etl = HidrometriaETL(os.path.join(DATA_DIR, 'Hidrometria #4.xlsx'), streaming=STREAMING,
+                                 plantilla=os.environ.get('HSGVA_PLANTILLA_HIDROMETRIA'))
+clasificacion_etl = ClasificacionETL(os.path.join(DATA_DIR, 'Clasificacion de Suelos #2.xlsx'), streaming=STREAMING,
+                                     plantilla=os.environ.get('HSGVA_PLANTILLA_CLASIFICACION'))
+atterberg_etl = AtterbergETL(os.path.join(DATA_DIR, 'Limites de Atterberg.xlsx'), streaming=STREAMING,
+                             plantilla=os.environ.get('HSGVA_PLANTILLA_ATTERBERG'))
+
+# Precarga de datos en segundo plano (el servidor no espera a openpyxl)
+warmup = DatasetWarmup()
+warmup.registrar('hidrometria', hidrometria_etl, 'Hidrometría')
+warmup.registrar('clasificacion', clasificacion_etl, 'Clasificación')
+warmup.registrar('atterberg', atterberg_etl, 'Atterberg')
+
+# Rejilla de clasificación para /api/clasificacion/mapa (se guarda junto a los
+# snapshots); no es un dataset de la precarga: servidor.py la construye en el
+# maestro antes del fork y, con app.py directo, se carga con la primera consulta
+REJILLA_DIR = os.path.join(DATA_DIR, DIRECTORIO_SNAPSHOTS) if os.environ.get('HSGVA_SNAPSHOTS', '1') != '0' else None
+rejilla_clasificacion = CargadorRejilla(REJILLA_DIR)
 
 print("=" * 60)
 print("🏗️  SISTEMA DE ANÁLISIS GEOTÉCNICO - HSGVA")
 print("=" * 60)
-
-# Cargar datos al iniciar
-print("\n📊 Cargando datos de ensayos...")
-try:
-    hidrometria_data = hidrometria_etl.load_data()
-    print(f"✅ Hidrometría: {len(hidrometria_data)} registros cargados")
-except Exception as e:
-    print(f"⚠️  Hidrometría: Error al cargar - {str(e)}")
-    hidrometria_data = []
-
-try:
-    clasificacion_data = clasificacion_etl.load_data()
-    print(f"✅ Clasificación: {len(clasificacion_data)} registros cargados")
-except Exception as e:
-    print(f"⚠️  Clasificación: Error al cargar - {str(e)}")
-    clasificacion_data = []
-
-try:
-    atterberg_data = atterberg_etl.load_data()
-    print(f"✅ Atterberg: {len(atterberg_data)} registros cargados")
-except Exception as e:
-    print(f"⚠️  Atterberg: Error al cargar - {str(e)}")
-    atterberg_data = []
-
-print("\n" + "=" * 60)
+print("\n📊 Los datos de ensayos se precargan en segundo plano (ver /api/health/ready)")
 print("✅ Servidor listo en: http://localhost:5000")
 print("=" * 60 + "\n")
 
 
+def respuesta_calentando(*nombres):
+    """Respuesta 503 mientras los datasets requeridos se están precargando"""
+    estado = warmup.estado()
+    respuesta = jsonify({
+        'success': False,
+        'estado': 'calentando',
+        'error': 'Los datos se están cargando, intente de nuevo en unos segundos',
+        'datasets': {n: estado['datasets'][n]['estado'] for n in nombres}
+    })
+    respuesta.headers['Retry-After'] = '2'
+    return respuesta, 503
+
+
+def respuesta_no_disponible(*nombres):
+    """Respuesta para datasets no listos: error de carga si alguno falló, si no 'calentando'"""
+    fallidos = warmup.fallidos(*nombres)
+    if not fallidos:
+        return respuesta_calentando(*nombres)
+    return jsonify({
+        'success': False,
+        'estado': 'error',
+        'error': '; '.join(f"{nombre}: {error}" for nombre, error in fallidos.items()),
+        'datasets': fallidos
+    }), 503
+
+
+def requiere_datos(*nombres):
+    """Decorador: responder 'calentando' (o el error de carga) hasta que los datasets estén cargados"""
+    def decorador(vista):
+        @wraps(vista)
+        def envoltura(*args, **kwargs):
+            if not warmup.esta_listo(*nombres):
+                return respuesta_no_disponible(*nombres)
+            return vista(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+@app.before_request
+def asegurar_precarga():
+    """Lanzar la precarga con la primera petición si el servidor no lo hizo"""
+    warmup.iniciar()
+
+
 # ==================== RUTAS WEB ====================
 
 @app.route('/')
@@ -93,9 +152,13 @@ def index():
 
 
 @app.route('/api/dashboard')
+@requiere_datos('hidrometria', 'clasificacion', 'atterberg')
 def dashboard_data():
     """Datos del dashboard principal"""
     try:
+        hidrometria_data = warmup.obtener('hidrometria', [])
+        clasificacion_data = warmup.obtener('clasificacion', [])
+        atterberg_data = warmup.obtener('atterberg', [])
         total_proyectos = len(set([d.get('proyecto', '') for d in clasificacion_data if d.get('proyecto')]))
         total_ensayos = len(hidrometria_data) + len(clasificacion_data) + len(atterberg_data)
         
@@ -121,9 +184,11 @@ def dashboard_data():
 
 
 @app.route('/api/hidrometria')
+@requiere_datos('hidrometria')
 def get_hidrometria():
     """Obtener datos de hidrometría"""
     try:
+        hidrometria_data = warmup.obtener('hidrometria', [])
         return jsonify({
             'success': True,
             'data': hidrometria_data,
@@ -133,10 +198,46 @@ def get_hidrometria():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/hidrometria/distribucion', methods=['POST'])
+def calcular_distribucion_hidrometria():
+    """
+    Calcular la distribución granulométrica por hidrometría (ley de Stokes)
+    
+    Acepta {'muestras': [...]} para un lote completo o una sola muestra con
+    'lecturas' [{t_min, temperatura, lr}], 'gs', 'ws' y opcionalmente 'cm',
+    'cc' y 'alfa'. Sin cuerpo se reducen las lecturas del libro cargado.
+    Con 'usar_tablas': true, K y Ct se leen de las rejillas precalculadas.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        
+        if 'muestras' in data:
+            muestras = data['muestras']
+        elif 'lecturas' in data:
+            muestras = [data]
+        else:
+            ensayo = hidrometria_etl.get_lecturas()
+            lecturas = ensayo['lecturas'][['fecha', 'hora', 't_min', 'temperatura', 'lr']]
+            muestras = [dict(ensayo['parametros'], id='Hidrometria #4', lecturas=lecturas)]
+        
+        processor = HidrometriaProcessor(usar_tablas=bool(data.get('usar_tablas')))
+        resultados = processor.calcular_distribucion_lote(muestras)
+        
+        return jsonify({
+            'success': True,
+            'resultados': resultados,
+            'count': len(resultados)
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+
 @app.route('/api/clasificacion')
+@requiere_datos('clasificacion')
 def get_clasificacion():
     """Obtener datos de clasificación"""
     try:
+        clasificacion_data = warmup.obtener('clasificacion', [])
         return jsonify({
             'success': True,
             'data': clasificacion_data,
@@ -147,6 +248,7 @@ def get_clasificacion():
 
 
 @app.route('/api/clasificacion/datos')
+@requiere_datos('clasificacion')
 def get_clasificacion_datos():
     """Obtener datos completos de clasificación desde el Excel"""
     try:
@@ -160,10 +262,53 @@ def get_clasificacion_datos():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/granulometria/curva', methods=['POST'])
+def calcular_curva_granulometrica():
+    """
+    Calcular la curva granulométrica completa (tamizado + hidrometría)
+    
+    Acepta {'muestras': [...]} con 'tamices' [{abertura_mm, pct_pasa}] y
+    opcionalmente 'hidrometria' [{d_mm, pct_mas_fino}]. Sin cuerpo se usan los
+    tamices de las muestras del libro de clasificación. Con 'll' e 'ip' cada
+    resultado incluye además su clasificación SUCS usando Cu y Cc.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        if 'muestras' in data:
+            muestras = data['muestras']
+        elif not warmup.esta_listo('clasificacion'):
+            return respuesta_no_disponible('clasificacion')
+        else:
+            muestras = clasificacion_etl.get_tamices_por_muestra()
+        
+        processor = GranulometriaProcessor()
+        resultados = processor.calcular_lote(muestras)
+        
+        if data.get('ll') is not None and data.get('ip') is not None:
+            clasificador = ClasificacionProcessor()
+            for resultado in resultados:
+                datos = processor.para_clasificacion(resultado, float(data['ll']), float(data['ip']))
+                resultado['sucs'] = clasificador.clasificar_sucs(
+                    datos['grava'], datos['arena'], datos['finos'],
+                    datos['limite_liquido'], datos['indice_plasticidad'],
+                    datos['coef_uniformidad'], datos['coef_curvatura']
+                )
+        
+        return jsonify({
+            'success': True,
+            'resultados': resultados,
+            'count': len(resultados)
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+
 @app.route('/api/atterberg')
+@requiere_datos('atterberg')
 def get_atterberg():
     """Obtener datos de límites de Atterberg"""
     try:
+        atterberg_data = warmup.obtener('atterberg', [])
         return jsonify({
             'success': True,
             'data': atterberg_data,
@@ -174,6 +319,7 @@ def get_atterberg():
 
 
 @app.route('/api/atterberg/datos')
+@requiere_datos('atterberg')
 def get_atterberg_datos():
     """Obtener datos completos de Atterberg desde el Excel"""
     try:
@@ -222,6 +368,45 @@ def calcular_humedad():
         return jsonify({'success': False, 'error': str(e)}), 400
 
 
+@app.route('/api/humedad/calcular/lote', methods=['POST'])
+def calcular_humedad_lote():
+    """
+    Calcular la humedad de una tanda completa de recipientes
+    
+    Acepta JSON ({'registros': [...], 'calculos': bool} o directamente una
+    lista), o un CSV como cuerpo (text/csv) o como archivo 'archivo' de un
+    formulario. Las filas con datos inválidos devuelven su propio 'error' sin
+    detener el lote. Los pasos del cálculo se incluyen con calculos=true.
+    """
+    try:
+        calculos = request.args.get('calculos', '').lower() in ('1', 'true', 'si')
+        if 'archivo' in request.files:
+            registros = pd.read_csv(request.files['archivo'])
+        elif request.mimetype == 'text/csv':
+            registros = pd.read_csv(io.BytesIO(request.get_data()))
+        else:
+            data = request.get_json()
+            if isinstance(data, dict):
+                calculos = calculos or bool(data.get('calculos'))
+                registros = data.get('registros', [])
+            else:
+                registros = data
+        
+        processor = HumedadProcessor()
+        resultados = processor.calcular_humedad_lote(registros, incluir_calculos=calculos)
+        errores = sum(1 for r in resultados if r['error'])
+        
+        return jsonify({
+            'success': True,
+            'resultados': resultados,
+            'count': len(resultados),
+            'validos': len(resultados) - errores,
+            'errores': errores
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+
 @app.route('/api/atterberg/calcular', methods=['POST'])
 def calcular_atterberg():
     """Calcular límites de Atterberg"""
@@ -257,6 +442,87 @@ def calcular_atterberg():
         return jsonify({'success': False, 'error': str(e)}), 400
 
 
+@app.route('/api/atterberg/calcular/lote', methods=['POST'])
+def calcular_atterberg_lote():
+    """
+    Calcular los límites de Atterberg de muchas muestras en una petición
+    
+    Acepta {'muestras': [...]} con 'limites_liquido' [{golpes, humedad}] y
+    opcionalmente 'limites_plastico' e 'id'. El LL se obtiene de la recta de
+    fluidez por mínimos cuadrados de todas las muestras a la vez. Sin cuerpo
+    se usa el ensayo del libro cargado. 'puntos_curva' añade la curva ajustada.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        if 'muestras' in data:
+            muestras = data['muestras']
+        elif not warmup.esta_listo('atterberg'):
+            return respuesta_no_disponible('atterberg')
+        else:
+            ensayo = atterberg_etl.get_all_data()
+            muestras = [{
+                'id': 'Limites de Atterberg',
+                'limites_liquido': [{'golpes': e['n_golpes'], 'humedad': e['w_percent']}
+                                    for e in ensayo.get('limite_liquido', [])],
+                'limites_plastico': [e['w_percent'] for e in ensayo.get('limite_plastico', [])]
+            }]
+        
+        processor = AtterbergProcessor()
+        resultados = processor.calcular_limite_liquido_lote(
+            [{'id': m.get('id', i), 'puntos': m.get('limites_liquido')} for i, m in enumerate(muestras, 1)],
+            puntos_curva=int(data.get('puntos_curva', 0))
+        )
+        
+        for muestra, resultado in zip(muestras, resultados):
+            if not muestra.get('limites_plastico'):
+                continue
+            resultado['limite_plastico'] = processor.calcular_limite_plastico(muestra['limites_plastico'])
+            if resultado['error'] is None:
+                resultado['indice_plasticidad'] = processor.calcular_indice_plasticidad(
+                    resultado['limite_liquido'], resultado['limite_plastico']
+                )
+        
+        return jsonify({
+            'success': True,
+            'resultados': resultados,
+            'count': len(resultados)
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+
+@app.route('/api/atterberg/carta', methods=['GET', 'POST'])
+def carta_plasticidad():
+    """
+    Geometría de la carta de plasticidad y clasificación de los puntos de un proyecto
+    
+    GET devuelve solo las líneas y regiones. POST acepta columnas
+    {'ll': [...], 'ip': [...], 'id': [...]} o {'puntos': [{'ll', 'ip', 'id'}, ...]}
+    y añade 'puntos' con la clase (CL, ML, CH, MH, CL-ML) de cada uno y la
+    marca de los que quedan por encima de la línea U.
+    """
+    try:
+        carta = CartaPlasticidad()
+        respuesta = {'success': True, 'carta': carta.geometria()}
+        if request.method == 'GET':
+            return jsonify(respuesta)
+        
+        data = request.get_json()
+        if isinstance(data, list) or 'puntos' in data:
+            puntos = data if isinstance(data, list) else data['puntos']
+            ll = [p.get('ll') for p in puntos]
+            ip = [p.get('ip') for p in puntos]
+            ids = [p.get('id', i + 1) for i, p in enumerate(puntos)]
+        else:
+            ll, ip, ids = data['ll'], data['ip'], data.get('id')
+        
+        respuesta['puntos'] = carta.clasificar(ll, ip, ids)
+        respuesta['count'] = len(respuesta['puntos']['clase'])
+        return jsonify(respuesta)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+
 @app.route('/api/clasificacion/sucs', methods=['POST'])
 def clasificar_sucs():
     """Clasificar suelo según SUCS"""
@@ -269,7 +535,9 @@ def clasificar_sucs():
             porcentaje_arena=float(data.get('arena', 0)),
             porcentaje_finos=float(data.get('finos', 0)),
             limite_liquido=float(data.get('ll', 0)) if data.get('ll') else None,
-            indice_plasticidad=float(data.get('ip', 0)) if data.get('ip') else None
+            indice_plasticidad=float(data.get('ip', 0)) if data.get('ip') else None,
+            coef_uniformidad=float(data['cu']) if data.get('cu') is not None else None,
+            coef_curvatura=float(data['cc']) if data.get('cc') is not None else None
         )
         
         return jsonify({
@@ -280,6 +548,202 @@ def clasificar_sucs():
         return jsonify({'success': False, 'error': str(e)}), 400
 
 
+@app.route('/api/clasificacion/sucs/lote', methods=['POST'])
+def clasificar_sucs_lote():
+    """
+    Clasificar según SUCS un conjunto completo de muestras
+    
+    Acepta {'muestras': [...]} con 'grava', 'arena', 'finos' y opcionalmente
+    'id', 'll', 'ip', 'cu' y 'cc'. Las muestras cuyas fracciones no suman
+    100 % devuelven su propio 'error' sin detener el lote.
+    """
+    try:
+        data = request.get_json()
+        
+        processor = SucsProcessor()
+        resultados = processor.clasificar_lote(data['muestras'])
+        errores = sum(1 for r in resultados if r['error'])
+        
+        return jsonify({
+            'success': True,
+            'resultados': resultados,
+            'count': len(resultados),
+            'errores': errores
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+
+@app.route('/api/clasificacion/aashto/lote', methods=['POST'])
+def clasificar_aashto_lote():
+    """
+    Clasificar según AASHTO un conjunto completo de muestras
+    
+    Acepta {'muestras': [...]} con 'finos' (% pasa N° 200), 'll', 'ip' y
+    opcionalmente 'id', 'p10' y 'p40' (% pasa N° 10 y N° 40), con los que se
+    aplican los criterios granulométricos completos de M 145.
+    """
+    try:
+        data = request.get_json()
+        
+        processor = AashtoProcessor()
+        resultados = processor.clasificar_lote(data['muestras'])
+        errores = sum(1 for r in resultados if r['error'])
+        
+        return jsonify({
+            'success': True,
+            'resultados': resultados,
+            'count': len(resultados),
+            'errores': errores
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+
+@app.route('/api/fases/calcular', methods=['POST'])
+def calcular_fases():
+    """
+    Resolver las relaciones de fases de una probeta o de un lote
+    
+    Cada probeta trae cualquier subconjunto suficiente de magnitudes (p. ej.
+    densidad_seca + humedad + gravedad_especifica, o relacion_vacios +
+    saturacion + gravedad_especifica; humedad, porosidad y saturación en %).
+    Un objeto suelto devuelve 'resultado' (400 si no se puede resolver); una
+    lista, {'muestras': [...]} o un CSV (cuerpo text/csv o archivo 'archivo')
+    devuelve 'resultados' con el 'error' de cada probeta sin detener el lote.
+    """
+    try:
+        processor = FasesProcessor()
+        if 'archivo' in request.files:
+            muestras = pd.read_csv(request.files['archivo'])
+        elif request.mimetype == 'text/csv':
+            muestras = pd.read_csv(io.BytesIO(request.get_data()))
+        else:
+            data = request.get_json()
+            if isinstance(data, dict) and 'muestras' not in data:
+                return jsonify({
+                    'success': True,
+                    'resultado': processor.calcular(data)
+                })
+            muestras = data['muestras'] if isinstance(data, dict) else data
+        
+        resultados = processor.calcular_lote(muestras)
+        errores = sum(1 for r in resultados if r['error'])
+        
+        return jsonify({
+            'success': True,
+            'resultados': resultados,
+            'count': len(resultados),
+            'validos': len(resultados) - errores,
+            'errores': errores
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+
+@app.route('/api/incertidumbre/calcular', methods=['POST'])
+def calcular_incertidumbre():
+    """
+    Propagar por Monte Carlo la incertidumbre de las pesadas y los golpes
+    
+    Cada muestra trae 'humedad', 'ensayos_ll' (con 'golpes') y 'ensayos_lp'
+    con los pesos de cada recipiente y, para clasificar, grava, arena, finos,
+    cu, cc, p10 y p40. Parámetros opcionales: realizaciones,
+    resolucion_balanza (g), desviacion_golpes, nivel_confianza y semilla.
+    Un objeto suelto devuelve 'resultado'; {'muestras': [...]} devuelve
+    'resultados' con el 'error' de cada muestra sin detener el lote.
+    """
+    try:
+        data = request.get_json()
+        parametros = {
+            clave: data[clave]
+            for clave in ('realizaciones', 'resolucion_balanza', 'desviacion_golpes', 'nivel_confianza', 'semilla')
+            if data.get(clave) is not None
+        }
+        processor = IncertidumbreProcessor(**parametros)
+        
+        if 'muestras' not in data:
+            return jsonify({
+                'success': True,
+                'resultado': processor.simular(data)
+            })
+        
+        resultados = processor.simular_lote(data['muestras'])
+        errores = sum(1 for r in resultados if r['error'])
+        
+        return jsonify({
+            'success': True,
+            'resultados': resultados,
+            'count': len(resultados),
+            'validos': len(resultados) - errores,
+            'errores': errores,
+            'realizaciones': processor.realizaciones
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+
+@app.route('/api/clasificacion/mapa', methods=['POST'])
+def clasificar_mapa():
+    """
+    Clasificar miles de puntos (finos, LL, IP) para dibujar mapas de clasificación
+    
+    Acepta columnas {'finos': [...], 'll': [...], 'ip': [...]} y opcionalmente
+    'grava_dominante' (bool o lista) y 'sistemas' (['sucs', 'aashto']). Se
+    responde con la rejilla precalculada, que la primera consulta empieza a
+    cargar; mientras tanto, o cerca de las fronteras entre clases, se
+    evalúan los motores exactos.
+    """
+    try:
+        data = request.get_json()
+        puntos = [data[c] for c in ('finos', 'll', 'ip')]
+        grava = data.get('grava_dominante', False)
+        sistemas = tuple(data.get('sistemas', ('sucs', 'aashto')))
+        
+        rejilla = rejilla_clasificacion.obtener()
+        if rejilla is not None:
+            consulta = rejilla.consultar(*puntos, grava, sistemas)
+        else:
+            consulta = consultar_exacto(*puntos, grava, sistemas)
+        
+        respuesta = describir_consulta(consulta)
+        respuesta.update({
+            'success': True,
+            'count': len(respuesta.get('sucs', respuesta.get('aashto', []))),
+            'exactos': consulta['exactos'],
+            'rejilla': rejilla is not None
+        })
+        
+        return jsonify(respuesta)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+
+@app.route('/api/health/ready')
+def health_ready():
+    """Estado de la precarga de datos (readiness)"""
+    estado = warmup.estado()
+    return jsonify(estado), 200 if estado['listo'] else 503
+
+
+@app.route('/api/cache/estadisticas')
+def cache_estadisticas():
+    """
+    Aciertos, fallos y expulsiones de la caché de resultados de los
+    procesadores y de la caché de datasets; ?reiniciar=1 pone los contadores
+    de resultados a cero tras leerlos
+    """
+    estadisticas = cache_resultados.estadisticas()
+    if request.args.get('reiniciar', '').lower() in ('1', 'true', 'si'):
+        cache_resultados.reiniciar_contadores()
+    
+    return jsonify({
+        'success': True,
+        'resultados': estadisticas,
+        'datasets': datasets.estadisticas()
+    })
+
+
 @app.route('/api/proyectos')
 def get_proyectos():
     """Obtener lista de proyectos"""
@@ -1139,4 +1603,9 @@ def server_error(e):
 
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Servidor de desarrollo; en producción usar servidor.py (gunicorn con varios workers)
+    debug = os.environ.get('HSGVA_DEBUG', '0') == '1'
+    # Con el reloader activo solo el proceso hijo (WERKZEUG_RUN_MAIN) sirve peticiones
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        warmup.iniciar()
+    app.run(debug=debug, host='0.0.0.0', port=5000)
@@ -2,5 +2,7 @@
 from .hidrometria_etl import HidrometriaETL
 from .clasificacion_etl import ClasificacionETL
 from .atterberg_etl import AtterbergETL
+from .warmup import DatasetWarmup
+from .huella import huella_libro, crear_etl
 
-__all__ = ['HidrometriaETL', 'ClasificacionETL', 'AtterbergETL']
+__all__ = ['HidrometriaETL', 'ClasificacionETL', 'AtterbergETL', 'DatasetWarmup', 'huella_libro', 'crear_etl']
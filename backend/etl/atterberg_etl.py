@@ -3,13 +3,27 @@ ETL para procesar datos de Límites de Atterberg
 """
 
 import pandas as pd
+import numpy as np
 import os
 from datetime import datetime
 
+from .snapshot import snapshots
+from .lector_streaming import LectorStreaming
+from .plantillas import MotorPlantillas, PLANTILLA_ATTERBERG, resolver_plantilla
+from ..nucleo import contenido_humedad
+
 
 class AtterbergETL:
-    def __init__(self, filepath):
+    # Cambiar la versión al modificar _extraer_datos invalida los snapshots
+    SNAPSHOT_CLAVE = 'load_data-v2'
+
+    # Disposición de celdas por defecto (ver plantillas.py)
+    PLANTILLA = PLANTILLA_ATTERBERG
+
+    def __init__(self, filepath, streaming=False, plantilla=None):
         self.filepath = filepath
+        self.streaming = streaming
+        self.plantilla = resolver_plantilla(plantilla or self.PLANTILLA)
         self.data = None
         
     def load_data(self):
@@ -19,68 +33,7 @@ class AtterbergETL:
                 print(f"⚠️  Archivo no encontrado: {self.filepath}")
                 return []
             
-            # Leer archivo sin encabezados
-            df = pd.read_excel(self.filepath, header=None)
-            
-            # Extraer datos de Límite Líquido (filas 3-5)
-            limite_liquido = []
-            for i in range(3, 6):  # Filas 3, 4, 5 (índices en pandas)
-                ensayo = {
-                    'tipo': 'Límite Líquido',
-                    'ensayo': int(df.iloc[i, 1]) if pd.notna(df.iloc[i, 1]) else i-2,
-                    'caso': str(df.iloc[i, 2]) if pd.notna(df.iloc[i, 2]) else '',
-                    'n_golpes': int(df.iloc[i, 3]) if pd.notna(df.iloc[i, 3]) else 0,
-                    'recipiente': float(df.iloc[i, 4]) if pd.notna(df.iloc[i, 4]) else 0,
-                    'recipiente_suelo_h': float(df.iloc[i, 5]) if pd.notna(df.iloc[i, 5]) else 0,
-                    'recipiente_suelo_s': float(df.iloc[i, 6]) if pd.notna(df.iloc[i, 6]) else 0
-                }
-                
-                # Calcular valores derivados
-                ww = ensayo['recipiente_suelo_h'] - ensayo['recipiente_suelo_s']
-                ws = ensayo['recipiente_suelo_s'] - ensayo['recipiente']
-                w_percent = (ww / ws * 100) if ws != 0 else 0
-                
-                ensayo['ww'] = round(ww, 2)
-                ensayo['ws'] = round(ws, 2)
-                ensayo['w_percent'] = round(w_percent, 2)
-                
-                limite_liquido.append(ensayo)
-            
-            # Extraer datos de Límite Plástico (filas 14-16)
-            limite_plastico = []
-            for i in range(14, 17):  # Filas 14, 15, 16
-                ensayo = {
-                    'tipo': 'Límite Plástico',
-                    'ensayo': int(df.iloc[i, 1]) if pd.notna(df.iloc[i, 1]) else i-13,
-                    'recipiente': float(df.iloc[i, 2]) if pd.notna(df.iloc[i, 2]) else 0,
-                    'recipiente_suelo_h': float(df.iloc[i, 3]) if pd.notna(df.iloc[i, 3]) else 0,
-                    'recipiente_suelo_s': float(df.iloc[i, 4]) if pd.notna(df.iloc[i, 4]) else 0
-                }
-                
-                # Calcular valores derivados
-                ww = ensayo['recipiente_suelo_h'] - ensayo['recipiente_suelo_s']
-                ws = ensayo['recipiente_suelo_s'] - ensayo['recipiente']
-                w_percent = (ww / ws * 100) if ws != 0 else 0
-                
-                ensayo['ww'] = round(ww, 2)
-                ensayo['ws'] = round(ws, 2)
-                ensayo['w_percent'] = round(w_percent, 2)
-                
-                limite_plastico.append(ensayo)
-            
-            # Extraer valores calculados finales
-            ll_value = float(df.iloc[24, 2]) if pd.notna(df.iloc[24, 2]) else 0
-            lp_value = float(df.iloc[25, 2]) if pd.notna(df.iloc[25, 2]) else 0
-            ip_value = float(df.iloc[26, 2]) if pd.notna(df.iloc[26, 2]) else 0
-            
-            self.data = {
-                'limite_liquido': limite_liquido,
-                'limite_plastico': limite_plastico,
-                'll': round(ll_value, 2),
-                'lp': round(lp_value, 2),
-                'ip': round(ip_value, 2)
-            }
-            
+            self.data = snapshots.obtener(self.filepath, self._clave_snapshot(self.SNAPSHOT_CLAVE), self._extraer_datos)
             return self.data
             
         except Exception as e:
@@ -89,6 +42,69 @@ class AtterbergETL:
             traceback.print_exc()
             return []
     
+    def _extraer_datos(self):
+        """Parsear el libro Excel (sin pasar por el snapshot)"""
+        # Leer archivo sin encabezados y extraer los bloques de la plantilla
+        bloques = MotorPlantillas(self.plantilla).extraer(self._leer_hoja())
+        celdas = bloques['celdas']
+        
+        limite_liquido = self._calcular_ensayos(bloques['tablas']['limite_liquido'], 'Límite Líquido')
+        limite_plastico = self._calcular_ensayos(bloques['tablas']['limite_plastico'], 'Límite Plástico')
+        
+        # Valores calculados finales (0 si la celda está vacía)
+        return {
+            'limite_liquido': limite_liquido,
+            'limite_plastico': limite_plastico,
+            'll': round(celdas['ll'], 2) if pd.notna(celdas['ll']) else 0,
+            'lp': round(celdas['lp'], 2) if pd.notna(celdas['lp']) else 0,
+            'ip': round(celdas['ip'], 2) if pd.notna(celdas['ip']) else 0
+        }
+    
+    @staticmethod
+    def _calcular_ensayos(tabla, tipo):
+        """Calcular Ww, Ws y w% de todos los ensayos de un bloque a la vez"""
+        n = len(tabla)
+        h = tabla['recipiente_suelo_h'].fillna(0).to_numpy()
+        s = tabla['recipiente_suelo_s'].fillna(0).to_numpy()
+        r = tabla['recipiente'].fillna(0).to_numpy()
+        
+        humedad, ww, ws = contenido_humedad(r, h, s)
+        # Sin suelo seco la humedad se reporta como 0
+        w_percent = np.nan_to_num(humedad, nan=0.0)
+        
+        ensayos = pd.DataFrame({'tipo': [tipo] * n})
+        # Sin número de ensayo se usa la posición dentro del bloque
+        ensayos['ensayo'] = tabla['ensayo'].fillna(pd.Series(np.arange(1, n + 1), index=tabla.index)).to_numpy().astype(np.int64)
+        if 'caso' in tabla:
+            ensayos['caso'] = [str(v) if v is not None else '' for v in tabla['caso']]
+        if 'n_golpes' in tabla:
+            ensayos['n_golpes'] = tabla['n_golpes'].fillna(0).to_numpy().astype(np.int64)
+        ensayos['recipiente'] = r
+        ensayos['recipiente_suelo_h'] = h
+        ensayos['recipiente_suelo_s'] = s
+        ensayos['ww'] = np.round(ww, 2)
+        ensayos['ws'] = np.round(ws, 2)
+        ensayos['w_percent'] = np.round(w_percent, 2)
+        
+        return ensayos.to_dict('records')
+    
+    def _leer_hoja(self):
+        """
+        Leer la hoja sin encabezados para acceso por posición
+        
+        En modo streaming solo se recorre la ventana que usa el extractor, con
+        el lector de solo lectura de openpyxl, en lugar de toda la hoja.
+        """
+        if self.streaming:
+            with LectorStreaming(self.filepath) as lector:
+                return lector.leer_ventana(*self.plantilla['ventana'])
+        
+        return pd.read_excel(self.filepath, header=None)
+    
+    def _clave_snapshot(self, clave):
+        """Clave de snapshot ligada a la plantilla usada para extraer"""
+        return f"{clave}-{self.plantilla['nombre']}"
+    
     def transform_data(self):
         """Transformar y limpiar datos"""
         if not self.data:
@@ -3,14 +3,29 @@ ETL para procesar datos de Clasificación de Suelos
 """
 
 import pandas as pd
+import numpy as np
 import os
 from datetime import datetime
 
+from .snapshot import snapshots
+from .lector_streaming import LectorStreaming
+from .plantillas import MotorPlantillas, PLANTILLA_CLASIFICACION, resolver_plantilla
+
 
 class ClasificacionETL:
-    def __init__(self, filepath):
+    # Cambiar la versión al modificar _extraer_datos invalida los snapshots
+    SNAPSHOT_CLAVE = 'load_data-v2'
+
+    # Disposición de celdas por defecto (ver plantillas.py)
+    PLANTILLA = PLANTILLA_CLASIFICACION
+
+    def __init__(self, filepath, streaming=False, plantilla=None):
         self.filepath = filepath
+        self.streaming = streaming
+        self.plantilla = resolver_plantilla(plantilla or self.PLANTILLA)
         self.data = None
+        # (datos de origen, resultado) de get_tamices_por_muestra
+        self._tamices = None
         
     def load_data(self):
         """Cargar datos desde Excel con estructura específica"""
@@ -19,91 +34,7 @@ class ClasificacionETL:
                 print(f"⚠️  Archivo no encontrado: {self.filepath}")
                 return []
             
-            # Leer archivo sin encabezados
-            df = pd.read_excel(self.filepath, header=None)
-            
-            muestras = []
-            
-            # Muestra 1 (filas 1-8)
-            muestra1 = self._extraer_muestra_basica(df, 1, 2, 1)
-            if muestra1:
-                muestras.append(muestra1)
-            
-            # Muestra 2 (filas 10-17)
-            muestra2 = self._extraer_muestra_basica(df, 2, 11, 1)
-            if muestra2:
-                muestras.append(muestra2)
-            
-            # Muestra 3 (filas 1-8, columnas E-F)
-            muestra3 = self._extraer_muestra_basica(df, 3, 2, 4)
-            if muestra3:
-                muestras.append(muestra3)
-            
-            # Muestra 4 (filas 10-17, columnas E-F)
-            muestra4 = self._extraer_muestra_basica(df, 4, 11, 4)
-            if muestra4:
-                muestras.append(muestra4)
-            
-            # Extraer datos de análisis granulométrico (filas 20-31)
-            analisis = []
-            muestra_actual = None
-            
-            for i in range(20, 32):
-                # Verificar si hay nombre de muestra (nueva muestra)
-                if pd.notna(df.iloc[i, 1]) and 'Muestra' in str(df.iloc[i, 1]):
-                    muestra_nombre = str(df.iloc[i, 1])
-                    
-                    # Determinar número de muestra
-                    if 'N° 2' in muestra_nombre or 'Muestra N° 2' in muestra_nombre:
-                        muestra_actual = 2
-                    elif 'N° 3' in muestra_nombre or 'Muestra N° 3' in muestra_nombre:
-                        muestra_actual = 3
-                    elif 'N° 4' in muestra_nombre or 'Muestra N° 4' in muestra_nombre:
-                        muestra_actual = 4
-                    else:
-                        muestra_actual = 1
-                    
-                    # Primera línea de datos de esta muestra
-                    n_tamiz = df.iloc[i, 2] if pd.notna(df.iloc[i, 2]) else 0
-                    abertura = df.iloc[i, 3] if pd.notna(df.iloc[i, 3]) else 0
-                    peso_retenido = df.iloc[i, 4] if pd.notna(df.iloc[i, 4]) else 0
-                    pct_retenido = df.iloc[i, 5] if pd.notna(df.iloc[i, 5]) else 0
-                    pct_pasa = df.iloc[i, 6] if pd.notna(df.iloc[i, 6]) else 0
-                    clasificacion = df.iloc[i, 7] if pd.notna(df.iloc[i, 7]) else ''
-                    
-                    analisis.append({
-                        'muestra': muestra_actual,
-                        'n_tamiz': int(n_tamiz) if isinstance(n_tamiz, (int, float)) else n_tamiz,
-                        'abertura_mm': float(abertura) if isinstance(abertura, (int, float)) else 0,
-                        'peso_retenido': float(peso_retenido) if isinstance(peso_retenido, (int, float)) else 0,
-                        'pct_retenido': round(float(pct_retenido), 2) if isinstance(pct_retenido, (int, float)) else 0,
-                        'pct_pasa': round(float(pct_pasa), 2) if isinstance(pct_pasa, (int, float)) else 0,
-                        'clasificacion': str(clasificacion).strip() if clasificacion else ''
-                    })
-                
-                # Si es una línea continuación (sin nombre de muestra pero con datos)
-                elif muestra_actual and pd.notna(df.iloc[i, 2]):
-                    n_tamiz = df.iloc[i, 2]
-                    abertura = df.iloc[i, 3] if pd.notna(df.iloc[i, 3]) else 0
-                    peso_retenido = df.iloc[i, 4] if pd.notna(df.iloc[i, 4]) else 0
-                    pct_retenido = df.iloc[i, 5] if pd.notna(df.iloc[i, 5]) else 0
-                    pct_pasa = df.iloc[i, 6] if pd.notna(df.iloc[i, 6]) else 0
-                    
-                    analisis.append({
-                        'muestra': muestra_actual,
-                        'n_tamiz': int(n_tamiz) if isinstance(n_tamiz, (int, float)) else n_tamiz,
-                        'abertura_mm': float(abertura) if isinstance(abertura, (int, float)) else 0,
-                        'peso_retenido': float(peso_retenido) if isinstance(peso_retenido, (int, float)) else 0,
-                        'pct_retenido': round(float(pct_retenido), 2) if isinstance(pct_retenido, (int, float)) else 0,
-                        'pct_pasa': round(float(pct_pasa), 2) if isinstance(pct_pasa, (int, float)) else 0,
-                        'clasificacion': ''
-                    })
-            
-            self.data = {
-                'muestras': muestras,
-                'analisis_granulometrico': analisis
-            }
-            
+            self.data = snapshots.obtener(self.filepath, self._clave_snapshot(self.SNAPSHOT_CLAVE), self._extraer_datos)
             return self.data
             
         except Exception as e:
@@ -112,30 +43,76 @@ class ClasificacionETL:
             traceback.print_exc()
             return []
     
-    def _extraer_muestra_basica(self, df, num_muestra, fila_inicio, col_offset):
-        """Extraer datos básicos de una muestra"""
-        try:
-            platon = float(df.iloc[fila_inicio, col_offset + 1]) if pd.notna(df.iloc[fila_inicio, col_offset + 1]) else 0
-            muestra = float(df.iloc[fila_inicio + 1, col_offset + 1]) if pd.notna(df.iloc[fila_inicio + 1, col_offset + 1]) else 0
-            n10 = float(df.iloc[fila_inicio + 2, col_offset + 1]) if pd.notna(df.iloc[fila_inicio + 2, col_offset + 1]) else 0
-            n40 = float(df.iloc[fila_inicio + 3, col_offset + 1]) if pd.notna(df.iloc[fila_inicio + 3, col_offset + 1]) else 0
-            n200 = float(df.iloc[fila_inicio + 4, col_offset + 1]) if pd.notna(df.iloc[fila_inicio + 4, col_offset + 1]) else 0
-            fondo = float(df.iloc[fila_inicio + 5, col_offset + 1]) if pd.notna(df.iloc[fila_inicio + 5, col_offset + 1]) else 0
-            total = float(df.iloc[fila_inicio + 6, col_offset + 1]) if pd.notna(df.iloc[fila_inicio + 6, col_offset + 1]) else 0
-            
-            return {
-                'numero': num_muestra,
-                'platon': platon,
-                'muestra': muestra,
-                'n10': n10,
-                'n40': n40,
-                'n200': n200,
-                'fondo': fondo,
-                'total_muestra': total
-            }
-        except Exception as e:
-            print(f"Error extrayendo muestra {num_muestra}: {e}")
-            return None
+    def _extraer_datos(self):
+        """Parsear el libro Excel (sin pasar por el snapshot)"""
+        # Leer archivo sin encabezados y extraer los bloques de la plantilla
+        bloques = MotorPlantillas(self.plantilla).extraer(self._leer_hoja())
+        
+        return {
+            'muestras': self._extraer_muestras(bloques['registros']['muestras']),
+            'analisis_granulometrico': self._extraer_analisis(bloques['tablas']['analisis_granulometrico'])
+        }
+    
+    @staticmethod
+    def _extraer_muestras(registros):
+        """Datos básicos de cada muestra (celdas vacías = 0)"""
+        muestras = registros.fillna(0)
+        muestras.insert(0, 'numero', [int(numero) for numero in registros.index])
+        return muestras.to_dict('records')
+    
+    @staticmethod
+    def _extraer_analisis(tabla):
+        """
+        Filas del análisis granulométrico asignadas a su muestra
+        
+        Una fila con 'Muestra' en la primera columna abre una muestra nueva; las
+        siguientes filas con N° de tamiz pertenecen a ella.
+        """
+        nombres = tabla['nombre_muestra'].map(lambda v: '' if v is None else str(v))
+        inicio = nombres.str.contains('Muestra', regex=False)
+        
+        numero = pd.Series(np.select(
+            [nombres.str.contains('N° 2', regex=False),
+             nombres.str.contains('N° 3', regex=False),
+             nombres.str.contains('N° 4', regex=False)],
+            [2, 3, 4],
+            1
+        ), index=tabla.index).where(inicio).ffill()
+        
+        incluir = inicio | (numero.notna() & tabla['n_tamiz'].notna())
+        filas = tabla[incluir]
+        
+        analisis = pd.DataFrame({
+            'muestra': numero[incluir].astype(np.int64),
+            'n_tamiz': [0 if pd.isna(v) else int(v) if isinstance(v, (int, float)) else v for v in filas['n_tamiz']],
+            'abertura_mm': filas['abertura_mm'].fillna(0),
+            'peso_retenido': filas['peso_retenido'].fillna(0),
+            'pct_retenido': filas['pct_retenido'].fillna(0).round(2),
+            'pct_pasa': filas['pct_pasa'].fillna(0).round(2),
+            # Solo la fila de inicio de cada muestra trae la clasificación
+            'clasificacion': [
+                str(v).strip() if es_inicio and v is not None else ''
+                for v, es_inicio in zip(filas['clasificacion'], inicio[incluir])
+            ]
+        })
+        return analisis.to_dict('records')
+    
+    def _leer_hoja(self):
+        """
+        Leer la hoja sin encabezados para acceso por posición
+        
+        En modo streaming solo se recorre la ventana que usa el extractor, con
+        el lector de solo lectura de openpyxl, en lugar de toda la hoja.
+        """
+        if self.streaming:
+            with LectorStreaming(self.filepath) as lector:
+                return lector.leer_ventana(*self.plantilla['ventana'])
+        
+        return pd.read_excel(self.filepath, header=None)
+    
+    def _clave_snapshot(self, clave):
+        """Clave de snapshot ligada a la plantilla usada para extraer"""
+        return f"{clave}-{self.plantilla['nombre']}"
     
     def transform_data(self):
         """Transformar y limpiar datos"""
@@ -159,6 +136,27 @@ class ClasificacionETL:
         
         return self.data['analisis_granulometrico']
     
+    def get_tamices_por_muestra(self):
+        """
+        Aberturas y % que pasa de cada muestra, listos para la curva granulométrica
+        
+        Se calcula una vez por cada carga de datos (self.data) y se reutiliza.
+        """
+        datos = self.data
+        tamices = self._tamices
+        if tamices is None or tamices[0] is not datos:
+            tamices = self._tamices = (datos, self._agrupar_tamices())
+        return tamices[1]
+    
+    def _agrupar_tamices(self):
+        muestras = {}
+        for a in self.get_analisis_granulometrico():
+            if a['abertura_mm'] > 0:
+                muestras.setdefault(a['muestra'], []).append(
+                    {'abertura_mm': a['abertura_mm'], 'pct_pasa': a['pct_pasa']}
+                )
+        return [{'id': numero, 'tamices': tamices} for numero, tamices in sorted(muestras.items())]
+    
     def get_all_data(self):
         """Obtener todos los datos procesados"""
         return self.data if self.data else {}
@@ -0,0 +1,85 @@
+"""
+Caché en memoria de datasets extraídos, versionada por la firma del archivo fuente
+"""
+
+import threading
+from concurrent.futures import Future
+
+from .snapshot import firma_archivo
+
+
+class DatasetCache:
+    """
+    Guarda en memoria el resultado de extraer un dataset de un libro Excel.
+
+    La versión de cada entrada es la firma (mtime, tamaño) del libro: mientras
+    no cambie se sirve la copia en memoria. Las peticiones concurrentes sobre
+    un dataset aún no calculado esperan a un único parseo en curso.
+    """
+
+    def __init__(self):
+        self._entradas = {}
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.coalescidas = 0
+
+    def obtener(self, clave, filepath, constructor):
+        """
+        Obtener el dataset `clave`, reconstruyéndolo solo si el libro cambió
+
+        Args:
+            clave: Identificador del dataset
+            filepath: Libro Excel del que depende
+            constructor: Función sin argumentos que extrae el dataset
+        """
+        version = firma_archivo(filepath)
+
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None and entrada['version'] == version:
+                futuro = entrada['futuro']
+                propietario = False
+                if futuro.done():
+                    self.aciertos += 1
+                else:
+                    self.coalescidas += 1
+            else:
+                futuro = Future()
+                self._entradas[clave] = {'version': version, 'futuro': futuro}
+                propietario = True
+                self.fallos += 1
+
+        if propietario:
+            try:
+                futuro.set_result(constructor())
+            except BaseException as e:
+                futuro.set_exception(e)
+                # No memorizar errores: el siguiente intento vuelve a parsear
+                with self._lock:
+                    if self._entradas.get(clave, {}).get('futuro') is futuro:
+                        del self._entradas[clave]
+
+        return futuro.result()
+
+    def invalidar(self, clave=None):
+        """Descartar una entrada (o todas)"""
+        with self._lock:
+            if clave is None:
+                self._entradas.clear()
+            else:
+                self._entradas.pop(clave, None)
+
+    def estadisticas(self):
+        """Contadores de uso de la caché"""
+        with self._lock:
+            return {
+                'entradas': len(self._entradas),
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'coalescidas': self.coalescidas
+            }
+
+
+# Caché compartida por los ETL del proceso
+datasets = DatasetCache()
@@ -3,13 +3,28 @@ ETL para procesar datos de Hidrometría
 """
 
 import pandas as pd
+import numpy as np
 import os
 from datetime import datetime
 
+from .snapshot import snapshots
+from .lector_streaming import LectorStreaming
+from .dataset_cache import datasets
+from .plantillas import MotorPlantillas, PLANTILLA_HIDROMETRIA, resolver_plantilla
+
 
 class HidrometriaETL:
-    def __init__(self, filepath):
+    # Cambiar la versión al modificar _extraer_datos invalida los snapshots
+    SNAPSHOT_CLAVE = 'load_data-v1'
+    SNAPSHOT_CLAVE_LECTURAS = 'lecturas-v1'
+
+    # Disposición de celdas por defecto (ver plantillas.py)
+    PLANTILLA = PLANTILLA_HIDROMETRIA
+
+    def __init__(self, filepath, streaming=False, plantilla=None):
         self.filepath = filepath
+        self.streaming = streaming
+        self.plantilla = resolver_plantilla(plantilla or self.PLANTILLA)
         self.data = None
         
     def load_data(self):
@@ -19,21 +34,123 @@ class HidrometriaETL:
                 print(f"⚠️  Archivo no encontrado: {self.filepath}")
                 return []
             
-            # Leer el archivo Excel
-            df = pd.read_excel(self.filepath, sheet_name=0)
-            
-            # Limpiar nombres de columnas
-            df.columns = df.columns.str.strip()
-            
-            # Convertir a lista de diccionarios
-            self.data = df.to_dict('records')
-            
+            self.data = snapshots.obtener(self.filepath, self.SNAPSHOT_CLAVE, self._extraer_datos)
             return self.data
             
         except Exception as e:
             print(f"❌ Error al cargar hidrometría: {str(e)}")
             return []
     
+    def _extraer_datos(self):
+        """Parsear el libro Excel (sin pasar por el snapshot)"""
+        if self.streaming:
+            return self._extraer_datos_streaming()
+        
+        # Leer el archivo Excel
+        df = pd.read_excel(self.filepath, sheet_name=0)
+        
+        # Limpiar nombres de columnas
+        df.columns = df.columns.str.strip()
+        
+        # Convertir a lista de diccionarios
+        return df.to_dict('records')
+    
+    def _leer_hoja(self):
+        """Leer la hoja completa sin encabezados para acceso por posición"""
+        return pd.read_excel(self.filepath, header=None)
+    
+    def _clave_snapshot(self, clave):
+        """Clave de snapshot ligada a la plantilla usada para extraer"""
+        return f"{clave}-{self.plantilla['nombre']}"
+    
+    def _extraer_datos_streaming(self):
+        """
+        Construir los registros fila a fila sin DataFrame intermedio
+        
+        Cada fila pasa directamente a su dict (solo hasta su última celda
+        ocupada); al terminar se completan con NaN hasta el ancho de la hoja.
+        """
+        registros = []
+        with LectorStreaming(self.filepath) as lector:
+            filas = lector.iter_filas()
+            encabezado = next(filas, None)
+            if encabezado is None:
+                return []
+            columnas = [f'Unnamed: {i}' if pd.isna(v) else str(v).strip() for i, v in enumerate(encabezado)]
+            ancho = self._ocupadas(encabezado)
+            
+            for fila in filas:
+                n = self._ocupadas(fila)
+                if n > len(columnas):
+                    columnas += [f'Unnamed: {i}' for i in range(len(columnas), n)]
+                ancho = max(ancho, n)
+                registros.append(dict(zip(columnas[:n], fila[:n])))
+        
+        # Igual que pandas: sin filas ni columnas vacías al final
+        while registros and not registros[-1]:
+            registros.pop()
+        for registro in registros:
+            for columna in columnas[len(registro):ancho]:
+                registro[columna] = np.nan
+        return registros
+    
+    @staticmethod
+    def _ocupadas(fila):
+        """Número de celdas hasta la última ocupada de la fila"""
+        for i in range(len(fila) - 1, -1, -1):
+            if not pd.isna(fila[i]):
+                return i + 1
+        return 0
+    
+    def iter_lecturas(self, tamano_bloque=1024):
+        """
+        Iterar las lecturas del hidrómetro en bloques tipados de tamaño fijo
+        
+        Cada bloque es un DataFrame como el de MotorPlantillas.tabla (columnas
+        del bloque 'lecturas' de la plantilla, índice = fila de la hoja); la
+        lectura termina en la primera fila sin fecha. La memoria usada no
+        depende del número de lecturas de la hoja.
+        """
+        with LectorStreaming(self.filepath) as lector:
+            yield from self._iter_lecturas(lector, tamano_bloque)
+    
+    def _iter_lecturas(self, lector, tamano_bloque):
+        motor = MotorPlantillas(self.plantilla)
+        spec = self.plantilla['tablas']['lecturas']
+        inicio, fin = spec['filas']
+        for valores in lector.iter_matrices(
+            list(spec['columnas'].values()),
+            fila_inicio=inicio,
+            fila_fin=fin,
+            tamano_bloque=tamano_bloque,
+            columna_clave=spec['columnas'].get(spec.get('hasta_vacia'))
+        ):
+            yield motor.tipar_tabla('lecturas', valores, inicio)
+            inicio += len(valores)
+    
+    def _leer_bloques_streaming(self, tamano_bloque=1024):
+        """
+        Leer las lecturas por bloques y los parámetros de una ventana acotada
+        
+        Los rótulos de los parámetros se buscan en las 'filas_etiquetas' filas
+        que siguen a la última lectura, sin recorrer el resto de la hoja.
+        """
+        motor = MotorPlantillas(self.plantilla)
+        spec = self.plantilla['tablas']['lecturas']
+        with LectorStreaming(self.filepath) as lector:
+            bloques = list(self._iter_lecturas(lector, tamano_bloque))
+            if bloques:
+                lecturas = pd.concat(bloques)
+            else:
+                lecturas = motor.tipar_tabla('lecturas', np.empty((0, len(spec['columnas'])), dtype=object), spec['filas'][0])
+            lecturas.attrs['filas_invalidas'] = [f for b in bloques for f in b.attrs['filas_invalidas']]
+            
+            fin = spec['filas'][0] + len(lecturas)
+            filas = self.plantilla.get('filas_etiquetas')
+            cola = lector.leer_ventana(None if filas is None else fin + filas, self.plantilla['ventana'][1], fila_inicio=fin)
+        
+        return {'tablas': {'lecturas': lecturas}, 'celdas': motor.etiquetas(cola)}
+    
     def transform_data(self):
         """Transformar y limpiar datos"""
         if not self.data:
@@ -47,166 +164,124 @@ class HidrometriaETL:
         
         return transformed
     
+    def get_lecturas(self):
+        """
+        Obtener las lecturas del hidrómetro como DataFrame tipado
+        
+        Returns:
+            dict con 'lecturas' (DataFrame indexado por numero_lectura, columnas
+            numéricas float64 y fecha/hora como objetos) y 'parametros' del
+            ensayo (Ws, Gs, Cm, CC, Alfa; None si faltan)
+        """
+        return datasets.obtener(
+            (os.path.abspath(self.filepath), 'lecturas', self.plantilla['nombre']),
+            self.filepath,
+            lambda: snapshots.obtener(self.filepath, self._clave_snapshot(self.SNAPSHOT_CLAVE_LECTURAS), self._extraer_lecturas)
+        )
+    
     def get_humedad_data(self):
         """
-        Extrae TODOS los 13 registros de datos de hidrometría del Excel
+        Obtener los datos de humedad del ensayo de hidrometría
         
-        Estructura del Excel (basado en imagen):
-        - Fila 8 (índice 7): Encabezados [Fecha, Hora, t(min), T(°C), Lr, Lcr, %Mas fino, Lhcr, L, L/t, K, D(mm), Ct]
-        - Filas 9-21 (índices 8-20): 13 registros de datos de ensayo
-        - Fila 24 (índice 23): Ws (g) = 362.56
-        - Fila 25 (índice 24): Gs = 2.72
-        - Fila 26 (índice 25): Cm = 1
-        - Fila 27 (índice 26): CC = 3
-        - Fila 28 (índice 27): Alfa = 0.99
+        El resultado se guarda en memoria y solo se vuelve a parsear el Excel
+        cuando el archivo cambia; las peticiones concurrentes comparten un único
+        parseo en curso.
         """
         try:
-            # Leer Excel sin encabezados para acceso por posición
-            df_raw = pd.read_excel(self.filepath, header=None)
-            
-            # Extraer parámetros del ensayo (columnas C=2, D=3)
-            ws_value = None
-            gs_value = None
-            cm_value = None
-            cc_value = None
-            alfa_value = None
-            
-            # Ws (g) - Fila 24 (índice 23)
-            if len(df_raw) > 23 and pd.notna(df_raw.iloc[23][3]):
-                ws_value = float(df_raw.iloc[23][3])
-            
-            # Gs - Fila 25 (índice 24)
-            if len(df_raw) > 24 and pd.notna(df_raw.iloc[24][3]):
-                gs_value = float(df_raw.iloc[24][3])
-            
-            # Cm - Fila 26 (índice 25)
-            if len(df_raw) > 25 and pd.notna(df_raw.iloc[25][3]):
-                cm_value = float(df_raw.iloc[25][3])
-            
-            # CC - Fila 27 (índice 26)
-            if len(df_raw) > 26 and pd.notna(df_raw.iloc[26][3]):
-                cc_value = float(df_raw.iloc[26][3])
-            
-            # Alfa - Fila 28 (índice 27)
-            if len(df_raw) > 27 and pd.notna(df_raw.iloc[27][3]):
-                alfa_value = float(df_raw.iloc[27][3])
-            
-            print(f"📊 Parámetros extraídos: Ws={ws_value}g, Gs={gs_value}, Cm={cm_value}, CC={cc_value}, Alfa={alfa_value}")
-            
-            # Extraer los 13 registros de datos de hidrometría
-            # Fila 8 (índice 7) = Encabezados
-            # Filas 9-21 (índices 8-20) = 13 registros de datos
-            # Columnas: C=2(Fecha), D=3(Hora), E=4(t min), F=5(T°C), G=6(Lr), H=7(Lcr), 
-            #           I=8(%Mas fino), J=9(Lhcr), K=10(L), L=11(L/t), M=12(K), N=13(D mm), O=14(Ct)
-            
-            registros_hidrometria = []
-            
-            for idx in range(8, 21):  # Filas 9-21 del Excel (índices 8-20)
-                if idx >= len(df_raw):
-                    break
-                    
-                row = df_raw.iloc[idx]
-                
-                # Verificar que hay datos en esta fila (columna Fecha no vacía)
-                if pd.notna(row[2]):
-                    try:
-                        # Extraer cada campo según la imagen
-                        fecha = str(row[2]) if pd.notna(row[2]) else ''
-                        hora = str(row[3]) if pd.notna(row[3]) else ''
-                        t_min = float(row[4]) if pd.notna(row[4]) else 0.0
-                        temperatura = float(row[5]) if pd.notna(row[5]) else 0.0
-                        lr = float(row[6]) if pd.notna(row[6]) else 0.0
-                        lcr = float(row[7]) if pd.notna(row[7]) else 0.0
-                        pct_mas_fino = float(row[8]) if pd.notna(row[8]) else 0.0
-                        lhcr = float(row[9]) if pd.notna(row[9]) else 0.0
-                        l = float(row[10]) if pd.notna(row[10]) else 0.0
-                        l_t = float(row[11]) if pd.notna(row[11]) else 0.0
-                        k = float(row[12]) if pd.notna(row[12]) else 0.0
-                        d_mm = float(row[13]) if pd.notna(row[13]) else 0.0
-                        ct = float(row[14]) if pd.notna(row[14]) else 0.0
-                        
-                        registro = {
-                            'numero_lectura': idx - 7,  # Numeración 1-13
-                            'fecha': fecha,
-                            'hora': hora,
-                            't_min': t_min,
-                            'temperatura': temperatura,
-                            'lr': lr,
-                            'lcr': lcr,
-                            'pct_mas_fino': pct_mas_fino,
-                            'lhcr': lhcr,
-                            'l': l,
-                            'l_t': l_t,
-                            'k': k,
-                            'd_mm': d_mm,
-                            'ct': ct,
-                            # Parámetros del ensayo
-                            'ws': ws_value,
-                            'gs': gs_value,
-                            'cm': cm_value,
-                            'cc': cc_value,
-                            'alfa': alfa_value
-                        }
-                        
-                        registros_hidrometria.append(registro)
-                        
-                    except Exception as e:
-                        print(f"⚠️ Error procesando fila {idx + 1}: {e}")
-                        continue
-            
-            # Convertir a formato esperado por el frontend (humedad)
-            # Usamos los datos de hidrometría para generar información de humedad
-            muestras_humedad = []
-            
-            if registros_hidrometria and ws_value:
-                for i, registro in enumerate(registros_hidrometria[:13], 1):  # Los 13 registros
-                    # Usar el % más fino como indicador de humedad
-                    # y temperatura para ajustar
-                    pct_fino = registro['pct_mas_fino']
-                    temp = registro['temperatura']
-                    
-                    # Calcular factor de humedad basado en % fino y temperatura
-                    # Más fino = más humedad, menos temperatura = más humedad
-                    factor_humedad = (pct_fino / 100) * (1 + (20 - temp) / 100)
-                    factor_humedad = max(0.05, min(0.25, factor_humedad))  # Entre 5% y 25%
-                    
-                    # Calcular pesos para cada muestra
-                    peso_recipiente = 25.0 + (i * 0.3)  # Variar recipientes
-                    peso_suelo_seco = ws_value / 13  # Dividir peso total entre 13 muestras
-                    peso_seco = peso_suelo_seco + peso_recipiente
-                    peso_humedo = peso_seco + (peso_suelo_seco * factor_humedad)
-                    
-                    # Calcular humedad
-                    humedad = (factor_humedad * 100)
-                    
-                    muestra = {
-                        'proyecto': 'Ensayo de Hidrometría HSGVA',
-                        'muestra': f'Lectura {i} (t={registro["t_min"]}min)',
-                        'numero_recipiente': f'R-{100 + i:03d}',
-                        'peso_recipiente': round(peso_recipiente, 2),
-                        'peso_humedo': round(peso_humedo, 2),
-                        'peso_seco': round(peso_seco, 2),
-                        'humedad': round(humedad, 2),
-                        # Datos adicionales del ensayo
-                        'fecha': registro['fecha'],
-                        'hora': registro['hora'],
-                        't_min': registro['t_min'],
-                        'temperatura': registro['temperatura'],
-                        'pct_mas_fino': registro['pct_mas_fino'],
-                        'd_mm': registro['d_mm']
-                    }
-                    
-                    muestras_humedad.append(muestra)
-            
-            print(f"✅ Extraídos {len(registros_hidrometria)} registros de hidrometría → {len(muestras_humedad)} muestras de humedad")
-            return muestras_humedad
-            
+            humedad = datasets.obtener(
+                (os.path.abspath(self.filepath), 'humedad', self.plantilla['nombre']),
+                self.filepath,
+                lambda: self._calcular_humedad(**self.get_lecturas())
+            )
+            # Los registros dict solo se construyen al responder
+            return humedad.to_dict('records')
         except Exception as e:
             print(f"❌ Error extrayendo datos de humedad: {str(e)}")
             import traceback
             traceback.print_exc()
             return []
     
+    def _extraer_lecturas(self):
+        """
+        Extraer el bloque de lecturas y los parámetros del ensayo
+        
+        Estructura del Excel (plantilla 'hidrometria'):
+        - Fila 8 (índice 7): Encabezados [Fecha, Hora, t(min), T(°C), Lr, Lcr, %Mas fino, Lhcr, L, L/t, K, D(mm), Ct]
+        - Desde la fila 9 (índice 8): una lectura por fila hasta la primera sin fecha
+        - Debajo, en columnas C-D: Ws (g), Gs, Cm, CC y Alfa, localizados por su rótulo
+        """
+        # Leer Excel sin encabezados y extraer los bloques de la plantilla
+        if self.streaming:
+            bloques = self._leer_bloques_streaming()
+        else:
+            bloques = MotorPlantillas(self.plantilla).extraer(self._leer_hoja())
+        
+        # Parámetros del ensayo (None si la celda está vacía)
+        parametros = {k: (v if pd.notna(v) else None) for k, v in bloques['celdas'].items()}
+        
+        print(f"📊 Parámetros extraídos: Ws={parametros['ws']}g, Gs={parametros['gs']}, Cm={parametros['cm']}, CC={parametros['cc']}, Alfa={parametros['alfa']}")
+        
+        # Las lecturas con texto en columnas numéricas se descartan
+        lecturas = bloques['tablas']['lecturas']
+        invalidas = lecturas.attrs['filas_invalidas']
+        for fila in invalidas:
+            print(f"⚠️ Error procesando fila {fila + 1}: valor no numérico")
+        lecturas = lecturas[~lecturas.index.isin(invalidas)]
+        
+        numericas = [c for c in lecturas.columns if c not in ('fecha', 'hora')]
+        tabla = lecturas[numericas].fillna(0.0)
+        tabla.insert(0, 'hora', [str(v) if v is not None else '' for v in lecturas['hora']])
+        tabla.insert(0, 'fecha', [str(v) for v in lecturas['fecha']])
+        tabla.index = pd.Index(lecturas.index - self.plantilla['tablas']['lecturas']['filas'][0] + 1, name='numero_lectura')
+        
+        return {'lecturas': tabla, 'parametros': parametros}
+    
+    @staticmethod
+    def _calcular_humedad(lecturas, parametros):
+        """
+        Convertir las lecturas en muestras de humedad (formato del frontend)
+        
+        Se usa el % más fino como indicador de humedad y la temperatura para
+        ajustarlo; el peso seco total Ws se reparte entre todas las lecturas.
+        """
+        ws_value = parametros.get('ws')
+        n = len(lecturas)
+        if not n or not ws_value:
+            print(f"✅ Extraídos {n} registros de hidrometría → 0 muestras de humedad")
+            return pd.DataFrame()
+        
+        i = np.arange(1, n + 1)
+        pct_fino = lecturas['pct_mas_fino'].to_numpy()
+        temp = lecturas['temperatura'].to_numpy()
+        
+        # Más fino = más humedad, menos temperatura = más humedad (entre 5% y 25%)
+        factor_humedad = np.clip((pct_fino / 100) * (1 + (20 - temp) / 100), 0.05, 0.25)
+        
+        peso_recipiente = 25.0 + (i * 0.3)  # Variar recipientes
+        peso_suelo_seco = ws_value / n
+        peso_seco = peso_suelo_seco + peso_recipiente
+        peso_humedo = peso_seco + (peso_suelo_seco * factor_humedad)
+        
+        muestras = pd.DataFrame({
+            'proyecto': 'Ensayo de Hidrometría HSGVA',
+            'muestra': [f'Lectura {k} (t={t}min)' for k, t in zip(i, lecturas['t_min'].tolist())],
+            'numero_recipiente': [f'R-{100 + k:03d}' for k in i],
+            'peso_recipiente': np.round(peso_recipiente, 2),
+            'peso_humedo': np.round(peso_humedo, 2),
+            'peso_seco': np.round(peso_seco, 2),
+            'humedad': np.round(factor_humedad * 100, 2),
+            # Datos adicionales del ensayo
+            'fecha': lecturas['fecha'].to_numpy(),
+            'hora': lecturas['hora'].to_numpy(),
+            't_min': lecturas['t_min'].to_numpy(),
+            'temperatura': temp,
+            'pct_mas_fino': pct_fino,
+            'd_mm': lecturas['d_mm'].to_numpy()
+        })
+        
+        print(f"✅ Extraídos {n} registros de hidrometría → {len(muestras)} muestras de humedad")
+        return muestras
+    
     def get_summary(self):
         """Obtener resumen de datos"""
         if not self.data:
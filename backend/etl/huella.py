@@ -0,0 +1,121 @@
+"""
+Identificación del formato de un libro de laboratorio por sus celdas ancla
+
+Solo se leen, en modo streaming, las filas y columnas que cubren las anclas
+de las plantillas registradas; el resto del libro no se parsea. Con la huella
+se elige la plantilla y el ETL que corresponden al archivo.
+"""
+
+import hashlib
+
+import pandas as pd
+
+from .lector_streaming import LectorStreaming
+from .plantillas import PLANTILLAS, normalizar_texto
+from .hidrometria_etl import HidrometriaETL
+from .clasificacion_etl import ClasificacionETL
+from .atterberg_etl import AtterbergETL
+
+
+# ETL encargado de cada tipo de plantilla
+ETL_POR_TIPO = {
+    'hidrometria': HidrometriaETL,
+    'clasificacion': ClasificacionETL,
+    'atterberg': AtterbergETL
+}
+
+# Fracción mínima de anclas que deben coincidir para aceptar una plantilla
+UMBRAL_COINCIDENCIA = 0.8
+
+
+def ventana_anclas(plantillas=None):
+    """Menor ventana (filas, columnas) que contiene las anclas de todas las plantillas"""
+    plantillas = list(PLANTILLAS.values()) if plantillas is None else plantillas
+    anclas = [a for p in plantillas for a in p.get('anclas', [])]
+    if not anclas:
+        return 0, 0
+    return max(a[0] for a in anclas) + 1, max(a[1] for a in anclas) + 1
+
+
+def puntuar(celdas, plantilla):
+    """Fracción de anclas de la plantilla presentes en las celdas leídas"""
+    anclas = plantilla.get('anclas', [])
+    if not anclas:
+        return 0.0
+
+    aciertos = 0
+    for fila, columna, texto in anclas:
+        valor = celdas.get((fila, columna))
+        if valor is not None and normalizar_texto(valor).startswith(normalizar_texto(texto)):
+            aciertos += 1
+    return aciertos / len(anclas)
+
+
+def leer_celdas_texto(filepath, filas, columnas):
+    """Celdas de texto de la ventana indicada como {(fila, columna): texto}"""
+    celdas = {}
+    with LectorStreaming(filepath) as lector:
+        for i, fila in enumerate(lector.iter_filas(0, filas, 0, columnas)):
+            for j, valor in enumerate(fila):
+                if isinstance(valor, str) and valor.strip():
+                    celdas[(i, j)] = valor
+    return celdas
+
+
+def huella_libro(filepath, umbral=UMBRAL_COINCIDENCIA):
+    """
+    Calcular la huella de formato de un libro y la plantilla que le corresponde
+
+    Returns:
+        dict con 'tipo' y 'plantilla' (None si ninguna supera el umbral),
+        'puntuacion' de la mejor plantilla, 'puntuaciones' de todas y 'firma',
+        un hash de los textos de la ventana de anclas que agrupa libros con el
+        mismo formato aunque no exista plantilla para él
+    """
+    plantillas = [p for p in PLANTILLAS.values() if p.get('anclas')]
+    filas, columnas = ventana_anclas(plantillas)
+    celdas = leer_celdas_texto(filepath, filas, columnas) if filas else {}
+
+    puntuaciones = {p['nombre']: puntuar(celdas, p) for p in plantillas}
+    mejor = max(plantillas, key=lambda p: puntuaciones[p['nombre']], default=None)
+    aceptada = mejor is not None and puntuaciones[mejor['nombre']] >= umbral
+
+    firma = hashlib.sha1(
+        repr(sorted((pos, normalizar_texto(v)) for pos, v in celdas.items())).encode('utf-8')
+    ).hexdigest()
+
+    return {
+        'archivo': filepath,
+        'tipo': mejor['tipo'] if aceptada else None,
+        'plantilla': mejor['nombre'] if aceptada else None,
+        'puntuacion': puntuaciones[mejor['nombre']] if mejor is not None else 0.0,
+        'puntuaciones': puntuaciones,
+        'firma': firma
+    }
+
+
+def crear_etl(filepath, umbral=UMBRAL_COINCIDENCIA, **kwargs):
+    """
+    Crear el ETL adecuado para un libro según su huella
+
+    Raises:
+        ValueError: Si el formato no coincide con ninguna plantilla registrada
+    """
+    huella = huella_libro(filepath, umbral)
+    if huella['tipo'] not in ETL_POR_TIPO:
+        raise ValueError(f"Formato de libro no reconocido: {filepath} (firma {huella['firma'][:12]})")
+
+    return ETL_POR_TIPO[huella['tipo']](filepath, plantilla=huella['plantilla'], **kwargs)
+
+
+def clasificar_libros(filepaths, umbral=UMBRAL_COINCIDENCIA):
+    """Huellas de varios libros como DataFrame (una fila por archivo)"""
+    filas = []
+    for filepath in filepaths:
+        try:
+            filas.append(huella_libro(filepath, umbral))
+        except Exception as e:
+            print(f"⚠️  No se pudo identificar {filepath}: {e}")
+            filas.append({'archivo': filepath, 'tipo': None, 'plantilla': None,
+                          'puntuacion': 0.0, 'puntuaciones': {}, 'firma': None})
+    return pd.DataFrame(filas, columns=['archivo', 'tipo', 'plantilla', 'puntuacion', 'puntuaciones', 'firma'])
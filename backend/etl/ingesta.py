@@ -0,0 +1,236 @@
+"""
+Ingesta masiva en paralelo de una carpeta de libros de laboratorio
+
+Descubre todos los .xlsx bajo una raíz, identifica el formato de cada uno por
+su huella, lo procesa con el ETL correspondiente en un pool de procesos y une
+los resultados en tablas indexadas por (archivo, registro). Los fallos de un
+archivo se registran sin detener el lote.
+
+Por defecto no se escriben snapshots (.snapshots/) en la carpeta ingerida;
+con --snapshots se reutilizan y guardan como en la aplicación.
+
+Uso:
+    python -m backend.etl.ingesta Data --workers 4 --salida ingesta_csv
+"""
+
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+from .huella import crear_etl
+from .snapshot import DIRECTORIO_SNAPSHOTS, snapshots
+
+
+def descubrir_libros(raiz, patron='**/*.xlsx'):
+    """Libros Excel bajo `raiz`, sin temporales de Office (~$) ni snapshots"""
+    libros = []
+    for ruta in glob.glob(os.path.join(raiz, patron), recursive=True):
+        partes = os.path.normpath(ruta).split(os.sep)
+        if os.path.basename(ruta).startswith('~$') or DIRECTORIO_SNAPSHOTS in partes:
+            continue
+        libros.append(ruta)
+    return sorted(libros)
+
+
+def _tablas_de(tipo, datos):
+    """
+    Normalizar la salida de un ETL a {tabla: lista de registros}
+
+    Las listas de registros y los DataFrame (con su índice como columna) son
+    tablas; un dict anidado es una tabla de un registro y los valores
+    escalares de un resultado tipo dict se agrupan en '<tipo>_resumen'.
+    """
+    if isinstance(datos, list):
+        return {tipo: datos}
+
+    tablas = {}
+    resumen = {}
+    for clave, valor in datos.items():
+        if isinstance(valor, list):
+            tablas[f"{tipo}_{clave}"] = valor
+        elif isinstance(valor, pd.DataFrame):
+            tablas[f"{tipo}_{clave}"] = valor.reset_index().to_dict('records')
+        elif isinstance(valor, dict):
+            tablas[f"{tipo}_{clave}"] = [valor]
+        else:
+            resumen[clave] = valor
+    if resumen:
+        tablas[f"{tipo}_resumen"] = [resumen]
+    return tablas
+
+
+def _extractor(etl):
+    """
+    Extractor y clave de snapshot del ETL de un libro
+
+    Se usa el extractor directamente y no load_data(), que registra los
+    errores y devuelve [] en lugar de lanzarlos. De los libros de hidrometría
+    se ingieren las lecturas tipadas y los parámetros del ensayo.
+    """
+    if etl.plantilla['tipo'] == 'hidrometria':
+        return etl._extraer_lecturas, etl._clave_snapshot(etl.SNAPSHOT_CLAVE_LECTURAS)
+    return etl._extraer_datos, etl._clave_snapshot(etl.SNAPSHOT_CLAVE)
+
+
+def procesar_libro(filepath, usar_snapshots=False):
+    """
+    Identificar y procesar un libro (se ejecuta en el proceso hijo)
+
+    Args:
+        filepath: Libro Excel
+        usar_snapshots: Reutilizar y guardar snapshots junto al libro
+
+    Returns:
+        dict con 'archivo', 'tipo', 'tablas', 'filas', 'duracion_s' y 'error'
+    """
+    t0 = time.perf_counter()
+    resultado = {'archivo': filepath, 'tipo': None, 'tablas': {}, 'filas': 0, 'duracion_s': None, 'error': None}
+    try:
+        etl = crear_etl(filepath)
+        resultado['tipo'] = etl.plantilla['tipo']
+        extractor, clave = _extractor(etl)
+        datos = snapshots.obtener(filepath, clave, extractor) if usar_snapshots else extractor()
+
+        resultado['tablas'] = _tablas_de(resultado['tipo'], datos)
+        resultado['filas'] = sum(len(registros) for registros in resultado['tablas'].values())
+        if not resultado['filas']:
+            raise ValueError("El libro no contiene registros")
+    except Exception as e:
+        resultado['error'] = str(e)
+
+    resultado['duracion_s'] = round(time.perf_counter() - t0, 3)
+    return resultado
+
+
+class IngestaMasiva:
+    """Procesa en paralelo todos los libros de una carpeta y une sus datos"""
+
+    def __init__(self, raiz, max_workers=None, usar_procesos=True, patron='**/*.xlsx', usar_snapshots=False):
+        self.raiz = raiz
+        self.max_workers = max_workers
+        self.usar_procesos = usar_procesos
+        self.patron = patron
+        self.usar_snapshots = usar_snapshots
+
+    def ejecutar(self):
+        """
+        Ejecutar la ingesta completa
+
+        Returns:
+            dict con 'tablas' ({nombre: DataFrame indexado por (archivo, registro)}),
+            'archivos' (DataFrame con el resultado de cada libro), 'fallos' y
+            'estadisticas' (archivos/s, filas/s...)
+        """
+        libros = descubrir_libros(self.raiz, self.patron)
+        print(f"📂 Ingesta: {len(libros)} libros encontrados en {self.raiz}")
+
+        t0 = time.perf_counter()
+        resultados = []
+        pendientes = list(libros)
+        if self.usar_procesos and pendientes:
+            pendientes = self._procesar_con_pool(ProcessPoolExecutor, pendientes, resultados)
+        if pendientes:
+            self._procesar_con_pool(ThreadPoolExecutor, pendientes, resultados)
+        duracion = time.perf_counter() - t0
+
+        return self._unir(resultados, duracion)
+
+    def _procesar_con_pool(self, pool_cls, libros, resultados):
+        """Procesar los libros indicados y devolver los que no llegaron a procesarse"""
+        restantes = list(libros)
+        try:
+            with pool_cls(max_workers=self.max_workers) as pool:
+                futuros = {pool.submit(procesar_libro, libro, self.usar_snapshots): libro for libro in libros}
+                for futuro in as_completed(futuros):
+                    libro = futuros[futuro]
+                    try:
+                        resultado = futuro.result()
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        resultado = {'archivo': libro, 'tipo': None, 'tablas': {}, 'filas': 0,
+                                     'duracion_s': None, 'error': str(e)}
+
+                    restantes.remove(libro)
+                    resultados.append(resultado)
+                    if resultado['error']:
+                        print(f"⚠️  {libro}: {resultado['error']}")
+        except (BrokenProcessPool, OSError, NotImplementedError) as e:
+            if pool_cls is not ProcessPoolExecutor:
+                raise
+            print(f"⚠️  Ingesta: fallo en el pool de procesos ({e}), se continúa con hilos")
+
+        return restantes
+
+    @staticmethod
+    def _unir(resultados, duracion):
+        """Unir los registros de todos los libros en tablas indexadas"""
+        resultados = sorted(resultados, key=lambda r: r['archivo'])
+
+        partes = {}
+        for resultado in resultados:
+            for nombre, registros in resultado['tablas'].items():
+                if registros:
+                    df = pd.DataFrame(registros)
+                    df.index = pd.MultiIndex.from_product(
+                        [[resultado['archivo']], range(len(df))], names=['archivo', 'registro']
+                    )
+                    partes.setdefault(nombre, []).append(df)
+        tablas = {nombre: pd.concat(dfs) for nombre, dfs in partes.items()}
+
+        archivos = pd.DataFrame(
+            [{k: r[k] for k in ('archivo', 'tipo', 'filas', 'duracion_s', 'error')} for r in resultados],
+            columns=['archivo', 'tipo', 'filas', 'duracion_s', 'error']
+        )
+        fallos = [{'archivo': r['archivo'], 'error': r['error']} for r in resultados if r['error']]
+
+        total_filas = int(archivos['filas'].sum()) if len(archivos) else 0
+        estadisticas = {
+            'archivos': len(resultados),
+            'correctos': len(resultados) - len(fallos),
+            'fallidos': len(fallos),
+            'filas': total_filas,
+            'duracion_s': round(duracion, 3),
+            'archivos_por_s': round(len(resultados) / duracion, 2) if duracion > 0 else 0,
+            'filas_por_s': round(total_filas / duracion, 2) if duracion > 0 else 0
+        }
+
+        print(f"✅ Ingesta: {estadisticas['correctos']}/{estadisticas['archivos']} libros, "
+              f"{total_filas} filas en {estadisticas['duracion_s']} s "
+              f"({estadisticas['archivos_por_s']} archivos/s, {estadisticas['filas_por_s']} filas/s)")
+
+        return {'tablas': tablas, 'archivos': archivos, 'fallos': fallos, 'estadisticas': estadisticas}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Ingesta masiva de libros de laboratorio')
+    parser.add_argument('raiz', help='Carpeta raíz con los libros .xlsx')
+    parser.add_argument('--workers', type=int, default=None, help='Procesos del pool (por defecto, uno por CPU)')
+    parser.add_argument('--hilos', action='store_true', help='Usar hilos en lugar de procesos')
+    parser.add_argument('--salida', default=None, help='Carpeta donde exportar cada tabla a CSV')
+    parser.add_argument('--snapshots', action='store_true', help='Reutilizar y guardar snapshots en .snapshots/ junto a cada libro')
+    args = parser.parse_args(argv)
+
+    resultado = IngestaMasiva(args.raiz, max_workers=args.workers, usar_procesos=not args.hilos,
+                              usar_snapshots=args.snapshots).ejecutar()
+
+    for fallo in resultado['fallos']:
+        print(f"❌ {fallo['archivo']}: {fallo['error']}")
+
+    if args.salida:
+        os.makedirs(args.salida, exist_ok=True)
+        for nombre, df in resultado['tablas'].items():
+            ruta = os.path.join(args.salida, f"{nombre}.csv")
+            df.to_csv(ruta, encoding='utf-8-sig')
+            print(f"💾 {nombre}: {len(df)} filas → {ruta}")
+
+    return 0 if not resultado['fallos'] else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
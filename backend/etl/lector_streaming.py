@@ -0,0 +1,128 @@
+"""
+Lector streaming de hojas Excel (modo solo lectura de openpyxl)
+
+Recorre la hoja fila a fila sin construir un DataFrame del libro completo,
+de modo que la memoria usada depende del tamaño de bloque y no del tamaño
+de la hoja.
+"""
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+
+class LectorStreaming:
+    """Lectura por filas o por bloques NumPy de una hoja de un libro Excel"""
+
+    def __init__(self, filepath, hoja=0):
+        self.filepath = filepath
+        self.hoja = hoja
+        self._libro = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _hoja(self):
+        if self._libro is None:
+            self._libro = load_workbook(self.filepath, read_only=True, data_only=True)
+        if isinstance(self.hoja, int):
+            return self._libro.worksheets[self.hoja]
+        return self._libro[self.hoja]
+
+    def close(self):
+        """Liberar el handle del libro"""
+        if self._libro is not None:
+            self._libro.close()
+            self._libro = None
+
+    def iter_filas(self, fila_inicio=0, fila_fin=None, col_inicio=0, col_fin=None):
+        """
+        Iterar las filas de la hoja como tuplas de valores Python
+
+        Los índices son base 0 y los límites finales exclusivos (como iloc).
+        Las celdas vacías se devuelven como NaN; si se indica col_fin todas las
+        filas tienen el mismo ancho.
+        """
+        ancho = None if col_fin is None else col_fin - col_inicio
+        filas = self._hoja().iter_rows(
+            min_row=fila_inicio + 1,
+            max_row=fila_fin,
+            min_col=col_inicio + 1,
+            max_col=col_fin,
+            values_only=True
+        )
+        for fila in filas:
+            valores = tuple(np.nan if v is None else v for v in fila)
+            if ancho is not None and len(valores) < ancho:
+                valores += (np.nan,) * (ancho - len(valores))
+            yield valores
+
+    def iter_matrices(self, columnas, fila_inicio=0, fila_fin=None, tamano_bloque=1024, columna_clave=None):
+        """
+        Iterar bloques object de tamaño fijo con las columnas indicadas
+
+        Args:
+            columnas: Índices (base 0) de las columnas a extraer
+            fila_inicio: Primera fila del bloque de datos
+            fila_fin: Fila final exclusiva (None = hasta el final de la hoja)
+            tamano_bloque: Filas por bloque; el último puede ser menor
+            columna_clave: Si se indica, la lectura termina en la primera fila
+                           con esa columna vacía
+
+        Yields:
+            np.ndarray object de forma (n, len(columnas)) con los valores de
+            las celdas tal como los da openpyxl (NaN si están vacías)
+        """
+        columnas = list(columnas)
+        col_inicio = min(columnas + ([columna_clave] if columna_clave is not None else []))
+        col_fin = max(columnas + ([columna_clave] if columna_clave is not None else [])) + 1
+        posiciones = [c - col_inicio for c in columnas]
+
+        bloque = np.empty((tamano_bloque, len(columnas)), dtype=object)
+        n = 0
+        for fila in self.iter_filas(fila_inicio, fila_fin, col_inicio, col_fin):
+            if columna_clave is not None and pd.isna(fila[columna_clave - col_inicio]):
+                break
+
+            bloque[n] = [fila[pos] for pos in posiciones]
+            n += 1
+
+            if n == tamano_bloque:
+                yield bloque.copy()
+                n = 0
+
+        if n:
+            yield bloque[:n].copy()
+
+    def iter_bloques(self, columnas, fila_inicio=0, fila_fin=None, tamano_bloque=1024, columna_clave=None):
+        """
+        Iterar bloques NumPy float64 de tamaño fijo con las columnas indicadas
+
+        Mismos argumentos que iter_matrices; los valores no numéricos son NaN.
+        """
+        columnas = list(columnas)
+        for valores in self.iter_matrices(columnas, fila_inicio, fila_fin, tamano_bloque, columna_clave):
+            numericas = [
+                [v if isinstance(v, (int, float)) and not isinstance(v, bool) else np.nan for v in fila]
+                for fila in valores
+            ]
+            yield np.array(numericas, dtype=np.float64).reshape(len(valores), len(columnas))
+
+    def leer_ventana(self, fila_fin, col_fin, fila_inicio=0, col_inicio=0):
+        """
+        Leer una ventana acotada de la hoja como DataFrame posicional
+
+        Equivale a pd.read_excel(header=None).iloc[fila_inicio:fila_fin,
+        col_inicio:col_fin] pero sin leer el resto de la hoja. Conserva los
+        índices de fila y columna originales.
+        """
+        filas = list(self.iter_filas(fila_inicio, fila_fin, col_inicio, col_fin))
+        return pd.DataFrame(
+            filas,
+            index=range(fila_inicio, fila_inicio + len(filas)),
+            columns=range(col_inicio, col_fin),
+            dtype=object
+        )
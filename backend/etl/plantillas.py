@@ -0,0 +1,275 @@
+"""
+Plantillas declarativas de disposición de celdas para los libros de laboratorio
+
+Cada formato de hoja se describe una sola vez como bloques con nombre:
+
+- 'tablas': filas [inicio, fin) x columnas con nombre -> un registro por fila;
+  con fin None y 'hasta_vacia' la tabla llega hasta la primera fila con esa
+  columna vacía (número de filas abierto)
+- 'registros': campos apilados en vertical desde uno o varios orígenes
+  (fila, columna) -> un registro por origen
+- 'celdas': valores sueltos (fila, columna)
+- 'etiquetas': valores localizados por su rótulo {'texto', 'columna', 'valor'}:
+  se busca el rótulo en 'columna' y se lee la celda de 'valor' en esa fila;
+  en lectura streaming, si la plantilla define 'filas_etiquetas', solo se
+  buscan en ese número de filas por debajo de la última tabla
+- 'anclas': textos [fila, columna, texto] que identifican el formato (ver huella.py)
+
+Los índices son base 0, como en pd.read_excel(header=None). El motor extrae
+cada bloque completo con slicing NumPy en lugar de leer celda a celda, y
+nuevas variantes de libro pueden añadirse como archivos JSON sin tocar código.
+"""
+
+import glob
+import json
+import os
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+
+PLANTILLA_HIDROMETRIA = {
+    'nombre': 'hidrometria-v1',
+    'tipo': 'hidrometria',
+    # Ensayo estándar de 13 lecturas; las tablas más largas se leen por bloques
+    'ventana': [28, 15],
+    'anclas': [[7, 2, 'Fecha'], [7, 3, 'Hora'], [7, 4, 't (min)'], [7, 6, 'Lr'], [7, 7, 'Lcr'], [7, 14, 'Ct']],
+    'tablas': {
+        'lecturas': {
+            'filas': [8, None],
+            'hasta_vacia': 'fecha',
+            'columnas': {
+                'fecha': 2, 'hora': 3, 't_min': 4, 'temperatura': 5, 'lr': 6, 'lcr': 7,
+                'pct_mas_fino': 8, 'lhcr': 9, 'l': 10, 'l_t': 11, 'k': 12, 'd_mm': 13, 'ct': 14
+            },
+            'texto': ['fecha', 'hora']
+        }
+    },
+    # Los parámetros van debajo de las lecturas: su fila depende de cuántas haya
+    'filas_etiquetas': 10,
+    'etiquetas': {
+        'ws': {'texto': 'Ws', 'columna': 2, 'valor': 3},
+        'gs': {'texto': 'Gs', 'columna': 2, 'valor': 3},
+        'cm': {'texto': 'Cm', 'columna': 2, 'valor': 3},
+        'cc': {'texto': 'CC', 'columna': 2, 'valor': 3},
+        'alfa': {'texto': 'Alfa', 'columna': 2, 'valor': 3}
+    }
+}
+
+PLANTILLA_CLASIFICACION = {
+    'nombre': 'clasificacion-v1',
+    'tipo': 'clasificacion',
+    'ventana': [32, 8],
+    'anclas': [[2, 1, 'Platon'], [4, 1, 'N° 10'], [6, 1, 'N° 200'], [19, 2, 'N° Tamiz'], [19, 6, '% Pasa']],
+    'registros': {
+        'muestras': {
+            'origenes': {'1': [2, 2], '2': [11, 2], '3': [2, 5], '4': [11, 5]},
+            'campos': ['platon', 'muestra', 'n10', 'n40', 'n200', 'fondo', 'total_muestra']
+        }
+    },
+    'tablas': {
+        'analisis_granulometrico': {
+            'filas': [20, 32],
+            'columnas': {
+                'nombre_muestra': 1, 'n_tamiz': 2, 'abertura_mm': 3, 'peso_retenido': 4,
+                'pct_retenido': 5, 'pct_pasa': 6, 'clasificacion': 7
+            },
+            'texto': ['nombre_muestra', 'clasificacion'],
+            'crudo': ['n_tamiz']
+        }
+    }
+}
+
+PLANTILLA_ATTERBERG = {
+    'nombre': 'atterberg-v1',
+    'tipo': 'atterberg',
+    'ventana': [27, 7],
+    'anclas': [[2, 3, 'N° Golpes'], [13, 1, 'Ensayo'], [24, 1, 'LL'], [25, 1, 'LP'], [26, 1, 'IP']],
+    'tablas': {
+        'limite_liquido': {
+            'filas': [3, 6],
+            'columnas': {
+                'ensayo': 1, 'caso': 2, 'n_golpes': 3, 'recipiente': 4,
+                'recipiente_suelo_h': 5, 'recipiente_suelo_s': 6
+            },
+            'texto': ['caso']
+        },
+        'limite_plastico': {
+            'filas': [14, 17],
+            'columnas': {'ensayo': 1, 'recipiente': 2, 'recipiente_suelo_h': 3, 'recipiente_suelo_s': 4}
+        }
+    },
+    'celdas': {'ll': [24, 2], 'lp': [25, 2], 'ip': [26, 2]}
+}
+
+# Registro de plantillas disponibles por nombre
+PLANTILLAS = {
+    p['nombre']: p for p in (PLANTILLA_HIDROMETRIA, PLANTILLA_CLASIFICACION, PLANTILLA_ATTERBERG)
+}
+
+
+def normalizar_texto(valor):
+    """Texto comparable: sin tildes, minúsculas y espacios simples"""
+    texto = unicodedata.normalize('NFKD', str(valor))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return ' '.join(texto.casefold().split())
+
+
+def registrar_plantilla(plantilla):
+    """Validar y registrar una plantilla para poder usarla por nombre"""
+    for clave in ('nombre', 'tipo', 'ventana'):
+        if clave not in plantilla:
+            raise ValueError(f"La plantilla no define '{clave}'")
+
+    PLANTILLAS[plantilla['nombre']] = plantilla
+    return plantilla
+
+
+def cargar_plantillas(directorio):
+    """Registrar todas las plantillas *.json de un directorio"""
+    cargadas = []
+    for ruta in sorted(glob.glob(os.path.join(directorio, '*.json'))):
+        with open(ruta, encoding='utf-8') as f:
+            cargadas.append(registrar_plantilla(json.load(f))['nombre'])
+    return cargadas
+
+
+def resolver_plantilla(plantilla):
+    """Aceptar una plantilla como dict o por nombre registrado"""
+    if isinstance(plantilla, dict):
+        return plantilla
+    if plantilla not in PLANTILLAS:
+        raise ValueError(f"Plantilla no registrada: {plantilla}")
+    return PLANTILLAS[plantilla]
+
+
+class MotorPlantillas:
+    """Extrae los bloques declarados en una plantilla de una hoja leída sin encabezados"""
+
+    def __init__(self, plantilla):
+        self.plantilla = resolver_plantilla(plantilla)
+
+    def _matriz(self, df):
+        """Valores de la hoja como matriz object, rellenada con NaN hasta la ventana"""
+        filas, columnas = self.plantilla['ventana']
+        raw = df.to_numpy(dtype=object)
+        filas = raw.shape[0] if filas is None else filas
+        if raw.shape[0] >= filas and raw.shape[1] >= columnas:
+            return raw
+
+        matriz = np.full((max(filas, raw.shape[0]), max(columnas, raw.shape[1])), np.nan, dtype=object)
+        matriz[:raw.shape[0], :raw.shape[1]] = raw
+        return matriz
+
+    @staticmethod
+    def _tipar(valores, nombres, texto=(), crudo=()):
+        """Convertir columnas de una matriz object: numéricas a float64 (NaN si no lo son)"""
+        columnas = {}
+        for j, nombre in enumerate(nombres):
+            col = valores[:, j]
+            if nombre in crudo:
+                columnas[nombre] = pd.Series(col, dtype=object)
+            elif nombre in texto:
+                columnas[nombre] = pd.Series(col, dtype=object).where(pd.notna(col), None)
+            else:
+                columnas[nombre] = pd.to_numeric(pd.Series(col, dtype=object), errors='coerce').astype(np.float64)
+        return pd.DataFrame(columnas)
+
+    def tabla(self, df, nombre, raw=None):
+        """
+        Extraer una tabla como DataFrame tipado, una fila por fila de la hoja
+
+        El índice conserva la fila original de la hoja. En attrs['filas_invalidas']
+        quedan las filas con texto en columnas numéricas.
+        """
+        spec = self.plantilla['tablas'][nombre]
+        raw = self._matriz(df) if raw is None else raw
+        inicio, fin = spec['filas']
+        return self.tipar_tabla(nombre, raw[inicio:fin, list(spec['columnas'].values())], inicio)
+
+    def tipar_tabla(self, nombre, valores, inicio):
+        """
+        Tipar filas ya leídas de una tabla (matriz object con sus columnas)
+
+        Args:
+            nombre: Tabla de la plantilla
+            valores: Una fila por fila de la hoja, columnas en el orden de la plantilla
+            inicio: Fila de la hoja de la primera fila de valores
+        """
+        spec = self.plantilla['tablas'][nombre]
+        nombres = list(spec['columnas'])
+
+        if spec.get('hasta_vacia'):
+            # Cortar en la primera fila con la columna clave vacía
+            vacias = pd.isna(valores[:, nombres.index(spec['hasta_vacia'])])
+            if vacias.any():
+                valores = valores[:int(np.argmax(vacias))]
+
+        tabla = self._tipar(valores, nombres, spec.get('texto', ()), spec.get('crudo', ()))
+        tabla.index = range(inicio, inicio + len(tabla))
+
+        numericas = [n for n in nombres if n not in spec.get('texto', ()) and n not in spec.get('crudo', ())]
+        invalidas = tabla[numericas].isna().to_numpy() & pd.notna(valores[:, [nombres.index(n) for n in numericas]])
+        tabla.attrs['filas_invalidas'] = tabla.index[invalidas.any(axis=1)].tolist()
+        return tabla
+
+    def registros(self, df, nombre, raw=None):
+        """Extraer registros verticales (campos apilados) desde cada origen"""
+        spec = self.plantilla['registros'][nombre]
+        raw = self._matriz(df) if raw is None else raw
+        origenes = np.array(list(spec['origenes'].values()), dtype=int)
+        campos = spec['campos']
+
+        filas = origenes[:, :1] + np.arange(len(campos))[None, :]
+        columnas = np.broadcast_to(origenes[:, 1:], filas.shape)
+        tabla = self._tipar(raw[filas, columnas], campos, spec.get('texto', ()), spec.get('crudo', ()))
+        tabla.index = list(spec['origenes'])
+        return tabla
+
+    def celdas(self, df, raw=None):
+        """Extraer las celdas sueltas como float (NaN si vacías o no numéricas)"""
+        spec = self.plantilla.get('celdas', {})
+        if not spec:
+            return {}
+
+        raw = self._matriz(df) if raw is None else raw
+        posiciones = np.array(list(spec.values()), dtype=int)
+        valores = pd.to_numeric(pd.Series(raw[posiciones[:, 0], posiciones[:, 1]], dtype=object), errors='coerce')
+        return dict(zip(spec, valores.astype(np.float64).tolist()))
+
+    def etiquetas(self, df, raw=None):
+        """
+        Extraer los valores localizados por rótulo como float
+
+        Se toma la primera fila cuyo rótulo empieza por el texto indicado; si
+        no aparece o la celda de valor no es numérica, el resultado es NaN.
+        """
+        spec = self.plantilla.get('etiquetas', {})
+        if not spec:
+            return {}
+
+        raw = self._matriz(df) if raw is None else raw
+        rotulos = {}
+        valores = {}
+        for nombre, etiqueta in spec.items():
+            columna = etiqueta['columna']
+            if columna not in rotulos:
+                rotulos[columna] = [normalizar_texto(v) if isinstance(v, str) else '' for v in raw[:, columna]]
+
+            buscado = normalizar_texto(etiqueta['texto'])
+            fila = next((i for i, r in enumerate(rotulos[columna]) if r.startswith(buscado)), None)
+            valor = raw[fila, etiqueta['valor']] if fila is not None else np.nan
+            valores[nombre] = float(pd.to_numeric(pd.Series([valor], dtype=object), errors='coerce').iloc[0])
+        return valores
+
+    def extraer(self, df):
+        """Extraer todos los bloques de la plantilla"""
+        raw = self._matriz(df)
+        celdas = self.celdas(df, raw)
+        celdas.update(self.etiquetas(df, raw))
+        return {
+            'tablas': {n: self.tabla(df, n, raw) for n in self.plantilla.get('tablas', {})},
+            'registros': {n: self.registros(df, n, raw) for n in self.plantilla.get('registros', {})},
+            'celdas': celdas
+        }
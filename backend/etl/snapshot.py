@@ -0,0 +1,133 @@
+"""
+Snapshots persistentes de los datos extraídos de los libros Excel
+
+Cada snapshot se guarda junto al archivo fuente (carpeta .snapshots) y queda
+asociado al mtime, tamaño y hash SHA-256 del libro. Si el libro cambia, el
+snapshot se detecta como obsoleto y se reconstruye automáticamente.
+"""
+
+import hashlib
+import os
+import pickle
+
+
+SNAPSHOT_VERSION = 1
+DIRECTORIO_SNAPSHOTS = '.snapshots'
+
+
+def firma_archivo(filepath):
+    """Firma barata del archivo: (mtime en ns, tamaño en bytes)"""
+    st = os.stat(filepath)
+    return st.st_mtime_ns, st.st_size
+
+
+def hash_archivo(filepath, tamano_bloque=1 << 20):
+    """Hash SHA-256 del contenido del archivo"""
+    h = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for bloque in iter(lambda: f.read(tamano_bloque), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+class SnapshotStore:
+    """Almacén de snapshots pickle de los datos extraídos por los ETL"""
+
+    def __init__(self, habilitado=None):
+        if habilitado is None:
+            habilitado = os.environ.get('HSGVA_SNAPSHOTS', '1') != '0'
+        self.habilitado = habilitado
+
+    def ruta_snapshot(self, filepath, clave):
+        """Ruta del snapshot de `clave` para el libro dado"""
+        directorio = os.path.join(os.path.dirname(os.path.abspath(filepath)), DIRECTORIO_SNAPSHOTS)
+        return os.path.join(directorio, f"{os.path.basename(filepath)}.{clave}.pkl")
+
+    def cargar(self, filepath, clave):
+        """
+        Cargar un snapshot válido
+
+        Returns:
+            tuple: (True, datos) si el snapshot es válido, (False, None) si falta o está obsoleto
+        """
+        ruta = self.ruta_snapshot(filepath, clave)
+        if not self.habilitado or not os.path.exists(ruta):
+            return False, None
+
+        try:
+            with open(ruta, 'rb') as f:
+                cabecera = pickle.load(f)
+                if cabecera.get('version') != SNAPSHOT_VERSION or cabecera.get('clave') != clave:
+                    return False, None
+
+                mtime_ns, tamano = firma_archivo(filepath)
+                if (mtime_ns, tamano) != (cabecera['mtime_ns'], cabecera['tamano']):
+                    # mtime distinto: solo es obsoleto si el contenido también cambió
+                    sha256 = hash_archivo(filepath)
+                    if sha256 != cabecera['sha256']:
+                        return False, None
+                    datos = pickle.load(f)
+                    self.guardar(filepath, clave, datos, firma=(mtime_ns, tamano), sha256=sha256)
+                    return True, datos
+
+                return True, pickle.load(f)
+        except Exception as e:
+            print(f"⚠️  Snapshot ilegible, se reconstruirá: {ruta} ({e})")
+            return False, None
+
+    def guardar(self, filepath, clave, datos, firma=None, sha256=None):
+        """
+        Guardar el snapshot de forma atómica junto al libro fuente
+
+        `firma` y `sha256` deben tomarse antes de parsear el libro para que una
+        edición concurrente no quede registrada como ya extraída.
+        """
+        if not self.habilitado:
+            return False
+
+        ruta = self.ruta_snapshot(filepath, clave)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+            mtime_ns, tamano = firma or firma_archivo(filepath)
+            cabecera = {
+                'version': SNAPSHOT_VERSION,
+                'clave': clave,
+                'mtime_ns': mtime_ns,
+                'tamano': tamano,
+                'sha256': sha256 or hash_archivo(filepath)
+            }
+            with open(temporal, 'wb') as f:
+                pickle.dump(cabecera, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(datos, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporal, ruta)
+            return True
+        except OSError as e:
+            print(f"⚠️  No se pudo guardar el snapshot {ruta}: {e}")
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            return False
+
+    def obtener(self, filepath, clave, extractor):
+        """
+        Devolver los datos del snapshot o, si no es válido, extraerlos y guardarlos
+
+        Args:
+            filepath: Libro Excel fuente
+            clave: Identificador del extractor (incluir versión si cambia el formato)
+            extractor: Función sin argumentos que parsea el libro
+        """
+        valido, datos = self.cargar(filepath, clave)
+        if valido:
+            return datos
+
+        firma = firma_archivo(filepath)
+        sha256 = hash_archivo(filepath) if self.habilitado else None
+        datos = extractor()
+        if datos is not None and len(datos):
+            self.guardar(filepath, clave, datos, firma=firma, sha256=sha256)
+        return datos
+
+
+# Almacén compartido por todos los ETL del proceso
+snapshots = SnapshotStore()
@@ -0,0 +1,73 @@
+"""
+Vigilancia de la carpeta Data/ para recargar los datasets en caliente
+
+Sondea la firma (mtime, tamaño) de los libros Excel en un hilo; un
+cambio se notifica cuando la firma deja de moverse durante un sondeo
+completo, para no recargar un libro que Excel todavía está guardando.
+"""
+
+import os
+import threading
+
+from .snapshot import DIRECTORIO_SNAPSHOTS, firma_archivo
+
+
+# Segundos entre sondeos (HSGVA_RECARGA; 0 = sin vigilancia)
+INTERVALO_RECARGA = 5.0
+
+# Archivos que se vigilan dentro de Data/ (las plantillas se leen al arrancar)
+EXTENSIONES = ('.xlsx', '.xlsm', '.xls')
+
+
+class VigilanteDatos:
+    """Hilo que llama a al_cambiar(rutas) cuando cambian archivos del directorio"""
+
+    def __init__(self, directorio, al_cambiar, intervalo=INTERVALO_RECARGA, extensiones=EXTENSIONES):
+        self.directorio = directorio
+        self.al_cambiar = al_cambiar
+        self.intervalo = intervalo
+        self.extensiones = extensiones
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def firmas(self):
+        """{ruta: firma} de los archivos vigilados (sin la carpeta de snapshots)"""
+        firmas = {}
+        for raiz, carpetas, archivos in os.walk(self.directorio):
+            carpetas[:] = [c for c in carpetas if c != DIRECTORIO_SNAPSHOTS]
+            for archivo in archivos:
+                if archivo.lower().endswith(self.extensiones) and not archivo.startswith('~$'):
+                    ruta = os.path.join(raiz, archivo)
+                    try:
+                        firmas[ruta] = firma_archivo(ruta)
+                    except OSError:
+                        continue
+        return firmas
+
+    def iniciar(self):
+        """Lanzar el hilo de vigilancia (idempotente)"""
+        if self._hilo is not None or not self.intervalo:
+            return False
+        self._hilo = threading.Thread(target=self._vigilar, name='hsgva-vigilante', daemon=True)
+        self._hilo.start()
+        return True
+
+    def detener(self):
+        self._detener.set()
+
+    def _vigilar(self):
+        conocidas = self.firmas()
+        pendientes = None
+        while not self._detener.wait(self.intervalo):
+            actuales = self.firmas()
+            cambiadas = {r for r in set(conocidas) | set(actuales) if conocidas.get(r) != actuales.get(r)}
+
+            if cambiadas and actuales == pendientes:
+                # Sin movimiento desde el sondeo anterior: el guardado terminó
+                conocidas, pendientes = actuales, None
+                try:
+                    self.al_cambiar(sorted(cambiadas))
+                except Exception as e:
+                    print(f"⚠️  Recarga de datos: {str(e)}")
+            else:
+                pendientes = actuales if cambiadas else None
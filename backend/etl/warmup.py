@@ -0,0 +1,193 @@
+"""
+Precarga (warm-up) en paralelo de los datos ETL
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+
+ESTADO_PENDIENTE = 'pendiente'
+ESTADO_CARGANDO = 'cargando'
+ESTADO_LISTO = 'listo'
+ESTADO_ERROR = 'error'
+
+SIN_DATOS = 'El ETL no devolvió datos (ver el registro del servidor)'
+
+
+def _cargar_en_proceso(etl):
+    """Ejecutar load_data en un proceso hijo y devolver los datos extraídos"""
+    return etl.load_data()
+
+
+class DatasetWarmup:
+    """
+    Carga los datasets registrados en segundo plano sobre un pool de procesos
+    (o de hilos) para que el servidor pueda atender peticiones de inmediato.
+    """
+
+    def __init__(self, max_workers=None, usar_procesos=None):
+        if usar_procesos is None:
+            usar_procesos = os.environ.get('HSGVA_WARMUP_PROCESOS', '1') != '0'
+
+        self.max_workers = max_workers
+        self.usar_procesos = usar_procesos
+        self._etls = {}
+        self._etiquetas = {}
+        self._datos = {}
+        self._estado = {}
+        self._lock = threading.Lock()
+        self._terminado = threading.Event()
+        self._hilo = None
+
+    def registrar(self, nombre, etl, etiqueta=None):
+        """Registrar un ETL cuyo load_data() se ejecutará en la precarga"""
+        with self._lock:
+            self._etls[nombre] = etl
+            self._etiquetas[nombre] = etiqueta or nombre
+            self._estado[nombre] = {
+                'estado': ESTADO_PENDIENTE,
+                'inicio': None,
+                'duracion_s': None,
+                'registros': None,
+                'error': None
+            }
+
+    def iniciar(self):
+        """Lanzar la precarga en segundo plano (idempotente, no bloquea)"""
+        with self._lock:
+            if self._hilo is not None:
+                return False
+
+            self._hilo = threading.Thread(target=self._ejecutar, name='hsgva-warmup', daemon=True)
+            self._hilo.start()
+            return True
+
+    def esperar(self, timeout=None):
+        """Bloquear hasta que todos los datasets terminen de cargar"""
+        self.iniciar()
+        return self._terminado.wait(timeout)
+
+    def recargar(self, *nombres):
+        """
+        Volver a cargar los datasets dados (o todos) tras un cambio en Data/
+
+        Espera a la precarga inicial y carga con hilos en el proceso actual;
+        si un dataset falla se siguen sirviendo sus datos anteriores.
+
+        Returns:
+            list: Nombres que no se pudieron recargar
+        """
+        self.esperar()
+        nombres = [n for n in (nombres or self._etls) if n in self._etls]
+        inicio = time.perf_counter()
+        self._cargar_con_pool(ThreadPoolExecutor, nombres)
+        fallidos = list(self.fallidos(*nombres))
+        for nombre in fallidos:
+            if self.obtener(nombre) is not None:
+                # Quedan los datos anteriores: el dataset sigue disponible
+                self._marcar(nombre, estado=ESTADO_LISTO)
+        print(f"🔄 Recarga de {', '.join(self._etiquetas[n] for n in nombres)} en {time.perf_counter() - inicio:.2f} s")
+        return fallidos
+
+    def _ejecutar(self):
+        inicio_total = time.perf_counter()
+        pendientes = list(self._etls)
+
+        if self.usar_procesos:
+            pendientes = self._cargar_con_pool(ProcessPoolExecutor, pendientes)
+            if pendientes:
+                print("⚠️  Precarga: pool de procesos no disponible, usando hilos")
+
+        if pendientes:
+            self._cargar_con_pool(ThreadPoolExecutor, pendientes)
+
+        print(f"✅ Precarga completada en {time.perf_counter() - inicio_total:.2f} s")
+        self._terminado.set()
+
+    def _cargar_con_pool(self, pool_cls, nombres):
+        """Cargar los datasets indicados y devolver los que no llegaron a cargarse"""
+        restantes = list(nombres)
+        if not restantes:
+            return restantes
+        en_procesos = pool_cls is ProcessPoolExecutor
+
+        try:
+            with pool_cls(max_workers=self.max_workers or len(nombres)) as pool:
+                futuros = {}
+                for nombre in nombres:
+                    etl = self._etls[nombre]
+                    self._marcar(nombre, estado=ESTADO_CARGANDO, inicio=time.time())
+                    futuro = pool.submit(_cargar_en_proceso, etl) if en_procesos else pool.submit(etl.load_data)
+                    futuros[futuro] = (nombre, time.perf_counter())
+
+                for futuro in as_completed(futuros):
+                    nombre, t0 = futuros[futuro]
+                    duracion = round(time.perf_counter() - t0, 3)
+                    try:
+                        datos = futuro.result()
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        restantes.remove(nombre)
+                        self._marcar(nombre, estado=ESTADO_ERROR, duracion_s=duracion, error=str(e))
+                        print(f"⚠️  {self._etiquetas[nombre]}: Error al cargar - {str(e)}")
+                        continue
+
+                    restantes.remove(nombre)
+                    if not datos:
+                        # Los ETL registran su error y devuelven [] en lugar de lanzarlo
+                        self._marcar(nombre, estado=ESTADO_ERROR, duracion_s=duracion, error=SIN_DATOS)
+                        print(f"⚠️  {self._etiquetas[nombre]}: {SIN_DATOS}")
+                        continue
+
+                    if en_procesos:
+                        # El ETL del proceso padre no vio la carga realizada en el hijo
+                        self._etls[nombre].data = datos
+                    with self._lock:
+                        self._datos[nombre] = datos
+                    self._marcar(nombre, estado=ESTADO_LISTO, duracion_s=duracion, registros=len(datos), error=None)
+                    print(f"✅ {self._etiquetas[nombre]}: {len(datos)} registros cargados ({duracion:.2f} s)")
+        except (BrokenProcessPool, OSError, NotImplementedError) as e:
+            if not en_procesos:
+                raise
+            print(f"⚠️  Precarga: fallo en el pool de procesos ({e})")
+            for nombre in restantes:
+                self._marcar(nombre, estado=ESTADO_PENDIENTE, inicio=None)
+
+        return restantes
+
+    def _marcar(self, nombre, **cambios):
+        with self._lock:
+            self._estado[nombre].update(cambios)
+
+    def esta_listo(self, *nombres):
+        """Indicar si los datasets dados (o todos) se cargaron correctamente"""
+        nombres = nombres or tuple(self._etls)
+        with self._lock:
+            return all(self._estado[n]['estado'] == ESTADO_LISTO for n in nombres)
+
+    def fallidos(self, *nombres):
+        """{nombre: error} de los datasets dados (o todos) cuya carga falló"""
+        nombres = nombres or tuple(self._etls)
+        with self._lock:
+            return {n: self._estado[n]['error'] for n in nombres if self._estado[n]['estado'] == ESTADO_ERROR}
+
+    def obtener(self, nombre, defecto=None):
+        """Obtener los datos cargados de un dataset"""
+        with self._lock:
+            return self._datos.get(nombre, defecto)
+
+    def estado(self):
+        """Estado de carga y tiempos por dataset"""
+        with self._lock:
+            datasets = {nombre: dict(info) for nombre, info in self._estado.items()}
+
+        return {
+            'listo': all(d['estado'] == ESTADO_LISTO for d in datasets.values()),
+            'fallidos': {n: d['error'] for n, d in datasets.items() if d['estado'] == ESTADO_ERROR},
+            'modo': 'procesos' if self.usar_procesos else 'hilos',
+            'datasets': datasets
+        }
@@ -0,0 +1,40 @@
+"""
+Núcleo numérico compartido por el backend y el ETL legado
+
+Todas las fórmulas de los ensayos y los motores de clasificación y de fases
+viven aquí con firmas de arrays de entrada y arrays de salida: sin dicts,
+sin textos y sin validaciones que lancen excepciones. Los errores se
+devuelven como códigos por fila que cada capa convierte en sus mensajes.
+Procesadores, ETL y grafo incremental llaman a estas funciones, de modo que
+una corrección o una optimización se hace una sola vez.
+
+El paquete no importa nada de backend.processors: son los procesadores los
+que importan de aquí.
+"""
+
+from .arreglos import SIN_ERROR, seleccionar, matriz
+from .ensayos import (
+    MENSAJES_ERROR_HUMEDAD, LIMITES_HUMEDAD, CLASIFICACIONES_HUMEDAD,
+    contenido_humedad, errores_humedad, clase_humedad,
+    GOLPES_REFERENCIA, MENSAJES_ERROR_FLUIDEZ, LIMITES_PLASTICIDAD,
+    ajustar_fluidez, limite_plastico, indice_plasticidad, clase_plasticidad
+)
+from .sucs import SIMBOLOS_SUCS, CODIGO_SUCS, SIN_CLASIFICAR, sobre_linea_a, clasificar_sucs_lote, errores_totales
+from .aashto import GRUPOS_AASHTO, CODIGO_AASHTO, indice_grupo, clasificar_aashto_lote
+from .fases import DENSIDAD_AGUA, MAGNITUDES, resolver_fases, errores_fases
+
+
+__all__ = [
+    # Humedad
+    'MENSAJES_ERROR_HUMEDAD', 'LIMITES_HUMEDAD', 'CLASIFICACIONES_HUMEDAD', 'SIN_ERROR',
+    'contenido_humedad', 'errores_humedad', 'clase_humedad',
+    # Atterberg
+    'GOLPES_REFERENCIA', 'MENSAJES_ERROR_FLUIDEZ', 'LIMITES_PLASTICIDAD',
+    'ajustar_fluidez', 'limite_plastico', 'indice_plasticidad', 'clase_plasticidad', 'matriz',
+    # Clasificación
+    'seleccionar', 'SIN_CLASIFICAR',
+    'SIMBOLOS_SUCS', 'CODIGO_SUCS', 'sobre_linea_a', 'clasificar_sucs_lote', 'errores_totales',
+    'GRUPOS_AASHTO', 'CODIGO_AASHTO', 'indice_grupo', 'clasificar_aashto_lote',
+    # Fases
+    'DENSIDAD_AGUA', 'MAGNITUDES', 'resolver_fases', 'errores_fases'
+]
@@ -0,0 +1,117 @@
+"""
+Motor vectorizado de clasificación AASHTO (M 145) e índice de grupo
+
+Clasifica columnas completas de F200, LL e IP (y, si se conocen, % que pasa
+los tamices N° 10 y N° 40) en una sola pasada con máscaras NumPy. El grupo
+se guarda como código uint8 que indexa GRUPOS_AASHTO.
+
+Sin tamices N° 10/N° 40 se reproducen exactamente los criterios históricos
+de ClasificacionProcessor. Con ellos se aplican los límites granulométricos
+completos de A-1-a, A-1-b y A-3, los cuatro subgrupos A-2 y el índice de
+grupo parcial de A-2-6 y A-2-7.
+"""
+
+import numpy as np
+
+from .arreglos import _arreglo, seleccionar
+
+
+# Tabla de grupos: código -> (grupo, descripción)
+GRUPOS_AASHTO = [
+    ('A-1-a', 'Fragmentos de roca, grava y arena'),
+    ('A-1-b', 'Grava y arena'),
+    ('A-3', 'Arena fina'),
+    ('A-2-4', 'Grava y arena limosa o arcillosa'),
+    ('A-2-5', 'Grava y arena limosa o arcillosa'),
+    ('A-2-6', 'Grava y arena arcillosa'),
+    ('A-2-7', 'Grava y arena arcillosa'),
+    ('A-4', 'Suelos limosos'),
+    ('A-5', 'Suelos limosos elásticos'),
+    ('A-6', 'Suelos arcillosos'),
+    ('A-7-5', 'Suelos arcillosos elásticos'),
+    ('A-7-6', 'Suelos arcillosos elásticos'),
+]
+
+CODIGO_AASHTO = {grupo: codigo for codigo, (grupo, _) in enumerate(GRUPOS_AASHTO)}
+
+# Código de las muestras sin datos suficientes
+SIN_CLASIFICAR = 255
+
+
+def indice_grupo(finos, ll, ip):
+    """
+    Índice de grupo IG = 0.2·a + 0.005·a·c + 0.01·b·d, redondeado y limitado a [0, 20]
+
+    Con a = F − 35, b = F − 15, c = LL − 40 y d = IP − 10 (cada uno ≥ 0); es
+    cero para F ≤ 35.
+    """
+    finos, ll, ip = np.broadcast_arrays(_arreglo(finos), _arreglo(ll), _arreglo(ip))
+    a = np.maximum(0, finos - 35)
+    b = np.maximum(0, finos - 15)
+    c = np.maximum(0, ll - 40)
+    d = np.maximum(0, ip - 10)
+
+    ig = np.clip(np.round(a * 0.2 + 0.005 * a * c + 0.01 * b * d), 0, 20)
+    return np.where(finos <= 35, 0.0, ig)
+
+
+def clasificar_aashto_lote(finos, ll, ip, p10=None, p40=None):
+    """
+    Grupo AASHTO e índice de grupo de muchas muestras a la vez
+
+    Args:
+        finos: % que pasa el tamiz N° 200
+        ll, ip: Límite líquido e índice de plasticidad
+        p10, p40: % que pasa los tamices N° 10 y N° 40 (opcionales; NaN o None
+                  en una muestra = desconocido)
+
+    Returns:
+        tuple (códigos uint8 de GRUPOS_AASHTO, índices de grupo int)
+    """
+    finos, ll, ip, p10, p40 = np.broadcast_arrays(*(_arreglo(v) for v in (finos, ll, ip, p10, p40)))
+
+    ig = indice_grupo(finos, ll, ip)
+    with np.errstate(invalid='ignore'):
+        granular = finos <= 35
+        tamices = ~np.isnan(p10) & ~np.isnan(p40)
+
+        # Criterios históricos: solo F200 e IP
+        historico = seleccionar(
+            [(finos <= 15) & (ip <= 6),
+             (finos <= 25) & (ip <= 6),
+             (finos <= 10) & (ip == 0),
+             ip <= 10],
+            [CODIGO_AASHTO['A-1-a'], CODIGO_AASHTO['A-1-b'], CODIGO_AASHTO['A-3'], CODIGO_AASHTO['A-2-4']],
+            CODIGO_AASHTO['A-2-7']
+        )
+
+        # Criterios completos de M 145 con los tamices N° 10 y N° 40
+        completo = seleccionar(
+            [(p10 <= 50) & (p40 <= 30) & (finos <= 15) & (ip <= 6),
+             (p40 <= 50) & (finos <= 25) & (ip <= 6),
+             (p40 >= 51) & (finos <= 10) & (ip == 0),
+             (ll <= 40) & (ip <= 10),
+             ip <= 10,
+             ll <= 40],
+            [CODIGO_AASHTO['A-1-a'], CODIGO_AASHTO['A-1-b'], CODIGO_AASHTO['A-3'],
+             CODIGO_AASHTO['A-2-4'], CODIGO_AASHTO['A-2-5'], CODIGO_AASHTO['A-2-6']],
+            CODIGO_AASHTO['A-2-7']
+        )
+        # En A-2-6 y A-2-7 el índice de grupo solo usa el término del IP
+        a2_plastico = tamices & granular & ((completo == CODIGO_AASHTO['A-2-6']) | (completo == CODIGO_AASHTO['A-2-7']))
+        ig = np.where(a2_plastico, np.clip(np.round(0.01 * (finos - 15) * np.maximum(0, ip - 10)), 0, 20), ig)
+
+        limo_arcilla = seleccionar(
+            [(ll <= 40) & (ip <= 10),
+             ll <= 40,
+             ip <= 10,
+             ip <= ll - 30],
+            [CODIGO_AASHTO['A-4'], CODIGO_AASHTO['A-6'], CODIGO_AASHTO['A-5'], CODIGO_AASHTO['A-7-5']],
+            CODIGO_AASHTO['A-7-6']
+        )
+
+    codigos = np.where(granular, np.where(tamices, completo, historico), limo_arcilla)
+    sin_datos = np.isnan(finos) | np.isnan(ll) | np.isnan(ip)
+    codigos = np.where(sin_datos, SIN_CLASIFICAR, codigos).astype(np.uint8)
+    ig = np.where(sin_datos, 0, ig).astype(np.int64)
+    return codigos, ig
@@ -0,0 +1,35 @@
+"""
+Utilidades de arrays comunes a todas las fórmulas del núcleo
+"""
+
+import numpy as np
+
+
+# Código de fila válida
+SIN_ERROR = -1
+
+
+def _arreglo(valores):
+    """float64 con NaN en lugar de None"""
+    return np.array(valores, dtype=np.float64)
+
+
+def seleccionar(condiciones, opciones, defecto):
+    """
+    Igual que np.select (gana la primera condición verdadera), encadenando
+    np.where desde la última; mismo coste con arrays grandes y mucho menos
+    coste fijo con una sola muestra (grafo incremental, consultas sueltas)
+    """
+    resultado = np.asarray(defecto)
+    for condicion, opcion in zip(reversed(condiciones), reversed(opciones)):
+        resultado = np.where(condicion, opcion, resultado)
+    return resultado
+
+
+def matriz(filas, relleno=np.nan):
+    """Lista de listas de distinta longitud -> matriz float64 rellenada"""
+    filas = [list(f) if f is not None else [] for f in filas]
+    resultado = np.full((len(filas), max([len(f) for f in filas] + [1])), relleno)
+    for i, fila in enumerate(filas):
+        resultado[i, :len(fila)] = [np.nan if v is None else v for v in fila]
+    return resultado
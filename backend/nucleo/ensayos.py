@@ -0,0 +1,151 @@
+"""
+Contenido de humedad (ASTM D2216) y límites de Atterberg (ASTM D4318)
+"""
+
+import numpy as np
+
+from .arreglos import SIN_ERROR, _arreglo, seleccionar
+
+
+# ----------------------------------------------------------------------------
+# Contenido de humedad (ASTM D2216)
+# ----------------------------------------------------------------------------
+
+# Código de error -> mensaje, en el orden en que se comprueban
+MENSAJES_ERROR_HUMEDAD = [
+    "Los pesos deben ser numéricos",
+    "El peso húmedo debe ser mayor que el peso del recipiente",
+    "El peso seco debe ser mayor que el peso del recipiente",
+    "El peso seco debe ser menor que el peso húmedo"
+]
+
+# Límites superiores (%) de cada clase de humedad
+LIMITES_HUMEDAD = np.array([10.0, 20.0, 30.0])
+CLASIFICACIONES_HUMEDAD = np.array(['Muy Seco', 'Seco', 'Húmedo', 'Muy Húmedo'], dtype=object)
+
+
+def contenido_humedad(recipiente, humedo, seco):
+    """
+    Humedad de muchos recipientes
+
+    Returns:
+        tuple (w %, peso del agua, peso del suelo seco); w es NaN donde el
+        suelo seco pesa 0
+    """
+    recipiente, humedo, seco = np.broadcast_arrays(_arreglo(recipiente), _arreglo(humedo), _arreglo(seco))
+    peso_agua = humedo - seco
+    peso_suelo_seco = seco - recipiente
+    with np.errstate(invalid='ignore', divide='ignore'):
+        humedad = np.where(peso_suelo_seco != 0, peso_agua / peso_suelo_seco * 100, np.nan)
+    return humedad, peso_agua, peso_suelo_seco
+
+
+def errores_humedad(recipiente, humedo, seco):
+    """Código (índice de MENSAJES_ERROR_HUMEDAD) del primer error de cada fila; SIN_ERROR si es válida"""
+    recipiente, humedo, seco = np.broadcast_arrays(_arreglo(recipiente), _arreglo(humedo), _arreglo(seco))
+    with np.errstate(invalid='ignore'):
+        return seleccionar(
+            [np.isnan(recipiente) | np.isnan(humedo) | np.isnan(seco),
+             humedo <= recipiente,
+             seco <= recipiente,
+             seco > humedo],
+            [0, 1, 2, 3],
+            SIN_ERROR
+        ).astype(np.int8)
+
+
+def clase_humedad(humedad):
+    """Índice de CLASIFICACIONES_HUMEDAD de cada humedad (%)"""
+    return np.searchsorted(LIMITES_HUMEDAD, _arreglo(humedad), side='right')
+
+
+# ----------------------------------------------------------------------------
+# Límites de Atterberg (ASTM D4318)
+# ----------------------------------------------------------------------------
+
+# Número de golpes de referencia del límite líquido
+GOLPES_REFERENCIA = 25
+
+MENSAJES_ERROR_FLUIDEZ = [
+    "Se requieren al menos 2 puntos de datos",
+    "Los puntos deben tener distinto número de golpes"
+]
+
+# IP (%) que separa las clases baja / media / alta (IP ≤ 0: no plástico)
+LIMITES_PLASTICIDAD = np.array([7.0, 17.0])
+
+
+def ajustar_fluidez(golpes, humedad):
+    """
+    Recta de fluidez w = a + b·log10(N) de muchas muestras a la vez
+
+    Mínimos cuadrados en forma cerrada sobre matrices (muestras x puntos)
+    rellenadas con NaN; los puntos con golpes ≤ 0 o humedad NaN se ignoran.
+
+    Returns:
+        dict de arrays por muestra: 'limite_liquido' (w a 25 golpes),
+        'pendiente', 'intercepto', 'r2', 'residuos' (matriz, NaN fuera de los
+        puntos válidos), 'validos' (matriz bool), 'extrapolado' y 'error'
+        (índice de MENSAJES_ERROR_FLUIDEZ o SIN_ERROR)
+    """
+    golpes = np.atleast_2d(_arreglo(golpes))
+    humedad = np.atleast_2d(_arreglo(humedad))
+
+    with np.errstate(invalid='ignore'):
+        validos = (golpes > 0) & ~np.isnan(humedad)
+    x = np.where(validos, np.log10(np.where(validos, golpes, 1)), 0.0)
+    y = np.where(validos, humedad, 0.0)
+
+    n = validos.sum(axis=1)
+    sx, sy = x.sum(axis=1), y.sum(axis=1)
+    sxx, sxy = (x * x).sum(axis=1), (x * y).sum(axis=1)
+    denominador = n * sxx - sx ** 2
+
+    error = seleccionar([n < 2, np.isclose(denominador, 0)], [0, 1], SIN_ERROR).astype(np.int8)
+    ajustable = error == SIN_ERROR
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pendiente = np.where(ajustable, (n * sxy - sx * sy) / denominador, np.nan)
+        intercepto = (sy - pendiente * sx) / n
+        limite_liquido = intercepto + pendiente * np.log10(GOLPES_REFERENCIA)
+
+        ajuste = intercepto[:, None] + pendiente[:, None] * x
+        residuos = np.where(validos, y - ajuste, np.nan)
+        ss_res = np.nansum(residuos ** 2, axis=1)
+        ss_tot = ((y - (sy / n)[:, None]) ** 2 * validos).sum(axis=1)
+        r2 = np.where(ss_tot > 0, 1 - ss_res / ss_tot, 1.0)
+
+    # El LL se extrapola si los golpes no rodean a 25
+    extrapolado = ((np.where(validos, golpes, np.inf).min(axis=1) > GOLPES_REFERENCIA)
+                   | (np.where(validos, golpes, -np.inf).max(axis=1) < GOLPES_REFERENCIA))
+
+    return {
+        'limite_liquido': limite_liquido,
+        'pendiente': pendiente,
+        'intercepto': intercepto,
+        'r2': r2,
+        'residuos': residuos,
+        'validos': validos,
+        'extrapolado': extrapolado,
+        'error': error
+    }
+
+
+def limite_plastico(humedades):
+    """Promedio por fila de las determinaciones (matriz rellenada con NaN); NaN si no hay ninguna"""
+    humedades = np.atleast_2d(_arreglo(humedades))
+    validas = ~np.isnan(humedades)
+    n = validas.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(n > 0, np.where(validas, humedades, 0.0).sum(axis=1) / n, np.nan)
+
+
+def indice_plasticidad(limite_liquido, limite_plastico):
+    """IP = LL − LP, 0 si el suelo no es plástico (LL ≤ LP)"""
+    return np.maximum(_arreglo(limite_liquido) - _arreglo(limite_plastico), 0.0)
+
+
+def clase_plasticidad(ip):
+    """0 = no plástico, 1 = baja, 2 = media, 3 = alta (IP < 7, < 17, ≥ 17)"""
+    ip = _arreglo(ip)
+    return np.where(ip > 0, np.searchsorted(LIMITES_PLASTICIDAD, ip, side='right') + 1, 0)
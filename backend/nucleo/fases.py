@@ -0,0 +1,179 @@
+"""
+Relaciones de fases del suelo
+
+Resuelve todas las magnitudes de fase (relación de vacíos, porosidad,
+saturación, humedad, densidades, pesos y volúmenes) a partir de cualquier
+subconjunto suficiente de datos, para muchas probetas a la vez. Cada probeta
+puede traer datos distintos: las reglas se aplican con máscaras NumPy hasta
+que no queda nada por despejar.
+"""
+
+import numpy as np
+
+
+# Densidad del agua (g/cm³)
+DENSIDAD_AGUA = 1.0
+
+# Magnitudes que se expresan en % en la entrada y la salida (internamente, fracción)
+PORCENTUALES = ('humedad', 'porosidad', 'saturacion')
+
+MAGNITUDES = (
+    'gravedad_especifica', 'relacion_vacios', 'porosidad', 'saturacion', 'humedad',
+    'densidad', 'densidad_seca', 'densidad_saturada', 'densidad_sumergida',
+    'peso_total', 'peso_solidos', 'peso_agua',
+    'volumen_total', 'volumen_solidos', 'volumen_vacios', 'volumen_agua', 'volumen_aire'
+)
+
+# Magnitudes mínimas para considerar resuelta una probeta
+ESENCIALES = ('gravedad_especifica', 'relacion_vacios', 'saturacion')
+
+# Tolerancia relativa de las comprobaciones de coherencia
+TOLERANCIA = 1e-3
+
+
+def reglas_fases(gw=DENSIDAD_AGUA):
+    """
+    Reglas (incógnita, datos, fórmula) de las relaciones de fase
+
+    Porosidad, saturación y humedad van en fracción.
+    """
+    return [
+        # Relación de vacíos y porosidad
+        ('relacion_vacios', ('porosidad',), lambda n: n / (1 - n)),
+        ('porosidad', ('relacion_vacios',), lambda e: e / (1 + e)),
+        # Densidades total y seca con la humedad
+        ('densidad_seca', ('densidad', 'humedad'), lambda g, w: g / (1 + w)),
+        ('densidad', ('densidad_seca', 'humedad'), lambda gd, w: gd * (1 + w)),
+        ('humedad', ('densidad', 'densidad_seca'), lambda g, gd: g / gd - 1),
+        # Densidad seca, Gs y relación de vacíos
+        ('relacion_vacios', ('gravedad_especifica', 'densidad_seca'), lambda gs, gd: gs * gw / gd - 1),
+        ('gravedad_especifica', ('densidad_seca', 'relacion_vacios'), lambda gd, e: gd * (1 + e) / gw),
+        ('densidad_seca', ('gravedad_especifica', 'relacion_vacios'), lambda gs, e: gs * gw / (1 + e)),
+        # S·e = w·Gs
+        ('humedad', ('saturacion', 'relacion_vacios', 'gravedad_especifica'), lambda s, e, gs: s * e / gs),
+        ('saturacion', ('humedad', 'gravedad_especifica', 'relacion_vacios'), lambda w, gs, e: w * gs / e),
+        ('relacion_vacios', ('humedad', 'gravedad_especifica', 'saturacion'), lambda w, gs, s: w * gs / s),
+        ('gravedad_especifica', ('saturacion', 'relacion_vacios', 'humedad'), lambda s, e, w: s * e / w),
+        # Densidad total con Gs, e y S
+        ('densidad', ('gravedad_especifica', 'relacion_vacios', 'saturacion'),
+         lambda gs, e, s: (gs + s * e) * gw / (1 + e)),
+        ('saturacion', ('densidad', 'gravedad_especifica', 'relacion_vacios'),
+         lambda g, gs, e: (g * (1 + e) / gw - gs) / e),
+        # Densidad saturada
+        ('densidad_saturada', ('gravedad_especifica', 'relacion_vacios'), lambda gs, e: (gs + e) * gw / (1 + e)),
+        ('densidad_saturada', ('densidad_seca', 'porosidad'), lambda gd, n: gd + n * gw),
+        ('porosidad', ('densidad_saturada', 'densidad_seca'), lambda gsat, gd: (gsat - gd) / gw),
+        ('relacion_vacios', ('densidad_saturada', 'gravedad_especifica'), lambda gsat, gs: (gs * gw - gsat) / (gsat - gw)),
+        ('gravedad_especifica', ('densidad_saturada', 'relacion_vacios'), lambda gsat, e: gsat * (1 + e) / gw - e),
+        ('densidad_sumergida', ('densidad_saturada',), lambda gsat: gsat - gw),
+        ('densidad_saturada', ('densidad_sumergida',), lambda gsub: gsub + gw),
+        # Pesos
+        ('peso_total', ('peso_solidos', 'peso_agua'), lambda ws, ww: ws + ww),
+        ('peso_solidos', ('peso_total', 'humedad'), lambda wt, w: wt / (1 + w)),
+        ('peso_solidos', ('peso_total', 'peso_agua'), lambda wt, ww: wt - ww),
+        ('peso_agua', ('peso_solidos', 'humedad'), lambda ws, w: ws * w),
+        ('peso_agua', ('peso_total', 'peso_solidos'), lambda wt, ws: wt - ws),
+        ('humedad', ('peso_agua', 'peso_solidos'), lambda ww, ws: ww / ws),
+        # Volúmenes
+        ('volumen_total', ('volumen_solidos', 'volumen_vacios'), lambda vs, vv: vs + vv),
+        ('volumen_vacios', ('volumen_agua', 'volumen_aire'), lambda vw, va: vw + va),
+        ('volumen_vacios', ('volumen_total', 'volumen_solidos'), lambda vt, vs: vt - vs),
+        ('volumen_solidos', ('volumen_total', 'volumen_vacios'), lambda vt, vv: vt - vv),
+        ('volumen_aire', ('volumen_vacios', 'volumen_agua'), lambda vv, vw: vv - vw),
+        ('volumen_agua', ('peso_agua',), lambda ww: ww / gw),
+        ('peso_agua', ('volumen_agua',), lambda vw: vw * gw),
+        ('volumen_solidos', ('peso_solidos', 'gravedad_especifica'), lambda ws, gs: ws / (gs * gw)),
+        ('peso_solidos', ('volumen_solidos', 'gravedad_especifica'), lambda vs, gs: vs * gs * gw),
+        ('gravedad_especifica', ('peso_solidos', 'volumen_solidos'), lambda ws, vs: ws / (vs * gw)),
+        ('volumen_vacios', ('relacion_vacios', 'volumen_solidos'), lambda e, vs: e * vs),
+        ('volumen_solidos', ('volumen_vacios', 'relacion_vacios'), lambda vv, e: vv / e),
+        ('volumen_total', ('volumen_solidos', 'relacion_vacios'), lambda vs, e: vs * (1 + e)),
+        ('volumen_solidos', ('volumen_total', 'relacion_vacios'), lambda vt, e: vt / (1 + e)),
+        ('relacion_vacios', ('volumen_vacios', 'volumen_solidos'), lambda vv, vs: vv / vs),
+        ('saturacion', ('volumen_agua', 'volumen_vacios'), lambda vw, vv: vw / vv),
+        ('volumen_agua', ('saturacion', 'volumen_vacios'), lambda s, vv: s * vv),
+        # Densidades con pesos y volumen total
+        ('densidad', ('peso_total', 'volumen_total'), lambda wt, vt: wt / vt),
+        ('densidad_seca', ('peso_solidos', 'volumen_total'), lambda ws, vt: ws / vt),
+        ('volumen_total', ('peso_total', 'densidad'), lambda wt, g: wt / g),
+        ('volumen_total', ('peso_solidos', 'densidad_seca'), lambda ws, gd: ws / gd),
+        ('peso_total', ('densidad', 'volumen_total'), lambda g, vt: g * vt),
+        ('peso_solidos', ('densidad_seca', 'volumen_total'), lambda gd, vt: gd * vt),
+    ]
+
+
+# Identidades que deben cumplirse si se dieron más datos de los necesarios
+COMPROBACIONES = (
+    ('S·e = w·Gs', lambda v, gw: (v['saturacion'] * v['relacion_vacios'], v['humedad'] * v['gravedad_especifica'])),
+    ('ρd = Gs·ρw/(1+e)', lambda v, gw: (v['densidad_seca'] * (1 + v['relacion_vacios']), v['gravedad_especifica'] * gw)),
+    ('ρ = ρd·(1+w)', lambda v, gw: (v['densidad'], v['densidad_seca'] * (1 + v['humedad']))),
+    ('n = e/(1+e)', lambda v, gw: (v['porosidad'] * (1 + v['relacion_vacios']), v['relacion_vacios'])),
+    ('Vt = Vs + Vv', lambda v, gw: (v['volumen_total'], v['volumen_solidos'] + v['volumen_vacios'])),
+    ('Wt = Ws + Ww', lambda v, gw: (v['peso_total'], v['peso_solidos'] + v['peso_agua'])),
+)
+
+
+def resolver_fases(conocidas, gw=DENSIDAD_AGUA, max_pasadas=None):
+    """
+    Despejar todas las magnitudes de fase para muchas probetas
+
+    Args:
+        conocidas: dict {magnitud: array} con NaN donde el dato no se conoce;
+                   porosidad, saturación y humedad en fracción
+        gw: Densidad del agua
+        max_pasadas: Límite de pasadas sobre las reglas (por defecto, una por regla)
+
+    Returns:
+        dict {magnitud: array float64} con todas las MAGNITUDES (NaN si no se
+        pudo despejar)
+    """
+    n = len(next(iter(conocidas.values()))) if conocidas else 0
+    valores = {m: np.full(n, np.nan) for m in MAGNITUDES}
+    for magnitud, datos in conocidas.items():
+        valores[magnitud] = np.array(datos, dtype=np.float64)
+
+    reglas = reglas_fases(gw)
+    for _ in range(max_pasadas or len(reglas)):
+        cambios = False
+        for incognita, datos, formula in reglas:
+            faltan = np.isnan(valores[incognita])
+            if not faltan.any():
+                continue
+            aplicable = faltan.copy()
+            for dato in datos:
+                aplicable &= ~np.isnan(valores[dato])
+            if not aplicable.any():
+                continue
+
+            with np.errstate(invalid='ignore', divide='ignore'):
+                resultado = formula(*(valores[dato][aplicable] for dato in datos))
+            finito = np.isfinite(resultado)
+            if finito.any():
+                indices = np.flatnonzero(aplicable)[finito]
+                valores[incognita][indices] = resultado[finito]
+                cambios = True
+        if not cambios:
+            break
+    return valores
+
+
+def errores_fases(valores, gw=DENSIDAD_AGUA, tolerancia=TOLERANCIA):
+    """Mensaje de error por probeta ('' si está resuelta y es coherente)"""
+    n = len(valores['relacion_vacios'])
+    errores = np.full(n, '', dtype=object)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for nombre, identidad in COMPROBACIONES:
+            a, b = identidad(valores, gw)
+            incoherente = np.abs(a - b) > tolerancia * np.maximum(np.abs(a), np.abs(b)) + 1e-9
+            errores = np.where((errores == '') & incoherente, f"Datos incoherentes: no se cumple {nombre}", errores)
+
+        e, s = valores['relacion_vacios'], valores['saturacion']
+        fuera = (e <= 0) | (s < -tolerancia) | (s > 1 + tolerancia) | (valores['gravedad_especifica'] <= 1)
+        errores = np.where((errores == '') & fuera, "Datos fuera de rango: e > 0, 0 ≤ S ≤ 100 % y Gs > 1", errores)
+
+    faltan = np.zeros(n, dtype=bool)
+    for magnitud in ESENCIALES:
+        faltan |= np.isnan(valores[magnitud])
+    return np.where(faltan, "Datos insuficientes para resolver Gs, e y S", errores)
+
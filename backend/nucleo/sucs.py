@@ -0,0 +1,148 @@
+"""
+Motor vectorizado de clasificación SUCS (ASTM D2487)
+
+Clasifica arrays completos de (grava, arena, finos, LL, IP, Cu, Cc) con
+máscaras NumPy. Cada muestra recibe un código uint8 que indexa la tabla
+SIMBOLOS_SUCS; los nombres y descripciones se generan solo a la salida.
+"""
+
+import numpy as np
+
+from .arreglos import _arreglo, seleccionar
+
+
+# Tabla de símbolos: código -> (símbolo, nombre, tipo, plantilla de descripción)
+SIMBOLOS_SUCS = [
+    ('M/C', 'Limo o Arcilla', 'Suelo Fino', 'Se requieren límites de Atterberg para clasificación precisa'),
+    ('CL', 'Arcilla de baja plasticidad', 'Suelo Fino', 'LL={ll}%, IP={ip}%'),
+    ('ML-CL', 'Limo-Arcilla', 'Suelo Fino', 'LL={ll}%, IP={ip}%'),
+    ('ML', 'Limo de baja plasticidad', 'Suelo Fino', 'LL={ll}%, IP={ip}%'),
+    ('CH', 'Arcilla de alta plasticidad', 'Suelo Fino', 'LL={ll}%, IP={ip}%'),
+    ('MH', 'Limo de alta plasticidad', 'Suelo Fino', 'LL={ll}%, IP={ip}%'),
+    ('GW', 'Grava bien graduada', 'Grava', 'Cu={cu}, Cc={cc}'),
+    ('GP', 'Grava mal graduada', 'Grava', 'Cu={cu}, Cc={cc}'),
+    ('GW/GP', 'Grava bien/mal graduada', 'Grava', 'Se requiere análisis granulométrico completo'),
+    ('GW-GM', 'Grava bien graduada con limo', 'Grava', '{finos}% finos, Cu={cu}, Cc={cc}'),
+    ('GW-GC', 'Grava bien graduada con arcilla', 'Grava', '{finos}% finos, Cu={cu}, Cc={cc}'),
+    ('GP-GM', 'Grava mal graduada con limo', 'Grava', '{finos}% finos, Cu={cu}, Cc={cc}'),
+    ('GP-GC', 'Grava mal graduada con arcilla', 'Grava', '{finos}% finos, Cu={cu}, Cc={cc}'),
+    ('GW-GM/GC', 'Grava con finos', 'Grava', '{finos}% finos (caso borde)'),
+    ('GM', 'Grava limosa', 'Grava', '{finos}% finos'),
+    ('GC', 'Grava arcillosa', 'Grava', '{finos}% finos'),
+    ('GC-GM', 'Grava limo-arcillosa', 'Grava', '{finos}% finos'),
+    ('SW', 'Arena bien graduada', 'Arena', 'Cu={cu}, Cc={cc}'),
+    ('SP', 'Arena mal graduada', 'Arena', 'Cu={cu}, Cc={cc}'),
+    ('SW/SP', 'Arena bien/mal graduada', 'Arena', 'Se requiere análisis granulométrico completo'),
+    ('SW-SM', 'Arena bien graduada con limo', 'Arena', '{finos}% finos, Cu={cu}, Cc={cc}'),
+    ('SW-SC', 'Arena bien graduada con arcilla', 'Arena', '{finos}% finos, Cu={cu}, Cc={cc}'),
+    ('SP-SM', 'Arena mal graduada con limo', 'Arena', '{finos}% finos, Cu={cu}, Cc={cc}'),
+    ('SP-SC', 'Arena mal graduada con arcilla', 'Arena', '{finos}% finos, Cu={cu}, Cc={cc}'),
+    ('SW-SM/SC', 'Arena con finos', 'Arena', '{finos}% finos (caso borde)'),
+    ('SM', 'Arena limosa', 'Arena', '{finos}% finos'),
+    ('SC', 'Arena arcillosa', 'Arena', '{finos}% finos'),
+    ('SC-SM', 'Arena limo-arcillosa', 'Arena', '{finos}% finos'),
+]
+
+CODIGO_SUCS = {fila[0]: codigo for codigo, fila in enumerate(SIMBOLOS_SUCS)}
+
+# Código de las muestras que no pudieron clasificarse (ver errores)
+SIN_CLASIFICAR = 255
+
+# Tolerancia de la suma grava + arena + finos respecto a 100 %
+TOLERANCIA_TOTAL = 1.0
+
+
+def sobre_linea_a(ll, ip):
+    """Punto sobre la línea A de la carta de plasticidad (IP > 0.73·(LL − 20))"""
+    return _arreglo(ip) > 0.73 * (_arreglo(ll) - 20)
+
+
+def clasificar_sucs_lote(grava, arena, finos, ll=None, ip=None, cu=None, cc=None):
+    """
+    Códigos SUCS de muchas muestras a la vez
+
+    Los argumentos son arrays (o escalares) que se difunden entre sí; None o
+    NaN indican un dato no disponible. Sin grava, arena o finos la muestra
+    queda SIN_CLASIFICAR; sin LL/IP o sin Cu/Cc se clasifica hasta donde
+    permiten los datos (M/C, GW/GP...).
+
+    Returns:
+        np.ndarray uint8 con índices de SIMBOLOS_SUCS
+    """
+    grava, arena, finos, ll, ip, cu, cc = np.broadcast_arrays(*(_arreglo(v) for v in (grava, arena, finos, ll, ip, cu, cc)))
+
+    con_limites = ~np.isnan(ll) & ~np.isnan(ip)
+    with np.errstate(invalid='ignore'):
+        sobre_a = sobre_linea_a(ll, ip)
+        arcilla = con_limites & sobre_a & (ip > 7)
+        limo_arcilla = con_limites & sobre_a & (ip >= 4) & (ip <= 7)
+
+        con_gradacion = ~np.isnan(cu) & ~np.isnan(cc)
+        curvatura = (cc >= 1) & (cc <= 3)
+        bien_grava = con_gradacion & (cu >= 4) & curvatura
+        bien_arena = con_gradacion & (cu >= 6) & curvatura
+
+        fino = finos > 50
+        es_grava = grava > arena
+        limpio = finos < 5
+        dual = ~limpio & (finos <= 12)
+        dual_completo = dual & con_gradacion & con_limites
+        # Los finos de un suelo dual son arcillosos si caen en CL, CH o CL-ML
+        dual_arcilla = arcilla | limo_arcilla
+
+    def grueso(prefijo, bien):
+        """Código de un suelo grueso (prefijo 'G' o 'S')"""
+        return seleccionar(
+            [limpio & con_gradacion & bien,
+             limpio & con_gradacion,
+             limpio,
+             dual_completo & bien & dual_arcilla,
+             dual_completo & bien,
+             dual_completo & dual_arcilla,
+             dual_completo,
+             dual,
+             arcilla,
+             limo_arcilla],
+            [CODIGO_SUCS[f'{prefijo}W'],
+             CODIGO_SUCS[f'{prefijo}P'],
+             CODIGO_SUCS[f'{prefijo}W/{prefijo}P'],
+             CODIGO_SUCS[f'{prefijo}W-{prefijo}C'],
+             CODIGO_SUCS[f'{prefijo}W-{prefijo}M'],
+             CODIGO_SUCS[f'{prefijo}P-{prefijo}C'],
+             CODIGO_SUCS[f'{prefijo}P-{prefijo}M'],
+             CODIGO_SUCS[f'{prefijo}W-{prefijo}M/{prefijo}C'],
+             CODIGO_SUCS[f'{prefijo}C'],
+             CODIGO_SUCS[f'{prefijo}C-{prefijo}M']],
+            CODIGO_SUCS[f'{prefijo}M']
+        )
+
+    codigos = seleccionar(
+        [fino & ~con_limites,
+         fino & (ll < 50) & arcilla,
+         fino & (ll < 50) & limo_arcilla,
+         fino & (ll < 50),
+         fino & sobre_a,
+         fino,
+         es_grava],
+        [CODIGO_SUCS['M/C'],
+         CODIGO_SUCS['CL'],
+         CODIGO_SUCS['ML-CL'],
+         CODIGO_SUCS['ML'],
+         CODIGO_SUCS['CH'],
+         CODIGO_SUCS['MH'],
+         grueso('G', bien_grava)],
+        grueso('S', bien_arena)
+    )
+    sin_fracciones = np.isnan(grava) | np.isnan(arena) | np.isnan(finos)
+    return np.where(sin_fracciones, SIN_CLASIFICAR, codigos).astype(np.uint8)
+
+
+def errores_totales(grava, arena, finos, tolerancia=TOLERANCIA_TOTAL):
+    """Mensaje de error por muestra si las fracciones no suman 100 % ('' si son válidas)"""
+    grava, arena, finos = np.broadcast_arrays(_arreglo(grava), _arreglo(arena), _arreglo(finos))
+    total = grava + arena + finos
+    with np.errstate(invalid='ignore'):
+        invalido = np.isnan(total) | (np.abs(total - 100) > tolerancia)
+    return np.array([f"Los porcentajes deben sumar 100% (actual: {t}%)" if malo else ''
+                     for t, malo in zip(total.tolist(), invalido)], dtype=object)
+
@@ -2,5 +2,16 @@
 from .humedad_processor import HumedadProcessor
 from .atterberg_processor import AtterbergProcessor
 from .clasificacion_processor import ClasificacionProcessor
+from .hidrometria_processor import HidrometriaProcessor
+from .granulometria_processor import GranulometriaProcessor
+from .sucs_processor import SucsProcessor
+from .aashto_processor import AashtoProcessor
+from .fases_processor import FasesProcessor
+from .grafo_muestras import GrafoMuestras
+from .incertidumbre_processor import IncertidumbreProcessor
+from .carta_plasticidad import CartaPlasticidad
 
-__all__ = ['HumedadProcessor', 'AtterbergProcessor', 'ClasificacionProcessor']
+__all__ = ['HumedadProcessor', 'AtterbergProcessor', 'ClasificacionProcessor', 'HidrometriaProcessor',
+           'GranulometriaProcessor', 'SucsProcessor',
+           'AashtoProcessor', 'FasesProcessor', 'GrafoMuestras',
+           'IncertidumbreProcessor', 'CartaPlasticidad']
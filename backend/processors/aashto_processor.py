@@ -0,0 +1,109 @@
+"""
+Procesador de clasificación AASHTO (M 145)
+
+El motor vectorizado vive en backend.nucleo.aashto; aquí se añaden la
+calificación como subrasante y el uso sugerido, y se clasifican DataFrames
+y lotes de muestras recibidos como dicts.
+"""
+
+import numpy as np
+import pandas as pd
+
+from ..nucleo.aashto import GRUPOS_AASHTO, SIN_CLASIFICAR, clasificar_aashto_lote
+
+
+# Calificación como subrasante según el índice de grupo (límite superior inclusive)
+LIMITES_CALIFICACION = np.array([0, 4, 8])
+CALIFICACIONES = np.array(['Excelente a Bueno', 'Bueno a Regular', 'Regular a Malo', 'Malo'], dtype=object)
+
+
+def uso_aashto(grupo):
+    """Uso sugerido del material según su grupo"""
+    if grupo.startswith('A-1') or grupo == 'A-3':
+        return 'Excelente para subrasante y base'
+    elif grupo.startswith('A-2'):
+        return 'Bueno para subrasante, regular para base'
+    elif grupo.startswith('A-4') or grupo.startswith('A-5'):
+        return 'Regular para subrasante'
+    else:
+        return 'No recomendado para vías, requiere estabilización'
+
+
+# Uso sugerido precalculado por código
+USOS_AASHTO = [uso_aashto(grupo) for grupo, _ in GRUPOS_AASHTO]
+
+
+def describir_aashto(codigos, ig):
+    """Convertir códigos e índices de grupo en dicts con grupo, descripción, calificación y uso"""
+    codigos = np.atleast_1d(codigos)
+    ig = np.atleast_1d(ig)
+    calificaciones = CALIFICACIONES[np.searchsorted(LIMITES_CALIFICACION, ig, side='left')]
+
+    salida = []
+    for codigo, indice, calificacion in zip(codigos.tolist(), ig.tolist(), calificaciones):
+        if codigo == SIN_CLASIFICAR:
+            salida.append(None)
+            continue
+        grupo, descripcion = GRUPOS_AASHTO[codigo]
+        salida.append({
+            'grupo': f"{grupo} ({indice})" if indice > 0 else grupo,
+            'indice_grupo': indice,
+            'descripcion': descripcion,
+            'calificacion': calificacion,
+            'uso_sugerido': USOS_AASHTO[codigo]
+        })
+    return salida
+
+
+class AashtoProcessor:
+    def clasificar_dataframe(self, df, finos='finos', ll='ll', ip='ip', p10='p10', p40='p40'):
+        """
+        Añadir a un DataFrame las columnas 'grupo_aashto' e 'indice_grupo'
+
+        Las columnas de tamices N° 10 y N° 40 son opcionales.
+        """
+        columna = lambda nombre: df[nombre].to_numpy(dtype=np.float64) if nombre in df.columns else None
+        codigos, ig = clasificar_aashto_lote(columna(finos), columna(ll), columna(ip), columna(p10), columna(p40))
+
+        grupos = np.array([g for g, _ in GRUPOS_AASHTO] + [None], dtype=object)
+        resultado = df.copy()
+        resultado['grupo_aashto'] = grupos[np.where(codigos == SIN_CLASIFICAR, len(GRUPOS_AASHTO), codigos)]
+        resultado['indice_grupo'] = pd.array(np.where(codigos == SIN_CLASIFICAR, None, ig), dtype='Int64')
+        return resultado
+
+    def clasificar_lote(self, muestras):
+        """
+        Clasificar según AASHTO una lista de muestras
+
+        Args:
+            muestras: Lista de dict con 'finos', 'll', 'ip' y opcionalmente
+                      'id', 'p10' y 'p40'
+
+        Returns:
+            list: Un dict por muestra con 'id', la clasificación y 'error'
+            (un valor no numérico se trata como dato faltante y se indica en
+            el 'error' de su muestra)
+        """
+        if not muestras:
+            raise ValueError("Se requiere al menos una muestra")
+
+        columnas = {campo: np.full(len(muestras), np.nan) for campo in ('finos', 'll', 'ip', 'p10', 'p40')}
+        invalidos = [None] * len(muestras)
+        for i, muestra in enumerate(muestras):
+            for campo, columna in columnas.items():
+                valor = muestra.get(campo)
+                if valor is None:
+                    continue
+                try:
+                    columna[i] = float(valor)
+                except (TypeError, ValueError):
+                    invalidos[i] = f"Valor no numérico en '{campo}': {valor}"
+        codigos, ig = clasificar_aashto_lote(**columnas)
+
+        resultados = []
+        for i, (muestra, descripcion) in enumerate(zip(muestras, describir_aashto(codigos, ig))):
+            resultado = {'id': muestra.get('id', i + 1),
+                         'error': invalidos[i] or (None if descripcion else "Se requieren finos, LL e IP")}
+            resultado.update(descripcion or {})
+            resultados.append(resultado)
+        return resultados
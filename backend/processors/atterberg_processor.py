@@ -5,8 +5,22 @@ Procesador de cálculos de Límites de Atterberg
 import numpy as np
 from scipy.interpolate import interp1d
 
+from .cache import memorizar
+from ..nucleo import (GOLPES_REFERENCIA, MENSAJES_ERROR_FLUIDEZ, SIN_ERROR, ajustar_fluidez,
+                      limite_plastico, indice_plasticidad, clase_plasticidad)
+
+
+# Clase de plasticidad -> (clasificación, descripción)
+CLASES_PLASTICIDAD = [
+    ('No Plástico', 'Sin plasticidad'),
+    ('Baja Plasticidad', 'Plasticidad baja'),
+    ('Media Plasticidad', 'Plasticidad media'),
+    ('Alta Plasticidad', 'Plasticidad alta')
+]
+
 
 class AtterbergProcessor:
+    @memorizar
     def calcular_limite_liquido(self, datos):
         """
         Calcular límite líquido según ASTM D4318
@@ -16,6 +30,10 @@ class AtterbergProcessor:
             
         Returns:
             float: Límite líquido interpolado a 25 golpes
+        
+        Interpola entre los puntos vecinos (el resultado que siempre dio
+        /api/atterberg/calcular); la recta de mínimos cuadrados sobre todos
+        los puntos está en calcular_limite_liquido_lote.
         """
         if not datos or len(datos) < 2:
             raise ValueError("Se requieren al menos 2 puntos de datos")
@@ -29,7 +47,7 @@ class AtterbergProcessor:
         
         # Interpolación logarítmica
         log_golpes = np.log10(golpes)
-        log_25 = np.log10(25)
+        log_25 = np.log10(GOLPES_REFERENCIA)
         
         # Crear función de interpolación
         f = interp1d(log_golpes, humedades, kind='linear', fill_value='extrapolate')
@@ -37,6 +55,87 @@ class AtterbergProcessor:
         
         return round(limite_liquido, 2)
     
+    def calcular_limite_liquido_lote(self, muestras, puntos_curva=0):
+        """
+        Ajustar la curva de fluidez de muchas muestras a la vez
+        
+        Recta de mínimos cuadrados w = a + b·log10(N) en forma cerrada, con
+        las sumas calculadas sobre matrices (muestras x puntos) rellenadas
+        con NaN (nucleo.ajustar_fluidez); no se construye ningún objeto de
+        SciPy por muestra.
+        
+        Args:
+            muestras: Lista de dict con 'puntos' (lista de dict con 'golpes' y
+                      'humedad') y opcionalmente 'id'
+            puntos_curva: Puntos de la curva ajustada a devolver por muestra
+                          (0 = sin curva)
+            
+        Returns:
+            list: Un dict por muestra con limite_liquido, indice_fluidez,
+                  pendiente, intercepto, r2, residuos y 'error' (None si el
+                  ajuste fue posible)
+        """
+        if not muestras:
+            raise ValueError("Se requiere al menos una muestra")
+        
+        n_max = max(len(m.get('puntos') or []) for m in muestras)
+        golpes = np.full((len(muestras), max(n_max, 1)), np.nan)
+        humedad = np.full_like(golpes, np.nan)
+        for i, muestra in enumerate(muestras):
+            for j, punto in enumerate(muestra.get('puntos') or []):
+                golpes[i, j] = self._numero(punto.get('golpes'))
+                humedad[i, j] = self._numero(punto.get('humedad'))
+        
+        ajuste = ajustar_fluidez(golpes, humedad)
+        validos, residuos = ajuste['validos'], ajuste['residuos']
+        pendiente, intercepto = ajuste['pendiente'], ajuste['intercepto']
+        ajustable = ajuste['error'] == SIN_ERROR
+        error = np.array(MENSAJES_ERROR_FLUIDEZ + [None], dtype=object)[ajuste['error']]
+        
+        resultados = []
+        for i, muestra in enumerate(muestras):
+            resultado = {'id': muestra.get('id', i + 1), 'error': error[i]}
+            if ajustable[i]:
+                resultado.update({
+                    'limite_liquido': round(float(ajuste['limite_liquido'][i]), 2),
+                    # Índice de flujo: pérdida de humedad por ciclo logarítmico de golpes
+                    'indice_fluidez': round(float(-pendiente[i]), 2),
+                    'pendiente': round(float(pendiente[i]), 4),
+                    'intercepto': round(float(intercepto[i]), 4),
+                    'r2': round(float(ajuste['r2'][i]), 4),
+                    'residuos': np.round(residuos[i, validos[i]], 4).tolist(),
+                    'extrapolado': bool(ajuste['extrapolado'][i])
+                })
+            resultados.append(resultado)
+        
+        if puntos_curva:
+            self._agregar_curvas(resultados, golpes, validos, intercepto, pendiente, ajustable, puntos_curva)
+        return resultados
+    
+    @staticmethod
+    def _agregar_curvas(resultados, golpes, validos, intercepto, pendiente, ajustable, puntos):
+        """Evaluar las rectas ajustadas entre el mínimo y el máximo de golpes de cada muestra"""
+        log_min = np.log10(np.where(validos, golpes, np.inf).min(axis=1, initial=np.inf))
+        log_max = np.log10(np.where(validos, golpes, 1).max(axis=1, initial=1))
+        with np.errstate(invalid='ignore'):
+            log_golpes = log_min[:, None] + np.linspace(0, 1, puntos)[None, :] * (log_max - log_min)[:, None]
+        humedades = intercepto[:, None] + pendiente[:, None] * log_golpes
+        
+        for i in np.flatnonzero(ajustable):
+            resultados[i]['curva'] = {
+                'golpes': (10 ** log_golpes[i]).tolist(),
+                'humedades': humedades[i].tolist()
+            }
+    
+    @staticmethod
+    def _numero(valor):
+        """float o NaN si el valor no es numérico"""
+        try:
+            return float(valor)
+        except (TypeError, ValueError):
+            return np.nan
+    
+    @memorizar
     def calcular_limite_plastico(self, datos):
         """
         Calcular límite plástico (promedio de determinaciones)
@@ -51,10 +150,10 @@ class AtterbergProcessor:
             raise ValueError("Se requiere al menos un valor")
         
         humedades = [d if isinstance(d, (int, float)) else d['humedad'] for d in datos]
-        limite_plastico = np.mean(humedades)
         
-        return round(limite_plastico, 2)
+        return float(round(limite_plastico([humedades])[0], 2))
     
+    @memorizar
     def calcular_indice_plasticidad(self, limite_liquido, limite_plastico):
         """
         Calcular índice de plasticidad
@@ -73,21 +172,8 @@ class AtterbergProcessor:
                 'descripcion': 'El suelo no presenta plasticidad'
             }
         
-        ip = limite_liquido - limite_plastico
-        
-        # Clasificación según IP
-        if ip == 0:
-            clasificacion = 'No Plástico'
-            descripcion = 'Sin plasticidad'
-        elif ip < 7:
-            clasificacion = 'Baja Plasticidad'
-            descripcion = 'Plasticidad baja'
-        elif ip < 17:
-            clasificacion = 'Media Plasticidad'
-            descripcion = 'Plasticidad media'
-        else:
-            clasificacion = 'Alta Plasticidad'
-            descripcion = 'Plasticidad alta'
+        ip = float(indice_plasticidad(limite_liquido, limite_plastico))
+        clasificacion, descripcion = CLASES_PLASTICIDAD[clase_plasticidad(ip)]
         
         return {
             'ip': round(ip, 2),
@@ -118,7 +204,7 @@ class AtterbergProcessor:
         humedades_curva = f(log_golpes_curva)
         
         # Calcular LL
-        limite_liquido = float(f(np.log10(25)))
+        limite_liquido = float(f(np.log10(GOLPES_REFERENCIA)))
         
         return {
             'curva': {
@@ -0,0 +1,164 @@
+"""
+Caché compartida de resultados de los procesadores
+
+Memoriza las llamadas de cálculo puro (humedad, límites, clasificación) con
+una clave construida a partir de sus argumentos normalizados. Tiene un
+tamaño máximo con expulsión LRU y, opcionalmente, caducidad (TTL). Los
+contadores de aciertos, fallos y expulsiones se exponen en
+/api/cache/estadisticas para ajustar el tamaño con tráfico real.
+"""
+
+import copy
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+# Valores por defecto (configurables con HSGVA_CACHE_TAMANO y HSGVA_CACHE_TTL)
+TAMANO_CACHE = 2048
+TTL_CACHE = None
+
+
+def normalizar(valor):
+    """
+    Convertir argumentos en una clave hashable y estable
+
+    Los dict se ordenan por clave, las listas pasan a tuplas y los escalares
+    NumPy a tipos de Python (25 y 25.0 dan la misma clave).
+
+    Raises:
+        TypeError: Si el valor no se puede usar como clave
+    """
+    if isinstance(valor, dict):
+        return tuple(sorted((str(k), normalizar(v)) for k, v in valor.items()))
+    if isinstance(valor, (list, tuple)):
+        return tuple(normalizar(v) for v in valor)
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, float) and valor == 0:
+        return 0.0
+    if valor is None or isinstance(valor, (str, int, float)):
+        return valor
+    raise TypeError(f"Argumento no memorizable: {type(valor).__name__}")
+
+
+class CacheResultados:
+    """LRU con TTL opcional y contadores por función"""
+
+    def __init__(self, tamano=TAMANO_CACHE, ttl=TTL_CACHE, reloj=time.monotonic):
+        self.tamano = tamano
+        self.ttl = ttl
+        self._reloj = reloj
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        self._contadores = {}
+
+    def _contar(self, espacio, evento):
+        contadores = self._contadores.setdefault(
+            espacio, {'aciertos': 0, 'fallos': 0, 'expulsiones': 0, 'caducadas': 0}
+        )
+        contadores[evento] += 1
+
+    def obtener(self, espacio, clave, constructor):
+        """
+        Devolver el resultado memorizado o calcularlo con constructor()
+
+        Los errores no se memorizan. Se devuelve siempre una copia para que
+        quien la modifique no altere la entrada guardada.
+        """
+        clave = (espacio, clave)
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                valor, caduca = entrada
+                if caduca is None or caduca > self._reloj():
+                    self._entradas.move_to_end(clave)
+                    self._contar(espacio, 'aciertos')
+                    return copy.deepcopy(valor)
+                del self._entradas[clave]
+                self._contar(espacio, 'caducadas')
+            self._contar(espacio, 'fallos')
+
+        valor = constructor()
+
+        with self._lock:
+            caduca = self._reloj() + self.ttl if self.ttl else None
+            self._entradas[clave] = (copy.deepcopy(valor), caduca)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.tamano:
+                (espacio_expulsado, _), _ = self._entradas.popitem(last=False)
+                self._contar(espacio_expulsado, 'expulsiones')
+        return valor
+
+    def invalidar(self, espacio=None):
+        """Descartar las entradas de una función (o todas)"""
+        with self._lock:
+            if espacio is None:
+                self._entradas.clear()
+            else:
+                for clave in [c for c in self._entradas if c[0] == espacio]:
+                    del self._entradas[clave]
+
+    def reiniciar_contadores(self):
+        with self._lock:
+            self._contadores.clear()
+
+    def estadisticas(self):
+        """Contadores totales y por función, con la tasa de aciertos"""
+        def con_tasa(contadores):
+            consultas = contadores['aciertos'] + contadores['fallos']
+            return dict(contadores, tasa_aciertos=round(contadores['aciertos'] / consultas, 4) if consultas else None)
+
+        with self._lock:
+            por_funcion = {espacio: dict(c) for espacio, c in self._contadores.items()}
+            entradas = len(self._entradas)
+
+        totales = {'aciertos': 0, 'fallos': 0, 'expulsiones': 0, 'caducadas': 0}
+        for contadores in por_funcion.values():
+            for evento, n in contadores.items():
+                totales[evento] += n
+
+        return dict(
+            con_tasa(totales),
+            entradas=entradas,
+            tamano=self.tamano,
+            ttl=self.ttl,
+            por_funcion={espacio: con_tasa(c) for espacio, c in sorted(por_funcion.items())}
+        )
+
+
+def _desde_entorno():
+    tamano = int(os.environ.get('HSGVA_CACHE_TAMANO', TAMANO_CACHE))
+    ttl = float(os.environ.get('HSGVA_CACHE_TTL', 0)) or TTL_CACHE
+    return CacheResultados(tamano, ttl)
+
+
+# Instancia compartida por todos los procesadores
+resultados = _desde_entorno()
+
+
+def memorizar(funcion):
+    """
+    Decorador para métodos de cálculo puro de los procesadores
+
+    La clave es el nombre calificado del método más sus argumentos
+    normalizados (sin self). Con argumentos no memorizables, o con la caché
+    de tamaño 0, se llama directamente al método.
+    """
+    espacio = funcion.__qualname__
+
+    @functools.wraps(funcion)
+    def envoltura(self, *args, **kwargs):
+        if resultados.tamano <= 0:
+            return funcion(self, *args, **kwargs)
+        try:
+            clave = (normalizar(args), normalizar(kwargs))
+        except TypeError:
+            return funcion(self, *args, **kwargs)
+        return resultados.obtener(espacio, clave, lambda: funcion(self, *args, **kwargs))
+
+    return envoltura
@@ -0,0 +1,175 @@
+"""
+Carta de plasticidad de Casagrande
+
+La geometría de la carta (líneas A y U, LL = 50 y la franja CL-ML) se
+construye una sola vez por rango y resolución. La clasificación de puntos
+(LL, IP) en CL / ML / CH / MH / CL-ML es un único paso vectorizado con los
+mismos criterios que el motor SUCS para suelos finos; los puntos por encima
+de la línea U, que no corresponden a ningún suelo real, se marcan como
+sospechosos (suelen ser errores de digitación o de ensayo).
+"""
+
+import functools
+
+import numpy as np
+
+from ..nucleo import seleccionar, sobre_linea_a
+
+
+# Línea A: IP = 0.73·(LL − 20); línea U: IP = 0.9·(LL − 8)
+PENDIENTE_A, ORIGEN_A = 0.73, 20.0
+PENDIENTE_U, ORIGEN_U = 0.9, 8.0
+
+# LL que separa baja y alta plasticidad
+LL_ALTA_PLASTICIDAD = 50.0
+
+# Franja CL-ML sobre la línea A (IP entre 4 y 7)
+IP_CL_ML = (4.0, 7.0)
+
+# Rango del eje LL y número de puntos de las líneas
+LL_MAXIMO = 100.0
+PUNTOS_LINEAS = 100
+
+# Código -> (símbolo, descripción)
+CLASES_CARTA = [
+    ('CL', 'Arcillas de baja plasticidad'),
+    ('ML', 'Limos de baja plasticidad'),
+    ('CH', 'Arcillas de alta plasticidad'),
+    ('MH', 'Limos de alta plasticidad'),
+    ('CL-ML', 'Arcillas limosas de baja plasticidad'),
+]
+CODIGO_CARTA = {simbolo: codigo for codigo, (simbolo, _) in enumerate(CLASES_CARTA)}
+
+# Código de los puntos sin LL o IP válidos
+SIN_CLASIFICAR = 255
+
+
+def _arreglo(valores):
+    """float64 con NaN en lugar de None"""
+    return np.array(valores, dtype=np.float64)
+
+
+def linea_a(ll):
+    return np.maximum(PENDIENTE_A * (_arreglo(ll) - ORIGEN_A), 0)
+
+
+def linea_u(ll):
+    return np.maximum(PENDIENTE_U * (_arreglo(ll) - ORIGEN_U), 0)
+
+
+def sobre_linea_u(ll, ip):
+    """Punto por encima de la línea U (límite superior de los suelos reales)"""
+    return _arreglo(ip) > PENDIENTE_U * (_arreglo(ll) - ORIGEN_U)
+
+
+@functools.lru_cache(maxsize=8)
+def _geometria(ll_maximo, puntos):
+    ll = np.linspace(0, ll_maximo, puntos)
+    # La franja CL-ML va de la línea U a la línea A entre IP = 4 y 7
+    ll_franja = np.array(IP_CL_ML) / PENDIENTE_A + ORIGEN_A
+    ll_franja_u = np.array(IP_CL_ML) / PENDIENTE_U + ORIGEN_U
+    return {
+        'linea_a': {'ll': ll.tolist(), 'ip': linea_a(ll).tolist()},
+        'linea_u': {'ll': ll.tolist(), 'ip': linea_u(ll).tolist()},
+        'linea_ll_50': {'ll': [LL_ALTA_PLASTICIDAD] * 2,
+                        'ip': [0.0, round(float(linea_u(LL_ALTA_PLASTICIDAD)), 4)]},
+        'zona_cl_ml': {
+            'll': np.round([ll_franja_u[0], ll_franja[0], ll_franja[1], ll_franja_u[1]], 4).tolist(),
+            'ip': [IP_CL_ML[0], IP_CL_ML[0], IP_CL_ML[1], IP_CL_ML[1]]
+        },
+        'regiones': {
+            'CL': {'ll_min': 0, 'll_max': LL_ALTA_PLASTICIDAD, 'descripcion': 'Arcillas de baja plasticidad'},
+            'ML': {'ll_min': 0, 'll_max': LL_ALTA_PLASTICIDAD, 'descripcion': 'Limos de baja plasticidad'},
+            'CH': {'ll_min': LL_ALTA_PLASTICIDAD, 'll_max': ll_maximo, 'descripcion': 'Arcillas de alta plasticidad'},
+            'MH': {'ll_min': LL_ALTA_PLASTICIDAD, 'll_max': ll_maximo, 'descripcion': 'Limos de alta plasticidad'},
+            'CL-ML': {'ll_min': float(round(ll_franja_u[0], 4)), 'll_max': float(round(ll_franja[1], 4)),
+                      'ip_min': IP_CL_ML[0], 'ip_max': IP_CL_ML[1],
+                      'descripcion': 'Arcillas limosas de baja plasticidad'}
+        }
+    }
+
+
+def _copiar(valor):
+    """Copia de dicts y listas de números (más barata que copy.deepcopy)"""
+    if isinstance(valor, dict):
+        return {clave: _copiar(v) for clave, v in valor.items()}
+    return list(valor) if isinstance(valor, list) else valor
+
+
+def geometria_carta(ll_maximo=LL_MAXIMO, puntos=PUNTOS_LINEAS):
+    """
+    Líneas y regiones de la carta, listas para dibujar
+
+    Se calculan una vez por (ll_maximo, puntos) y se devuelve una copia para
+    que quien la modifique no altere la memorizada.
+    """
+    return _copiar(_geometria(float(ll_maximo), int(puntos)))
+
+
+def clasificar_carta(ll, ip):
+    """
+    Clase de la carta y marca de línea U de muchos puntos a la vez
+
+    Returns:
+        tuple (códigos uint8 de CLASES_CARTA, bool por encima de la línea U)
+    """
+    ll, ip = np.broadcast_arrays(_arreglo(ll), _arreglo(ip))
+    with np.errstate(invalid='ignore'):
+        sobre_a = sobre_linea_a(ll, ip)
+        baja = ll < LL_ALTA_PLASTICIDAD
+        codigos = seleccionar(
+            [np.isnan(ll) | np.isnan(ip) | (ll < 0) | (ip < 0),
+             baja & sobre_a & (ip > IP_CL_ML[1]),
+             baja & sobre_a & (ip >= IP_CL_ML[0]),
+             baja,
+             sobre_a],
+            [SIN_CLASIFICAR, CODIGO_CARTA['CL'], CODIGO_CARTA['CL-ML'], CODIGO_CARTA['ML'], CODIGO_CARTA['CH']],
+            CODIGO_CARTA['MH']
+        ).astype(np.uint8)
+        sospechoso = sobre_linea_u(ll, ip) & (codigos != SIN_CLASIFICAR)
+    return codigos, sospechoso
+
+
+class CartaPlasticidad:
+    def __init__(self, ll_maximo=LL_MAXIMO, puntos=PUNTOS_LINEAS):
+        self.ll_maximo = ll_maximo
+        self.puntos = puntos
+
+    def geometria(self):
+        return geometria_carta(self.ll_maximo, self.puntos)
+
+    def clasificar(self, ll, ip, ids=None):
+        """
+        Clasificar los puntos (LL, IP) de un proyecto
+
+        Args:
+            ll, ip: Listas (o arrays) de la misma longitud; None = sin dato
+            ids: Identificador de cada punto (opcional)
+
+        Returns:
+            dict en columnas (una lista por campo, en el orden de los puntos)
+            con 'clase', 'sobre_linea_u' y, si se dan, 'id'; más los conteos
+            por clase y el número de puntos sin clasificar y sospechosos
+        """
+        ll, ip = _arreglo(ll).ravel(), _arreglo(ip).ravel()
+        if len(ll) != len(ip):
+            raise ValueError("LL e IP deben tener la misma cantidad de puntos")
+        if ids is not None and len(ids) != len(ll):
+            raise ValueError("Debe haber un id por punto")
+
+        codigos, sospechoso = clasificar_carta(ll, ip)
+        simbolos = np.array([s for s, _ in CLASES_CARTA] + [None], dtype=object)
+        conteos = np.bincount(np.minimum(codigos, len(CLASES_CARTA)), minlength=len(CLASES_CARTA) + 1)
+
+        resultado = {
+            'll': np.where(np.isnan(ll), None, ll).tolist(),
+            'ip': np.where(np.isnan(ip), None, ip).tolist(),
+            'clase': simbolos[np.minimum(codigos, len(CLASES_CARTA))].tolist(),
+            'sobre_linea_u': sospechoso.tolist(),
+            'conteos': {s: int(n) for (s, _), n in zip(CLASES_CARTA, conteos)},
+            'sin_clasificar': int(conteos[-1]),
+            'sospechosos': int(sospechoso.sum())
+        }
+        if ids is not None:
+            resultado = dict(id=list(ids), **resultado)
+        return resultado
@@ -0,0 +1,76 @@
+"""
+Procesador de relaciones de fases del suelo
+
+El motor vectorizado vive en backend.nucleo.fases; aquí se aceptan los
+nombres alternativos que envía el frontend y se resuelven probetas sueltas
+o lotes.
+"""
+
+import numpy as np
+import pandas as pd
+
+from ..nucleo.fases import DENSIDAD_AGUA, PORCENTUALES, MAGNITUDES, resolver_fases, errores_fases
+
+
+# Nombres alternativos (abreviaturas y los que envía js/modules/fases.js)
+ALIAS_MAGNITUDES = {
+    'gs': 'gravedad_especifica', 'gravedadEspecifica': 'gravedad_especifica',
+    'e': 'relacion_vacios', 'n': 'porosidad', 's': 'saturacion', 'w': 'humedad',
+    'gamma': 'densidad', 'gamma_d': 'densidad_seca', 'gamma_sat': 'densidad_saturada',
+    'pesoTotal': 'peso_total', 'pesoSolidos': 'peso_solidos', 'pesoAgua': 'peso_agua',
+    'volumenTotal': 'volumen_total', 'volumenSolidos': 'volumen_solidos',
+    'volumenVacios': 'volumen_vacios', 'volumenAgua': 'volumen_agua', 'volumenAire': 'volumen_aire'
+}
+
+
+class FasesProcessor:
+    def __init__(self, densidad_agua=DENSIDAD_AGUA):
+        self.densidad_agua = densidad_agua
+
+    def calcular(self, datos):
+        """
+        Resolver las fases de una probeta
+
+        Raises:
+            ValueError: Si los datos no bastan o son incoherentes
+        """
+        resultado = self.calcular_lote([datos])[0]
+        if resultado['error']:
+            raise ValueError(resultado['error'])
+        return resultado
+
+    def calcular_lote(self, muestras):
+        """
+        Resolver las fases de muchas probetas, cada una con sus propios datos
+
+        Args:
+            muestras: Lista de dict (o DataFrame) con cualquier subconjunto
+                      suficiente de MAGNITUDES (humedad, porosidad y
+                      saturación en %) y opcionalmente 'id'
+
+        Returns:
+            list: Un dict por probeta con todas las magnitudes y 'error'
+        """
+        tabla = pd.DataFrame(muestras).rename(columns=ALIAS_MAGNITUDES)
+        if tabla.empty:
+            raise ValueError("Se requiere al menos una probeta")
+
+        conocidas = {}
+        for magnitud in MAGNITUDES:
+            if magnitud in tabla.columns:
+                valores = pd.to_numeric(tabla[magnitud], errors='coerce').to_numpy(dtype=np.float64)
+                conocidas[magnitud] = valores / 100 if magnitud in PORCENTUALES else valores
+        if not conocidas:
+            raise ValueError(f"No se reconoció ninguna magnitud; use {', '.join(MAGNITUDES)}")
+
+        valores = resolver_fases(conocidas, self.densidad_agua)
+        errores = errores_fases(valores, self.densidad_agua)
+
+        salida = pd.DataFrame({
+            magnitud: np.round(valores[magnitud] * 100, 2) if magnitud in PORCENTUALES
+            else np.round(valores[magnitud], 4)
+            for magnitud in MAGNITUDES
+        })
+        salida.insert(0, 'id', tabla['id'].tolist() if 'id' in tabla.columns else range(1, len(tabla) + 1))
+        salida['error'] = np.where(errores == '', None, errores)
+        return salida.astype(object).where(salida.notna(), None).to_dict('records')
@@ -0,0 +1,207 @@
+"""
+Grafo incremental de cálculo por muestra
+
+Cada valor derivado de una muestra (w% de cada ensayo, LL, LP, IP, Cu/Cc,
+SUCS, AASHTO, IG) es un nodo memorizado que conoce sus entradas. Al editar
+un dato solo se recalculan los nodos aguas abajo de esa muestra, en orden
+topológico, y la propagación se corta en cuanto un nodo recalculado da el
+mismo valor que antes (p. ej. un cambio de peso que no altera el IP no
+vuelve a clasificar).
+"""
+
+import math
+
+import numpy as np
+
+from ..nucleo import (SIN_ERROR, MENSAJES_ERROR_FLUIDEZ, contenido_humedad, ajustar_fluidez,
+                      limite_plastico, indice_plasticidad)
+from ..nucleo.sucs import SIMBOLOS_SUCS, SIN_CLASIFICAR as SUCS_SIN_CLASIFICAR, clasificar_sucs_lote
+from ..nucleo.aashto import GRUPOS_AASHTO, SIN_CLASIFICAR as AASHTO_SIN_CLASIFICAR, clasificar_aashto_lote
+from .granulometria_processor import GranulometriaProcessor
+
+
+# Datos que se pueden editar en cada muestra
+ENTRADAS = ('ensayos_ll', 'ensayos_lp', 'tamices', 'hidrometria', 'grava', 'arena', 'finos', 'p10', 'p40')
+
+
+def _humedades(ensayos):
+    """w% de cada ensayo (misma fórmula que AtterbergETL); None si no hay suelo seco"""
+    if not ensayos:
+        return []
+    pesos = [[float(e.get(c) or 0) for e in ensayos] for c in ('recipiente', 'recipiente_suelo_h', 'recipiente_suelo_s')]
+    humedades = np.round(contenido_humedad(*pesos)[0], 2)
+    return [None if np.isnan(w) else float(w) for w in humedades]
+
+
+def _limite_liquido(ensayos, humedades):
+    """LL por la recta de fluidez de los ensayos con humedad"""
+    puntos = [(e.get('n_golpes', e.get('golpes')), w) for e, w in zip(ensayos or [], humedades) if w is not None]
+    if not puntos:
+        return None
+    golpes, w = zip(*puntos)
+    ajuste = ajustar_fluidez([golpes], [w])
+    if ajuste['error'][0] != SIN_ERROR:
+        raise ValueError(MENSAJES_ERROR_FLUIDEZ[ajuste['error'][0]])
+    return round(float(ajuste['limite_liquido'][0]), 2)
+
+
+def _limite_plastico(humedades):
+    lp = limite_plastico([humedades])[0] if humedades else np.nan
+    return None if np.isnan(lp) else float(round(lp, 2))
+
+
+def _indice_plasticidad(ll, lp):
+    if ll is None or lp is None:
+        return None
+    return round(float(indice_plasticidad(ll, lp)), 2)
+
+
+def _gradacion(tamices, hidrometria):
+    return GranulometriaProcessor().calcular(tamices, hidrometria) if tamices else None
+
+
+def _fracciones(gradacion, grava, arena, finos):
+    """(grava, arena, finos): los valores dados explícitamente prevalecen sobre la curva"""
+    desde_curva = gradacion or {}
+    fracciones = tuple(v if v is not None else desde_curva.get(c)
+                       for c, v in (('grava', grava), ('arena', arena), ('finos', finos)))
+    return None if None in fracciones else fracciones
+
+
+def _sucs(fracciones, ll, ip, cu, cc):
+    if fracciones is None:
+        return None
+    codigo = int(clasificar_sucs_lote(*fracciones, ll, ip, cu, cc))
+    return None if codigo == SUCS_SIN_CLASIFICAR else SIMBOLOS_SUCS[codigo][0]
+
+
+def _clasificacion_aashto(fracciones, ll, ip, p10, p40):
+    if fracciones is None:
+        return None
+    codigo, ig = (int(v) for v in clasificar_aashto_lote(fracciones[2], ll, ip, p10, p40))
+    return None if codigo == AASHTO_SIN_CLASIFICAR else (GRUPOS_AASHTO[codigo][0], ig)
+
+
+# Reglas (nodo, entradas, función) en orden topológico
+REGLAS_MUESTRA = [
+    ('w_ll', ('ensayos_ll',), _humedades),
+    ('w_lp', ('ensayos_lp',), _humedades),
+    ('ll', ('ensayos_ll', 'w_ll'), _limite_liquido),
+    ('lp', ('w_lp',), _limite_plastico),
+    ('ip', ('ll', 'lp'), _indice_plasticidad),
+    ('gradacion', ('tamices', 'hidrometria'), _gradacion),
+    ('cu', ('gradacion',), lambda g: g and g['cu']),
+    ('cc', ('gradacion',), lambda g: g and g['cc']),
+    ('fracciones', ('gradacion', 'grava', 'arena', 'finos'), _fracciones),
+    ('sucs', ('fracciones', 'll', 'ip', 'cu', 'cc'), _sucs),
+    ('clasificacion_aashto', ('fracciones', 'll', 'ip', 'p10', 'p40'), _clasificacion_aashto),
+    ('aashto', ('clasificacion_aashto',), lambda c: c and c[0]),
+    ('ig', ('clasificacion_aashto',), lambda c: c and c[1]),
+]
+
+
+def _iguales(a, b):
+    """Comparación para cortar la propagación (NaN igual a NaN)"""
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        return a is b
+
+
+class GrafoMuestras:
+    """Valores derivados memorizados por muestra con recálculo aguas abajo"""
+
+    def __init__(self, reglas=REGLAS_MUESTRA, entradas=ENTRADAS):
+        self.reglas = reglas
+        self.entradas = tuple(entradas)
+        nodos = set(self.entradas)
+        for nombre, dependencias, _ in reglas:
+            faltan = [d for d in dependencias if d not in nodos]
+            if faltan:
+                raise ValueError(f"El nodo '{nombre}' depende de {faltan}, no definidos antes")
+            nodos.add(nombre)
+        self._muestras = {}
+        self.recalculos = 0
+
+    def __len__(self):
+        return len(self._muestras)
+
+    def __contains__(self, muestra):
+        return muestra in self._muestras
+
+    def cargar(self, muestra, **entradas):
+        """Registrar (o reemplazar) una muestra y calcular todos sus nodos"""
+        self._muestras[muestra] = {'valores': {e: None for e in self.entradas}, 'errores': {}}
+        return self.editar(muestra, _todo=True, **entradas)
+
+    def editar(self, muestra, _todo=False, **cambios):
+        """
+        Cambiar datos de una muestra y recalcular solo lo que depende de ellos
+
+        Returns:
+            dict {nodo: nuevo valor} de los nodos derivados que cambiaron
+        """
+        if muestra not in self._muestras:
+            raise KeyError(f"Muestra no registrada: {muestra}")
+        desconocidas = set(cambios) - set(self.entradas)
+        if desconocidas:
+            raise ValueError(f"Datos no editables: {', '.join(sorted(desconocidas))}")
+
+        estado = self._muestras[muestra]
+        valores, errores = estado['valores'], estado['errores']
+        cambiados = set()
+        for nombre, valor in cambios.items():
+            if not _iguales(valores.get(nombre), valor):
+                valores[nombre] = valor
+                cambiados.add(nombre)
+
+        actualizados = {}
+        for nombre, dependencias, funcion in self.reglas:
+            if not _todo and cambiados.isdisjoint(dependencias):
+                continue
+            self.recalculos += 1
+            try:
+                nuevo = funcion(*(valores[d] for d in dependencias))
+                errores.pop(nombre, None)
+            except ValueError as e:
+                nuevo = None
+                errores[nombre] = str(e)
+
+            if _todo or not _iguales(valores.get(nombre), nuevo):
+                valores[nombre] = nuevo
+                cambiados.add(nombre)
+                actualizados[nombre] = nuevo
+        return actualizados
+
+    def editar_ensayo(self, muestra, ensayo, indice, **campos):
+        """
+        Cambiar campos (p. ej. recipiente_suelo_s) de un ensayo de LL ('ll') o LP ('lp')
+        """
+        clave = f'ensayos_{ensayo}'
+        ensayos = list(self.valor(muestra, clave) or [])
+        ensayos[indice] = dict(ensayos[indice], **campos)
+        return self.editar(muestra, **{clave: ensayos})
+
+    def valor(self, muestra, nodo):
+        return self._muestras[muestra]['valores'][nodo]
+
+    def valores(self, muestra):
+        """Todos los nodos de una muestra"""
+        return dict(self._muestras[muestra]['valores'])
+
+    def errores(self, muestra):
+        """Errores por nodo de una muestra ({} si no hay)"""
+        return dict(self._muestras[muestra]['errores'])
+
+    def eliminar(self, muestra):
+        self._muestras.pop(muestra, None)
+
+    @staticmethod
+    def entradas_atterberg(datos):
+        """Entradas de una muestra a partir de AtterbergETL.load_data()"""
+        return {
+            'ensayos_ll': list(datos.get('limite_liquido') or []),
+            'ensayos_lp': list(datos.get('limite_plastico') or [])
+        }
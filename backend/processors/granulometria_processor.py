@@ -0,0 +1,227 @@
+"""
+Procesador de la curva granulométrica completa (tamizado + hidrometría)
+
+Une las aberturas de tamiz y los diámetros de hidrometría en una sola curva
+monótona por muestra y obtiene D10, D30, D60, Cu y Cc por interpolación
+log-lineal vectorizada sobre todas las muestras a la vez.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+# Aberturas (mm) que separan grava / arena / finos en SUCS
+ABERTURA_N4 = 4.75
+ABERTURA_N200 = 0.075
+
+# Tamiz sobre cuyo pasante se ensaya la hidrometría (N° 10)
+ABERTURA_HIDROMETRO = 2.0
+
+# Porcentajes de los diámetros característicos
+OBJETIVOS_D = (10, 30, 60)
+
+
+def diametros_caracteristicos(diametros, pasa, objetivos=OBJETIVOS_D):
+    """
+    Diámetros a los que la curva alcanza cada porcentaje (interpolación en log D)
+
+    Args:
+        diametros: Matriz (muestras x puntos) de diámetros ascendentes, NaN de relleno al final
+        pasa: Matriz del mismo tamaño con % que pasa (no decreciente)
+        objetivos: Porcentajes buscados
+
+    Returns:
+        np.ndarray (muestras x objetivos); NaN si la curva no llega al porcentaje
+    """
+    diametros = np.atleast_2d(np.asarray(diametros, dtype=np.float64))
+    pasa = np.atleast_2d(np.asarray(pasa, dtype=np.float64))
+    log_d = np.log10(diametros)
+    validos = (~np.isnan(pasa)).sum(axis=1)
+    filas = np.arange(len(pasa))
+
+    resultado = np.full((len(pasa), len(objetivos)), np.nan)
+    for j, objetivo in enumerate(objetivos):
+        # Puntos por debajo del objetivo: el cruce está entre k-1 y k
+        k = (pasa < objetivo).sum(axis=1)
+        interior = (k >= 1) & (k < validos)
+        k_sup = np.where(interior, k, 1)
+        p0, p1 = pasa[filas, k_sup - 1], pasa[filas, k_sup]
+        d0, d1 = log_d[filas, k_sup - 1], log_d[filas, k_sup]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            interpolado = 10 ** (d0 + (objetivo - p0) / (p1 - p0) * (d1 - d0))
+
+        resultado[:, j] = np.where(interior, interpolado, np.nan)
+        # El objetivo coincide exactamente con el primer punto de la curva
+        resultado[:, j] = np.where((k == 0) & (pasa[:, 0] == objetivo), diametros[:, 0], resultado[:, j])
+    return resultado
+
+
+def pasa_en(diametros, pasa, abertura):
+    """% que pasa a la abertura dada, interpolado en log D (fuera de la curva: extremo)"""
+    diametros = np.atleast_2d(np.asarray(diametros, dtype=np.float64))
+    pasa = np.atleast_2d(np.asarray(pasa, dtype=np.float64))
+    validos = (~np.isnan(pasa)).sum(axis=1)
+    filas = np.arange(len(pasa))
+
+    k = np.clip((diametros < abertura).sum(axis=1), 1, validos - 1)
+    d0, d1 = np.log10(diametros[filas, k - 1]), np.log10(diametros[filas, k])
+    p0, p1 = pasa[filas, k - 1], pasa[filas, k]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = np.clip((np.log10(abertura) - d0) / (d1 - d0), 0, 1)
+    return p0 + np.nan_to_num(t) * (p1 - p0)
+
+
+class GranulometriaProcessor:
+    # Resultados por versión de muestra compartidos por todas las instancias
+    _cache = OrderedDict()
+    _lock = threading.Lock()
+    TAMANO_CACHE = 512
+
+    def curva_combinada(self, tamices, hidrometria=None, pasa_referencia=None):
+        """
+        Unir tamizado e hidrometría en una curva monótona
+
+        Args:
+            tamices: Lista de dict con 'abertura_mm' y 'pct_pasa'
+            hidrometria: Lista de dict con 'd_mm' y 'pct_mas_fino' (opcional)
+            pasa_referencia: % que pasa el tamiz N° 10 sobre el que se ensayó la
+                             hidrometría; por defecto se interpola del tamizado
+
+        Returns:
+            tuple (diametros, pasa) ascendentes en diámetro
+        """
+        d_tamiz = np.array([t['abertura_mm'] for t in tamices], dtype=np.float64)
+        p_tamiz = np.array([t['pct_pasa'] for t in tamices], dtype=np.float64)
+        utiles = (d_tamiz > 0) & ~np.isnan(p_tamiz)
+        d_tamiz, p_tamiz = d_tamiz[utiles], p_tamiz[utiles]
+        if len(d_tamiz) < 2:
+            raise ValueError("Se requieren al menos 2 tamices con abertura y % que pasa")
+
+        orden = np.argsort(d_tamiz)
+        d_tamiz, p_tamiz = d_tamiz[orden], p_tamiz[orden]
+
+        if hidrometria:
+            d_hidro = np.array([h['d_mm'] for h in hidrometria], dtype=np.float64)
+            p_hidro = np.array([h['pct_mas_fino'] for h in hidrometria], dtype=np.float64)
+            if pasa_referencia is None:
+                pasa_referencia = np.interp(np.log10(ABERTURA_HIDROMETRO), np.log10(d_tamiz), p_tamiz)
+
+            # El % más fino de la hidrometría es relativo al pasante del N° 10
+            finos = d_hidro < d_tamiz[0]
+            d_tamiz = np.concatenate([d_hidro[finos], d_tamiz])
+            p_tamiz = np.concatenate([p_hidro[finos] * pasa_referencia / 100, p_tamiz])
+
+        orden = np.argsort(d_tamiz, kind='stable')
+        diametros, pasa = d_tamiz[orden], np.clip(p_tamiz[orden], 0, 100)
+
+        # Monótona: ningún diámetro menor puede tener más pasante que uno mayor
+        pasa = np.minimum.accumulate(pasa[::-1])[::-1]
+        return diametros, pasa
+
+    def calcular_lote(self, muestras):
+        """
+        Calcular curva, D10/D30/D60, Cu, Cc y fracciones de varias muestras
+
+        Args:
+            muestras: Lista de dict con 'tamices', y opcionalmente 'id',
+                      'hidrometria' y 'pasa_referencia'
+
+        Returns:
+            list: Un dict de resultados por muestra
+        """
+        if not muestras:
+            raise ValueError("Se requiere al menos una muestra")
+
+        resultados = [None] * len(muestras)
+        pendientes = []
+        for i, muestra in enumerate(muestras):
+            clave = self._version(muestra)
+            with self._lock:
+                if clave in self._cache:
+                    self._cache.move_to_end(clave)
+                    resultados[i] = dict(self._cache[clave], id=muestra.get('id', i + 1))
+                    continue
+            pendientes.append((i, clave))
+
+        if pendientes:
+            curvas = [self.curva_combinada(muestras[i]['tamices'], muestras[i].get('hidrometria'),
+                                           muestras[i].get('pasa_referencia')) for i, _ in pendientes]
+            for (i, clave), resultado in zip(pendientes, self._calcular_curvas(curvas)):
+                with self._lock:
+                    self._cache[clave] = resultado
+                    if len(self._cache) > self.TAMANO_CACHE:
+                        self._cache.popitem(last=False)
+                resultados[i] = dict(resultado, id=muestras[i].get('id', i + 1))
+
+        return resultados
+
+    def calcular(self, tamices, hidrometria=None, pasa_referencia=None):
+        """Calcular la gradación de una sola muestra"""
+        muestra = {'id': 1, 'tamices': tamices, 'hidrometria': hidrometria, 'pasa_referencia': pasa_referencia}
+        return self.calcular_lote([muestra])[0]
+
+    def _calcular_curvas(self, curvas):
+        """Parámetros de todas las curvas con matrices rellenadas con NaN"""
+        n = max(len(d) for d, _ in curvas)
+        diametros = np.full((len(curvas), n), np.nan)
+        pasa = np.full((len(curvas), n), np.nan)
+        for i, (d, p) in enumerate(curvas):
+            diametros[i, :len(d)] = d
+            pasa[i, :len(p)] = p
+
+        d10, d30, d60 = diametros_caracteristicos(diametros, pasa).T
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cu = d60 / d10
+            cc = d30 ** 2 / (d10 * d60)
+
+        pasa_n4 = pasa_en(diametros, pasa, ABERTURA_N4)
+        finos = pasa_en(diametros, pasa, ABERTURA_N200)
+
+        resultados = []
+        for i, (d, p) in enumerate(curvas):
+            resultados.append({
+                'curva': [{'d_mm': float(x), 'pct_pasa': round(float(y), 2)} for x, y in zip(d, p)],
+                'd10': self._redondear(d10[i], 5),
+                'd30': self._redondear(d30[i], 5),
+                'd60': self._redondear(d60[i], 5),
+                'cu': self._redondear(cu[i], 2),
+                'cc': self._redondear(cc[i], 2),
+                'grava': round(float(100 - pasa_n4[i]), 2),
+                'arena': round(float(pasa_n4[i] - finos[i]), 2),
+                'finos': round(float(finos[i]), 2)
+            })
+        return resultados
+
+    @staticmethod
+    def _redondear(valor, decimales):
+        """float redondeado, o None si no se pudo determinar"""
+        return None if not np.isfinite(valor) else round(float(valor), decimales)
+
+    @staticmethod
+    def _version(muestra):
+        """Hash de los datos que determinan el resultado de una muestra"""
+        h = hashlib.sha1()
+        for clave in ('tamices', 'hidrometria'):
+            for punto in muestra.get(clave) or []:
+                for campo in ('abertura_mm', 'pct_pasa', 'd_mm', 'pct_mas_fino'):
+                    if campo in punto:
+                        h.update(f"{campo}={float(punto[campo])!r};".encode())
+            h.update(b'|')
+        h.update(repr(muestra.get('pasa_referencia')).encode())
+        return h.hexdigest()
+
+    @staticmethod
+    def para_clasificacion(resultado, limite_liquido=None, indice_plasticidad=None):
+        """Datos en el formato que esperan los clasificadores SUCS"""
+        return {
+            'grava': resultado['grava'],
+            'arena': resultado['arena'],
+            'finos': resultado['finos'],
+            'coef_uniformidad': resultado['cu'],
+            'coef_curvatura': resultado['cc'],
+            'limite_liquido': limite_liquido,
+            'indice_plasticidad': indice_plasticidad
+        }
@@ -0,0 +1,258 @@
+"""
+Procesador de cálculos de Hidrometría (ley de Stokes, ASTM D422 / D7928)
+
+Todas las lecturas de todas las muestras se reducen a la vez con operaciones
+NumPy: profundidad efectiva, K(T, Gs), diámetro de partícula y % más fino.
+K y Ct pueden leerse además de rejillas precalculadas compartidas por el
+proceso (TablasCorreccion), útiles para reproducir valores tabulados.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+
+# Corrección por temperatura Ct del hidrómetro 152H (fuera del rango se usa el extremo)
+TABLA_CT_TEMPERATURA = np.array([15.0, 16.0, 17.0, 18.0, 19.0, 20.0, 21.0, 22.0,
+                                 23.0, 24.0, 25.0, 26.0, 27.0, 28.0, 29.0, 30.0])
+TABLA_CT = np.array([-1.10, -0.90, -0.70, -0.50, -0.30, 0.00, 0.20, 0.40,
+                     0.70, 1.00, 1.30, 1.65, 2.00, 2.50, 3.05, 3.80])
+
+# Columnas mínimas de cada lectura
+COLUMNAS_LECTURA = ('t_min', 'temperatura', 'lr')
+
+
+def viscosidad_agua(temperatura):
+    """Viscosidad dinámica del agua en poise (ecuación de Vogel), T en °C"""
+    temperatura = np.asarray(temperatura, dtype=np.float64)
+    return 0.02939 * np.exp(507.88 / (temperatura + 273.15 - 149.3)) / 100
+
+
+def densidad_relativa_agua(temperatura):
+    """Gravedad específica del agua a la temperatura dada (°C)"""
+    temperatura = np.asarray(temperatura, dtype=np.float64)
+    return 1 - (temperatura + 288.9414) / (508929.2 * (temperatura + 68.12963)) * (temperatura - 3.9863) ** 2
+
+
+def constante_k(temperatura, gs):
+    """K = sqrt(30·η / (980·(Gs − Gw))) para D en mm, L en cm y t en min"""
+    return np.sqrt(30 * viscosidad_agua(temperatura) / (980 * (np.asarray(gs, dtype=np.float64) - densidad_relativa_agua(temperatura))))
+
+
+def correccion_temperatura(temperatura):
+    """Corrección Ct por temperatura, interpolada en la tabla del 152H"""
+    return np.interp(np.asarray(temperatura, dtype=np.float64), TABLA_CT_TEMPERATURA, TABLA_CT)
+
+
+def profundidad_efectiva(lectura):
+    """Profundidad efectiva L (cm) del hidrómetro 152H para la lectura corregida por menisco"""
+    return 16.29 - 0.164 * np.asarray(lectura, dtype=np.float64)
+
+
+def factor_alfa(gs):
+    """Factor a de corrección por gravedad específica (152H calibrado para Gs = 2.65)"""
+    gs = np.asarray(gs, dtype=np.float64)
+    return gs * 1.65 / ((gs - 1) * 2.65)
+
+
+class TablasCorreccion:
+    """
+    Rejillas precalculadas de K(T, Gs) y Ct(T) con paso uniforme
+
+    Las consultas se resuelven con aritmética de índices sobre arrays completos
+    de lecturas: interpolación bilineal para K y lineal para Ct (exacta, porque
+    los nodos de la tabla ASTM son nodos de la rejilla). Fuera de la rejilla,
+    K se evalúa con la fórmula exacta.
+    """
+
+    def __init__(self, temperatura=(0.0, 40.0, 0.5), gs=(2.0, 3.2, 0.01)):
+        self.t0, self.t1, self.dt = temperatura
+        self.g0, self.g1, self.dg = gs
+
+        self.temperaturas = np.linspace(self.t0, self.t1, int(round((self.t1 - self.t0) / self.dt)) + 1)
+        self.gravedades = np.linspace(self.g0, self.g1, int(round((self.g1 - self.g0) / self.dg)) + 1)
+
+        self.rejilla_k = constante_k(self.temperaturas[:, None], self.gravedades[None, :])
+        self.rejilla_ct = correccion_temperatura(self.temperaturas)
+
+    @staticmethod
+    def _celda(valores, origen, paso, n):
+        """Índice inferior de celda y fracción dentro de ella (recortados a la rejilla)"""
+        x = np.clip((valores - origen) / paso, 0, n - 1)
+        i = np.minimum(x.astype(np.intp), n - 2)
+        return i, x - i
+
+    def k(self, temperatura, gs):
+        """K(T, Gs) por interpolación bilineal en la rejilla"""
+        temperatura, gs = np.broadcast_arrays(np.asarray(temperatura, dtype=np.float64),
+                                              np.asarray(gs, dtype=np.float64))
+        i, ft = self._celda(temperatura, self.t0, self.dt, len(self.temperaturas))
+        j, fg = self._celda(gs, self.g0, self.dg, len(self.gravedades))
+
+        r = self.rejilla_k
+        k = ((r[i, j] * (1 - fg) + r[i, j + 1] * fg) * (1 - ft)
+             + (r[i + 1, j] * (1 - fg) + r[i + 1, j + 1] * fg) * ft)
+
+        fuera = (temperatura < self.t0) | (temperatura > self.t1) | (gs < self.g0) | (gs > self.g1)
+        if fuera.any():
+            k = np.where(fuera, constante_k(temperatura, gs), k)
+        return k
+
+    def ct(self, temperatura):
+        """Ct(T) por interpolación lineal en la rejilla (extremos constantes)"""
+        i, ft = self._celda(np.asarray(temperatura, dtype=np.float64), self.t0, self.dt, len(self.temperaturas))
+        return self.rejilla_ct[i] * (1 - ft) + self.rejilla_ct[i + 1] * ft
+
+
+@lru_cache(maxsize=None)
+def tablas_correccion():
+    """Rejillas de corrección compartidas por el proceso (se calculan una vez)"""
+    return TablasCorreccion()
+
+
+def reducir_lecturas(t_min, temperatura, lr, gs, ws, cm=0.0, cc=0.0, alfa=None, tablas=None):
+    """
+    Reducir lecturas de hidrómetro (todas las entradas admiten arrays que se difunden)
+
+    Args:
+        t_min: Tiempo transcurrido (min)
+        temperatura: Temperatura de la suspensión (°C)
+        lr: Lectura del hidrómetro
+        gs: Gravedad específica de los sólidos
+        ws: Peso seco de la muestra (g)
+        cm: Corrección por menisco
+        cc: Corrección por defloculante / punto cero
+        alfa: Factor a; si es None se calcula a partir de Gs
+        tablas: Rejillas de K y Ct; si es None se usan las fórmulas cerradas,
+                que en NumPy son más baratas que la interpolación en rejilla
+
+    Returns:
+        dict de arrays: l, k, d_mm, ct, lectura_corregida, pct_mas_fino
+    """
+    t_min = np.asarray(t_min, dtype=np.float64)
+    lr = np.asarray(lr, dtype=np.float64)
+    gs = np.asarray(gs, dtype=np.float64)
+
+    alfa = factor_alfa(gs) if alfa is None else np.asarray(alfa, dtype=np.float64)
+    l = profundidad_efectiva(lr + cm)
+    k = constante_k(temperatura, gs) if tablas is None else tablas.k(temperatura, gs)
+    d_mm = k * np.sqrt(l / t_min)
+
+    ct = correccion_temperatura(temperatura) if tablas is None else tablas.ct(temperatura)
+    lectura_corregida = lr - cc + ct
+    pct_mas_fino = alfa * lectura_corregida / ws * 100
+
+    return {
+        'l': l,
+        'k': k,
+        'd_mm': d_mm,
+        'ct': ct,
+        'lectura_corregida': lectura_corregida,
+        'pct_mas_fino': pct_mas_fino
+    }
+
+
+class HidrometriaProcessor:
+    def __init__(self, usar_tablas=False):
+        # Con usar_tablas, K y Ct salen de las rejillas compartidas del proceso
+        self.tablas = tablas_correccion() if usar_tablas else None
+
+    def calcular_distribucion(self, lecturas, gs, ws, cm=0.0, cc=0.0, alfa=None):
+        """
+        Calcular la distribución granulométrica de una muestra
+
+        Args:
+            lecturas: Lista de dict (o DataFrame) con 't_min', 'temperatura' y 'lr'
+            gs, ws, cm, cc, alfa: Parámetros del ensayo
+
+        Returns:
+            dict con los parámetros usados y la lista de lecturas reducidas
+        """
+        muestra = {'id': 1, 'lecturas': lecturas, 'gs': gs, 'ws': ws, 'cm': cm, 'cc': cc, 'alfa': alfa}
+        return self.calcular_distribucion_lote([muestra])[0]
+
+    def calcular_distribucion_lote(self, muestras):
+        """
+        Reducir las lecturas de muchas muestras en una sola pasada vectorizada
+
+        Args:
+            muestras: Lista de dict con 'lecturas', 'gs', 'ws' y opcionalmente
+                      'id', 'cm', 'cc' y 'alfa'
+
+        Returns:
+            list: Un dict por muestra con 'id', 'parametros' y 'lecturas'
+        """
+        tabla, parametros = self._preparar_lote(muestras)
+
+        # Parámetros de cada muestra repetidos para cada una de sus lecturas
+        n = np.array([len(m['lecturas']) for m in muestras])
+        por_lectura = {clave: np.repeat(valores, n) for clave, valores in parametros.items() if clave != 'id'}
+
+        resultado = reducir_lecturas(
+            tabla['t_min'].to_numpy(),
+            tabla['temperatura'].to_numpy(),
+            tabla['lr'].to_numpy(),
+            tablas=self.tablas,
+            **por_lectura
+        )
+        for clave, valores in resultado.items():
+            tabla[clave] = np.round(valores, 6)
+
+        salida = []
+        fin = np.cumsum(n)
+        for i, muestra_id in enumerate(parametros['id']):
+            bloque = tabla.iloc[fin[i] - n[i]:fin[i]]
+            salida.append({
+                'id': muestra_id,
+                'parametros': {clave: float(valores[i]) for clave, valores in parametros.items() if clave != 'id'},
+                'lecturas': bloque.to_dict('records')
+            })
+        return salida
+
+    def _preparar_lote(self, muestras):
+        """Validar las muestras y concatenar sus lecturas en un único DataFrame"""
+        if not muestras:
+            raise ValueError("Se requiere al menos una muestra")
+
+        tablas = []
+        parametros = {'id': [], 'gs': [], 'ws': [], 'cm': [], 'cc': [], 'alfa': []}
+        for i, muestra in enumerate(muestras, 1):
+            muestra_id = muestra.get('id', i)
+            lecturas = pd.DataFrame(muestra.get('lecturas') if muestra.get('lecturas') is not None else [])
+            faltantes = [c for c in COLUMNAS_LECTURA if c not in lecturas.columns]
+            if lecturas.empty or faltantes:
+                raise ValueError(f"Muestra {muestra_id}: se requieren lecturas con {', '.join(COLUMNAS_LECTURA)}")
+
+            lecturas = lecturas.reset_index(drop=True)
+            for columna in COLUMNAS_LECTURA:
+                lecturas[columna] = pd.to_numeric(lecturas[columna], errors='coerce')
+            if lecturas[list(COLUMNAS_LECTURA)].isna().any().any():
+                raise ValueError(f"Muestra {muestra_id}: las lecturas contienen valores no numéricos")
+            if (lecturas['t_min'] <= 0).any():
+                raise ValueError(f"Muestra {muestra_id}: el tiempo de cada lectura debe ser mayor que cero")
+
+            gs = muestra.get('gs')
+            ws = muestra.get('ws')
+            if gs is None or ws is None:
+                raise ValueError(f"Muestra {muestra_id}: se requieren Gs y Ws")
+            if float(ws) <= 0:
+                raise ValueError(f"Muestra {muestra_id}: Ws debe ser mayor que cero")
+            if float(gs) <= 1:
+                raise ValueError(f"Muestra {muestra_id}: Gs debe ser mayor que 1")
+
+            parametros['id'].append(muestra_id)
+            parametros['gs'].append(float(gs))
+            parametros['ws'].append(float(ws))
+            parametros['cm'].append(float(muestra.get('cm') or 0.0))
+            parametros['cc'].append(float(muestra.get('cc') or 0.0))
+            parametros['alfa'].append(float(factor_alfa(gs)) if muestra.get('alfa') is None else float(muestra['alfa']))
+
+            lecturas.insert(0, 'muestra', muestra_id)
+            tablas.append(lecturas)
+
+        tabla = pd.concat(tablas, ignore_index=True)
+        parametros = {clave: np.array(valores, dtype=object if clave == 'id' else np.float64)
+                      for clave, valores in parametros.items()}
+        return tabla, parametros
+
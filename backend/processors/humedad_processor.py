@@ -2,8 +2,21 @@
 Procesador de cálculos de Contenido de Humedad
 """
 
+import numpy as np
+import pandas as pd
+
+from .cache import memorizar
+from ..nucleo import (MENSAJES_ERROR_HUMEDAD, CLASIFICACIONES_HUMEDAD, SIN_ERROR,
+                      contenido_humedad, errores_humedad, clase_humedad)
+
+
+# Columnas de cada recipiente (y nombres alternativos que envía el frontend)
+COLUMNAS_HUMEDAD = ('peso_recipiente', 'peso_humedo', 'peso_seco')
+ALIAS_COLUMNAS = {'pesoRecipiente': 'peso_recipiente', 'pesoHumedo': 'peso_humedo', 'pesoSeco': 'peso_seco'}
+
 
 class HumedadProcessor:
+    @memorizar
     def calcular_humedad(self, peso_recipiente, peso_humedo, peso_seco):
         """
         Calcular contenido de humedad según ASTM D2216
@@ -16,30 +29,13 @@ class HumedadProcessor:
         Returns:
             dict: Resultados del cálculo
         """
-        # Validaciones
-        if peso_humedo <= peso_recipiente:
-            raise ValueError("El peso húmedo debe ser mayor que el peso del recipiente")
-        
-        if peso_seco <= peso_recipiente:
-            raise ValueError("El peso seco debe ser mayor que el peso del recipiente")
-        
-        if peso_seco > peso_humedo:
-            raise ValueError("El peso seco debe ser menor que el peso húmedo")
-        
-        # Cálculos
-        peso_agua = peso_humedo - peso_seco
-        peso_suelo_seco = peso_seco - peso_recipiente
-        humedad = (peso_agua / peso_suelo_seco) * 100
-        
-        # Clasificación
-        if humedad < 10:
-            clasificacion = 'Muy Seco'
-        elif humedad < 20:
-            clasificacion = 'Seco'
-        elif humedad < 30:
-            clasificacion = 'Húmedo'
-        else:
-            clasificacion = 'Muy Húmedo'
+        # Validaciones y cálculos del núcleo compartido
+        error = int(errores_humedad(peso_recipiente, peso_humedo, peso_seco))
+        if error != SIN_ERROR:
+            raise ValueError(MENSAJES_ERROR_HUMEDAD[error])
+        
+        humedad, peso_agua, peso_suelo_seco = (float(v) for v in contenido_humedad(peso_recipiente, peso_humedo, peso_seco))
+        clasificacion = CLASIFICACIONES_HUMEDAD[clase_humedad(humedad)]
         
         return {
             'humedad': round(humedad, 2),
@@ -52,3 +48,56 @@ class HumedadProcessor:
                 'paso3': f"Humedad = ({peso_agua:.2f} / {peso_suelo_seco:.2f}) × 100 = {humedad:.2f} %"
             }
         }
+    
+    def calcular_humedad_lote(self, registros, incluir_calculos=False):
+        """
+        Calcular el contenido de humedad de muchos recipientes en una sola pasada
+        
+        Args:
+            registros: Lista de dict o DataFrame con peso_recipiente, peso_humedo
+                       y peso_seco (también se aceptan pesoRecipiente, pesoHumedo
+                       y pesoSeco) y opcionalmente 'id'
+            incluir_calculos: Añadir a cada fila los pasos del cálculo como texto
+            
+        Returns:
+            list: Un dict por fila; las filas inválidas traen 'error' y valores None
+        """
+        tabla = pd.DataFrame(registros).rename(columns=ALIAS_COLUMNAS)
+        faltantes = [c for c in COLUMNAS_HUMEDAD if c not in tabla.columns]
+        if faltantes:
+            raise ValueError(f"Faltan columnas: {', '.join(faltantes)}")
+        if tabla.empty:
+            raise ValueError("Se requiere al menos un registro")
+        
+        recipiente, humedo, seco = (
+            pd.to_numeric(tabla[c], errors='coerce').to_numpy(dtype=np.float64) for c in COLUMNAS_HUMEDAD
+        )
+        
+        # Primer error de cada fila, en el mismo orden que calcular_humedad
+        codigos = errores_humedad(recipiente, humedo, seco)
+        valido = codigos == SIN_ERROR
+        error = np.array(MENSAJES_ERROR_HUMEDAD + [None], dtype=object)[codigos]
+        
+        humedad, peso_agua, peso_suelo_seco = contenido_humedad(recipiente, humedo, seco)
+        humedad = np.where(valido, humedad, np.nan)
+        clasificacion = CLASIFICACIONES_HUMEDAD[clase_humedad(humedad)]
+        
+        ids = tabla['id'].tolist() if 'id' in tabla.columns else range(1, len(tabla) + 1)
+        resultados = pd.DataFrame({
+            'id': ids,
+            'humedad': np.round(humedad, 2),
+            'peso_agua': np.round(np.where(valido, peso_agua, np.nan), 2),
+            'peso_suelo_seco': np.round(np.where(valido, peso_suelo_seco, np.nan), 2),
+            'clasificacion': np.where(valido, clasificacion, None),
+            'error': np.where(valido, None, error)
+        })
+        resultados = resultados.astype(object).where(resultados.notna(), None).to_dict('records')
+        
+        if incluir_calculos:
+            for i in np.flatnonzero(valido):
+                resultados[i]['calculos'] = {
+                    'paso1': f"Peso del Agua = {humedo[i]:.2f} - {seco[i]:.2f} = {peso_agua[i]:.2f} g",
+                    'paso2': f"Peso Suelo Seco = {seco[i]:.2f} - {recipiente[i]:.2f} = {peso_suelo_seco[i]:.2f} g",
+                    'paso3': f"Humedad = ({peso_agua[i]:.2f} / {peso_suelo_seco[i]:.2f}) × 100 = {humedad[i]:.2f} %"
+                }
+        return resultados
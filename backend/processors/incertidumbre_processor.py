@@ -0,0 +1,350 @@
+"""
+Propagación de incertidumbre por Monte Carlo
+
+Cada pesada se perturba dentro de la resolución de la balanza y cada conteo
+de golpes con su dispersión. Las N realizaciones de todas las muestras se
+calculan como un único lote con los kernels del núcleo (una fila por
+realización), por bloques de muestras para acotar la memoria y, si se pide,
+repartiendo los bloques en un pool de procesos. De cada muestra se devuelven
+la media, la desviación y el intervalo de confianza de w, LL, LP e IP, y la
+probabilidad de cada clase SUCS, AASHTO y de plasticidad: una muestra cerca
+de la línea A o de LL = 50 aparece con dos clases probables.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from ..nucleo import (MENSAJES_ERROR_HUMEDAD, MENSAJES_ERROR_FLUIDEZ, SIN_ERROR, contenido_humedad,
+                      errores_humedad, ajustar_fluidez, limite_plastico, indice_plasticidad, clase_plasticidad)
+from ..nucleo.sucs import SIMBOLOS_SUCS, SIN_CLASIFICAR as SUCS_SIN_CLASIFICAR, clasificar_sucs_lote
+from ..nucleo.aashto import GRUPOS_AASHTO, SIN_CLASIFICAR as AASHTO_SIN_CLASIFICAR, clasificar_aashto_lote
+from .atterberg_processor import CLASES_PLASTICIDAD
+
+
+# Valores por defecto de la simulación
+REALIZACIONES = 1000
+MAX_REALIZACIONES = 100000
+RESOLUCION_BALANZA = 0.01   # g; cada pesada se reparte uniforme en ± resolución / 2
+DESVIACION_GOLPES = 1.0     # golpes; desviación típica del conteo, redondeada a entero
+NIVEL_CONFIANZA = 0.95
+
+# Realizaciones (filas) por bloque: acota la memoria de cada lote
+FILAS_BLOQUE = 200000
+
+# Procesos del pool (0 o 1 = en el mismo proceso); HSGVA_INCERTIDUMBRE_PROCESOS
+PROCESOS = int(os.environ.get('HSGVA_INCERTIDUMBRE_PROCESOS', 0))
+
+# Columnas de cada pesada (nombres del ETL) y nombres alternativos aceptados
+COLUMNAS_PESOS = ('recipiente', 'recipiente_suelo_h', 'recipiente_suelo_s')
+ALIAS_PESOS = {
+    'peso_recipiente': 'recipiente', 'pesoRecipiente': 'recipiente',
+    'peso_humedo': 'recipiente_suelo_h', 'pesoHumedo': 'recipiente_suelo_h',
+    'peso_seco': 'recipiente_suelo_s', 'pesoSeco': 'recipiente_suelo_s'
+}
+
+# Ensayos de cada muestra (clave -> nombre en los mensajes)
+ENSAYOS = (('humedad', 'Humedad'), ('ensayos_ll', 'Límite líquido'), ('ensayos_lp', 'Límite plástico'))
+
+# Datos de clasificación que no se perturban
+FIJAS = ('grava', 'arena', 'finos', 'cu', 'cc', 'p10', 'p40')
+
+MAGNITUDES = ('humedad', 'limite_liquido', 'limite_plastico', 'indice_plasticidad')
+SISTEMAS = {
+    'plasticidad': [c[0] for c in CLASES_PLASTICIDAD],
+    'sucs': [s[0] for s in SIMBOLOS_SUCS],
+    'aashto': [g[0] for g in GRUPOS_AASHTO]
+}
+
+# Código de las realizaciones sin clase
+SIN_CLASE = -1
+
+
+def _numero(valor):
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _preparar(muestras):
+    """
+    Matrices rellenadas con NaN de un lote de muestras
+
+    Returns:
+        dict con pesos (muestras x ensayos x 3) de cada ensayo, 'golpes'
+        (muestras x ensayos de LL) y un array por dato fijo
+    """
+    bloque = {}
+    for clave, _ in ENSAYOS:
+        filas = []
+        for muestra in muestras:
+            ensayos = muestra.get(clave) or []
+            filas.append([ensayos] if isinstance(ensayos, dict) else list(ensayos))
+        pesos = np.full((len(muestras), max([len(f) for f in filas] + [1]), 3), np.nan)
+        for i, ensayos in enumerate(filas):
+            for j, ensayo in enumerate(ensayos):
+                ensayo = {ALIAS_PESOS.get(k, k): v for k, v in ensayo.items()}
+                pesos[i, j] = [_numero(ensayo.get(c)) for c in COLUMNAS_PESOS]
+                if clave == 'ensayos_ll':
+                    bloque.setdefault('golpes', np.full(pesos.shape[:2], np.nan))[i, j] = _numero(
+                        ensayo.get('golpes', ensayo.get('n_golpes')))
+        bloque[clave] = pesos
+    bloque.setdefault('golpes', np.full(bloque['ensayos_ll'].shape[:2], np.nan))
+    for dato in FIJAS:
+        bloque[dato] = np.array([_numero(m.get(dato)) for m in muestras])
+    return bloque
+
+
+def _errores(muestras, bloque):
+    """Mensaje de error por muestra (None si los datos nominales son válidos)"""
+    codigos = {clave: errores_humedad(*np.moveaxis(bloque[clave], -1, 0)) for clave, _ in ENSAYOS}
+    n_golpes = (bloque['golpes'] > 0).sum(axis=1)
+
+    errores = []
+    for i, muestra in enumerate(muestras):
+        error = None
+        for clave, nombre in ENSAYOS:
+            ensayos = muestra.get(clave)
+            n = 1 if isinstance(ensayos, dict) else len(ensayos or [])
+            fallos = np.flatnonzero(codigos[clave][i, :n] != SIN_ERROR)
+            if len(fallos):
+                j = fallos[0]
+                error = f"{nombre}, ensayo {j + 1}: {MENSAJES_ERROR_HUMEDAD[codigos[clave][i, j]]}"
+                break
+            if clave == 'ensayos_ll' and n and n_golpes[i] < 2:
+                error = f"{nombre}: {MENSAJES_ERROR_FLUIDEZ[0]} con golpes"
+                break
+        if error is None and not any(muestra.get(clave) for clave, _ in ENSAYOS):
+            error = "Se requiere al menos un ensayo de humedad, límite líquido o límite plástico"
+        errores.append(error)
+    return errores
+
+
+def _calcular(bloque):
+    """
+    Magnitudes y códigos de clase de cada fila (una fila por realización)
+
+    Returns:
+        dict de arrays: humedad, limite_liquido, limite_plastico,
+        indice_plasticidad (NaN si no hay dato) y plasticidad, sucs, aashto
+        (SIN_CLASE si no se pudo clasificar)
+    """
+    # El promedio por fila ignorando NaN es el mismo para w y para LP
+    humedades = {clave: contenido_humedad(*np.moveaxis(bloque[clave], -1, 0))[0] for clave, _ in ENSAYOS}
+    humedad = limite_plastico(humedades['humedad'])
+    ll = ajustar_fluidez(bloque['golpes'], humedades['ensayos_ll'])['limite_liquido']
+    lp = limite_plastico(humedades['ensayos_lp'])
+    ip = indice_plasticidad(ll, lp)
+
+    con_ip = ~np.isnan(ip)
+    plasticidad = np.where(con_ip, clase_plasticidad(np.where(con_ip, ip, 0)), SIN_CLASE)
+
+    grava, arena, finos, cu, cc, p10, p40 = (bloque[dato] for dato in FIJAS)
+    sucs = clasificar_sucs_lote(grava, arena, finos, ll, ip, cu, cc).astype(np.int16)
+    sucs = np.where(sucs == SUCS_SIN_CLASIFICAR, SIN_CLASE, sucs)
+    aashto = clasificar_aashto_lote(finos, ll, ip, p10, p40)[0].astype(np.int16)
+    aashto = np.where(aashto == AASHTO_SIN_CLASIFICAR, SIN_CLASE, aashto)
+
+    return {
+        'humedad': humedad, 'limite_liquido': ll, 'limite_plastico': lp, 'indice_plasticidad': ip,
+        'plasticidad': plasticidad, 'sucs': sucs, 'aashto': aashto
+    }
+
+
+def _perturbar(bloque, realizaciones, resolucion, desviacion_golpes, rng):
+    """Repetir cada muestra N veces y perturbar pesadas y golpes"""
+    perturbado = {}
+    for clave, _ in ENSAYOS:
+        pesos = np.repeat(bloque[clave], realizaciones, axis=0)
+        perturbado[clave] = pesos + rng.uniform(-resolucion / 2, resolucion / 2, pesos.shape) if resolucion else pesos
+
+    golpes = np.repeat(bloque['golpes'], realizaciones, axis=0)
+    if desviacion_golpes:
+        golpes = np.maximum(golpes + np.rint(rng.normal(0, desviacion_golpes, golpes.shape)), 1)
+    perturbado['golpes'] = golpes
+
+    for dato in FIJAS:
+        perturbado[dato] = np.repeat(bloque[dato], realizaciones)
+    return perturbado
+
+
+def _cuantiles(valores, probabilidades):
+    """Cuantiles por fila ignorando NaN (interpolación lineal, como np.quantile)"""
+    ordenados = np.sort(valores, axis=1)
+    n = (~np.isnan(valores)).sum(axis=1)
+    resultado = []
+    for p in probabilidades:
+        posicion = np.maximum(n - 1, 0) * p
+        abajo = np.floor(posicion).astype(np.int64)
+        arriba = np.minimum(abajo + 1, np.maximum(n - 1, 0))
+        fraccion = posicion - abajo
+        bajo = np.take_along_axis(ordenados, abajo[:, None], axis=1)[:, 0]
+        alto = np.take_along_axis(ordenados, arriba[:, None], axis=1)[:, 0]
+        resultado.append(np.where(n > 0, bajo + fraccion * (alto - bajo), np.nan))
+    return resultado
+
+
+def _resumir(valores, realizaciones, nivel):
+    """Media, desviación, intervalo y nº de realizaciones válidas por muestra"""
+    valores = valores.reshape(-1, realizaciones)
+    validas = ~np.isnan(valores)
+    n = validas.sum(axis=1)
+    ceros = np.where(validas, valores, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media = np.where(n > 0, ceros.sum(axis=1) / n, np.nan)
+        desviacion = np.sqrt((np.where(validas, valores - media[:, None], 0.0) ** 2).sum(axis=1) / (n - 1))
+    inferior, superior = _cuantiles(valores, ((1 - nivel) / 2, (1 + nivel) / 2))
+    return {'media': media, 'desviacion': np.where(n > 1, desviacion, np.nan),
+            'inferior': inferior, 'superior': superior, 'validas': n}
+
+
+def _contar(codigos, realizaciones, n_clases):
+    """Matriz (muestras x clases) con el número de realizaciones de cada clase"""
+    codigos = codigos.reshape(-1, realizaciones)
+    filas = np.repeat(np.arange(len(codigos)), realizaciones)
+    planos = codigos.ravel()
+    con_clase = planos != SIN_CLASE
+    indices = filas[con_clase] * n_clases + planos[con_clase]
+    return np.bincount(indices, minlength=len(codigos) * n_clases).reshape(len(codigos), n_clases)
+
+
+def simular_bloque(bloque, realizaciones, resolucion, desviacion_golpes, nivel, semilla):
+    """
+    Simular un bloque de muestras ya preparado (se ejecuta también en los
+    procesos hijos, por eso solo recibe y devuelve arrays)
+
+    Returns:
+        dict {magnitud: resumen} y {sistema: conteos por clase}
+    """
+    rng = np.random.default_rng(semilla)
+    simulado = _calcular(_perturbar(bloque, realizaciones, resolucion, desviacion_golpes, rng))
+    resumen = {m: _resumir(simulado[m], realizaciones, nivel) for m in MAGNITUDES}
+    resumen.update({s: _contar(simulado[s], realizaciones, len(clases)) for s, clases in SISTEMAS.items()})
+    return resumen
+
+
+class IncertidumbreProcessor:
+    def __init__(self, realizaciones=REALIZACIONES, resolucion_balanza=RESOLUCION_BALANZA,
+                 desviacion_golpes=DESVIACION_GOLPES, nivel_confianza=NIVEL_CONFIANZA,
+                 semilla=None, procesos=PROCESOS):
+        """
+        Args:
+            realizaciones: Realizaciones por muestra (2 a MAX_REALIZACIONES)
+            resolucion_balanza: Resolución de la balanza (g)
+            desviacion_golpes: Desviación típica del conteo de golpes del LL
+            nivel_confianza: Nivel de los intervalos (0-1)
+            semilla: Semilla para resultados reproducibles
+            procesos: Procesos del pool (0 o 1 = en el mismo proceso)
+        """
+        realizaciones = int(realizaciones)
+        if not 2 <= realizaciones <= MAX_REALIZACIONES:
+            raise ValueError(f"Las realizaciones deben estar entre 2 y {MAX_REALIZACIONES}")
+        if not 0 < nivel_confianza < 1:
+            raise ValueError("El nivel de confianza debe estar entre 0 y 1")
+        if resolucion_balanza < 0 or desviacion_golpes < 0:
+            raise ValueError("La resolución y la desviación no pueden ser negativas")
+
+        self.realizaciones = realizaciones
+        self.resolucion_balanza = float(resolucion_balanza)
+        self.desviacion_golpes = float(desviacion_golpes)
+        self.nivel_confianza = float(nivel_confianza)
+        self.semilla = semilla
+        self.procesos = int(procesos or 0)
+
+    def simular(self, muestra):
+        """
+        Simular una muestra
+
+        Raises:
+            ValueError: Si los datos nominales no son válidos
+        """
+        resultado = self.simular_lote([muestra])[0]
+        if resultado['error']:
+            raise ValueError(resultado['error'])
+        return resultado
+
+    def simular_lote(self, muestras):
+        """
+        Propagar la incertidumbre de muchas muestras
+
+        Args:
+            muestras: Lista de dict con 'humedad' (recipiente o lista de
+                      recipientes con recipiente, recipiente_suelo_h y
+                      recipiente_suelo_s; también peso_recipiente, peso_humedo
+                      y peso_seco), 'ensayos_ll' (los mismos pesos más 'golpes'
+                      o 'n_golpes'), 'ensayos_lp' y opcionalmente grava, arena,
+                      finos, cu, cc, p10, p40 (para clasificar) e 'id'
+
+        Returns:
+            list: Un dict por muestra con el resumen de cada magnitud, las
+                  probabilidades de cada clase y 'error'
+        """
+        if not muestras:
+            raise ValueError("Se requiere al menos una muestra")
+
+        bloque = _preparar(muestras)
+        errores = _errores(muestras, bloque)
+        nominal = _calcular(bloque)
+
+        por_bloque = max(1, FILAS_BLOQUE // self.realizaciones)
+        cortes = [slice(i, i + por_bloque) for i in range(0, len(muestras), por_bloque)]
+        semillas = np.random.SeedSequence(self.semilla).spawn(len(cortes))
+        argumentos = [
+            ({k: v[corte] for k, v in bloque.items()}, self.realizaciones, self.resolucion_balanza,
+             self.desviacion_golpes, self.nivel_confianza, semilla)
+            for corte, semilla in zip(cortes, semillas)
+        ]
+        partes = self._ejecutar(argumentos)
+
+        resumen = {clave: ({c: np.concatenate([p[clave][c] for p in partes]) for c in partes[0][clave]}
+                           if clave in MAGNITUDES else np.concatenate([p[clave] for p in partes]))
+                   for clave in partes[0]}
+        return [self._formatear(i, muestra, errores[i], nominal, resumen) for i, muestra in enumerate(muestras)]
+
+    def _ejecutar(self, argumentos):
+        """Simular los bloques en un pool de procesos o, si no se puede, aquí mismo"""
+        if self.procesos > 1 and len(argumentos) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=min(self.procesos, len(argumentos))) as pool:
+                    return list(pool.map(simular_bloque, *zip(*argumentos)))
+            except (BrokenProcessPool, OSError, NotImplementedError) as e:
+                print(f"⚠️  Incertidumbre: fallo en el pool de procesos ({e}), simulando en el proceso actual")
+        return [simular_bloque(*a) for a in argumentos]
+
+    def _formatear(self, i, muestra, error, nominal, resumen):
+        resultado = {'id': muestra.get('id', i + 1), 'error': error, 'realizaciones': self.realizaciones}
+        if error:
+            return resultado
+
+        for magnitud in MAGNITUDES:
+            valor = nominal[magnitud][i]
+            if np.isnan(valor):
+                resultado[magnitud] = None
+                continue
+            r = {c: v[i] for c, v in resumen[magnitud].items()}
+            resultado[magnitud] = {
+                'nominal': round(float(valor), 2),
+                'media': round(float(r['media']), 2),
+                'desviacion': None if np.isnan(r['desviacion']) else round(float(r['desviacion']), 3),
+                'intervalo': [round(float(r['inferior']), 2), round(float(r['superior']), 2)],
+                'validas': int(r['validas'])
+            }
+
+        for sistema, clases in SISTEMAS.items():
+            codigo = int(nominal[sistema][i])
+            conteos = resumen[sistema][i]
+            if codigo == SIN_CLASE or not conteos.sum():
+                resultado[sistema] = None
+                continue
+            probabilidades = {clases[c]: round(float(conteos[c] / self.realizaciones), 4)
+                              for c in np.argsort(-conteos, kind='stable') if conteos[c]}
+            resultado[sistema] = {
+                'nominal': clases[codigo],
+                'probabilidades': probabilidades,
+                # La clase nominal se mantiene con el nivel de confianza pedido
+                'estable': probabilidades.get(clases[codigo], 0) >= self.nivel_confianza
+            }
+        return resultado
@@ -0,0 +1,276 @@
+"""
+Rejilla precalculada de clasificación SUCS / AASHTO sobre (finos, LL, IP)
+
+Cada celda de la rejilla guarda en uint8 el símbolo SUCS (para suelo con
+predominio de grava y de arena) y el grupo AASHTO, de modo que una consulta
+es aritmética de índices; el índice de grupo se calcula con su fórmula. Las celdas que cruzan alguna
+frontera de las reglas (línea A, LL = 50, límites de finos o de IP...) se
+marcan y esos puntos se evalúan con los motores exactos.
+
+Todas las reglas son semiespacios lineales en (finos, LL, IP), así que una
+celda cuyos 8 vértices coinciden en todas las condiciones tiene la misma
+clasificación en todo su interior.
+"""
+
+import hashlib
+import os
+import threading
+
+import numpy as np
+
+from ..nucleo import (SIMBOLOS_SUCS, GRUPOS_AASHTO, SIN_CLASIFICAR, clasificar_sucs_lote, clasificar_aashto_lote,
+                      indice_grupo)
+
+
+# Marca de celda que requiere evaluación exacta
+EXACTO = 254
+
+# Resolución por defecto: (inicio, fin, paso) de finos, LL e IP
+RESOLUCION_FINOS = (0.0, 100.0, 1.0)
+RESOLUCION_LL = (0.0, 120.0, 1.0)
+RESOLUCION_IP = (0.0, 80.0, 0.5)
+
+# Versión del formato en disco; cambia también si cambian las tablas de símbolos
+VERSION_REJILLA = 1
+
+
+def condiciones_sucs(finos, ll, ip):
+    """Condiciones atómicas de las reglas SUCS (sin gradación)"""
+    return [finos > 50, finos < 5, finos <= 12, ll < 50, ip > 7, ip >= 4, ip <= 7, ip > 0.73 * (ll - 20)]
+
+
+def condiciones_aashto(finos, ll, ip):
+    """Condiciones atómicas de las reglas AASHTO (sin tamices N° 10/N° 40)"""
+    return [finos <= 35, finos <= 25, finos <= 15, finos <= 10, ip <= 0, ip <= 6, ip <= 10, ll <= 40, ip <= ll - 30]
+
+
+def _cambia_en_celda(nodos):
+    """True en las celdas cuyos 8 vértices no tienen el mismo valor"""
+    minimo = maximo = nodos[:-1, :-1, :-1]
+    for di in (0, 1):
+        for dj in (0, 1):
+            for dk in (0, 1):
+                vertice = nodos[di:nodos.shape[0] - 1 + di, dj:nodos.shape[1] - 1 + dj, dk:nodos.shape[2] - 1 + dk]
+                minimo = np.minimum(minimo, vertice)
+                maximo = np.maximum(maximo, vertice)
+    return minimo != maximo
+
+
+class RejillaClasificacion:
+    """Tablas uint8 de clasificación por celda con consulta vectorizada"""
+
+    CAPAS = ('sucs_grava', 'sucs_arena', 'aashto')
+
+    def __init__(self, finos=RESOLUCION_FINOS, ll=RESOLUCION_LL, ip=RESOLUCION_IP, capas=None):
+        self.ejes = {'finos': tuple(map(float, finos)), 'll': tuple(map(float, ll)), 'ip': tuple(map(float, ip))}
+        self.capas = capas if capas is not None else self._construir()
+
+    @staticmethod
+    def _nodos(eje):
+        inicio, fin, paso = eje
+        return np.linspace(inicio, fin, int(round((fin - inicio) / paso)) + 1)
+
+    def _construir(self):
+        """Clasificar los nodos y resumir cada celda (o marcarla como EXACTO)"""
+        finos, ll, ip = np.meshgrid(*(self._nodos(e) for e in self.ejes.values()), indexing='ij')
+
+        def frontera(condiciones):
+            cambia = np.zeros(tuple(n - 1 for n in finos.shape), dtype=bool)
+            for condicion in condiciones:
+                cambia |= _cambia_en_celda(condicion.view(np.uint8))
+            return cambia
+
+        frontera_sucs = frontera(condiciones_sucs(finos, ll, ip))
+        frontera_aashto = frontera(condiciones_aashto(finos, ll, ip))
+
+        # Fuera de la frontera cualquier vértice representa a la celda
+        celda = lambda nodos: nodos[:-1, :-1, :-1]
+        return {
+            'sucs_grava': np.where(frontera_sucs, EXACTO, celda(clasificar_sucs_lote(1.0, 0.0, finos, ll, ip))).astype(np.uint8),
+            'sucs_arena': np.where(frontera_sucs, EXACTO, celda(clasificar_sucs_lote(0.0, 1.0, finos, ll, ip))).astype(np.uint8),
+            'aashto': np.where(frontera_aashto, EXACTO, celda(clasificar_aashto_lote(finos, ll, ip)[0])).astype(np.uint8)
+        }
+
+    def __len__(self):
+        return self.capas['aashto'].size
+
+    @property
+    def nbytes(self):
+        return sum(capa.nbytes for capa in self.capas.values())
+
+    def fraccion_exacta(self):
+        """Fracción de celdas que requieren evaluación exacta por capa"""
+        return {nombre: round(float((capa == EXACTO).mean()), 4) for nombre, capa in self.capas.items()}
+
+    def _celdas(self, finos, ll, ip):
+        """Índices de celda de cada punto y máscara de puntos dentro de la rejilla"""
+        indices = []
+        dentro = np.ones(finos.shape, dtype=bool)
+        for valores, (inicio, fin, paso), n in zip((finos, ll, ip), self.ejes.values(), self.capas['aashto'].shape):
+            with np.errstate(invalid='ignore'):
+                dentro &= (valores >= inicio) & (valores <= fin)
+                i = np.floor((valores - inicio) / paso)
+            indices.append(np.clip(np.nan_to_num(i), 0, n - 1).astype(np.intp))
+        return tuple(indices), dentro
+
+    def consultar(self, finos, ll, ip, grava_dominante=False, sistemas=('sucs', 'aashto')):
+        """
+        Clasificar muchos puntos con la rejilla (exacto en fronteras y fuera de rango)
+
+        Args:
+            finos, ll, ip: Arrays (o escalares) que se difunden entre sí
+            grava_dominante: True donde la grava supera a la arena (SUCS)
+            sistemas: Clasificaciones a devolver
+
+        Returns:
+            dict con arrays de códigos 'sucs', 'aashto' e 'indice_grupo', y
+            'exactos' (número de puntos evaluados con los motores exactos)
+        """
+        finos, ll, ip, grava = np.broadcast_arrays(
+            np.array(finos, dtype=np.float64), np.array(ll, dtype=np.float64),
+            np.array(ip, dtype=np.float64), np.array(grava_dominante, dtype=bool)
+        )
+        celdas, dentro = self._celdas(finos, ll, ip)
+        sin_datos = np.isnan(finos) | np.isnan(ll) | np.isnan(ip)
+        resultado = {}
+        exactos = np.zeros(finos.shape, dtype=bool)
+
+        if 'sucs' in sistemas:
+            sucs = np.where(grava, self.capas['sucs_grava'][celdas], self.capas['sucs_arena'][celdas])
+            revisar = ~dentro | (sucs == EXACTO)
+            if revisar.any():
+                g = grava[revisar].astype(np.float64)
+                sucs[revisar] = clasificar_sucs_lote(g, 1 - g, finos[revisar], ll[revisar], ip[revisar])
+            # Sin LL o IP el motor daría M/C o un suelo grueso sin finos: en el mapa, sin clasificar
+            resultado['sucs'] = np.where(sin_datos, SIN_CLASIFICAR, sucs).astype(np.uint8)
+            exactos |= revisar
+
+        if 'aashto' in sistemas:
+            aashto = self.capas['aashto'][celdas]
+            revisar = ~dentro | (aashto == EXACTO)
+            if revisar.any():
+                aashto[revisar] = clasificar_aashto_lote(finos[revisar], ll[revisar], ip[revisar])[0]
+            resultado['aashto'] = aashto
+            # El índice de grupo es una fórmula cerrada: más barato calcularlo que tabularlo
+            resultado['indice_grupo'] = np.where(sin_datos, 0, indice_grupo(finos, ll, ip)).astype(np.int64)
+            exactos |= revisar
+
+        resultado['exactos'] = int(exactos.sum())
+        return resultado
+
+    def guardar(self, ruta):
+        """Guardar la rejilla comprimida en disco"""
+        os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+        temporal = f"{ruta}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(temporal, ejes=np.array([self.ejes[e] for e in ('finos', 'll', 'ip')]), **self.capas)
+        os.replace(temporal, ruta)
+
+    @classmethod
+    def cargar(cls, ruta):
+        """Cargar una rejilla guardada con guardar()"""
+        with np.load(ruta) as archivo:
+            finos, ll, ip = (tuple(fila) for fila in archivo['ejes'].tolist())
+            capas = {nombre: archivo[nombre] for nombre in cls.CAPAS}
+        return cls(finos, ll, ip, capas=capas)
+
+
+def consultar_exacto(finos, ll, ip, grava_dominante=False, sistemas=('sucs', 'aashto')):
+    """Misma salida que RejillaClasificacion.consultar, evaluando siempre los motores exactos"""
+    finos, ll, ip, grava = np.broadcast_arrays(
+        np.array(finos, dtype=np.float64), np.array(ll, dtype=np.float64),
+        np.array(ip, dtype=np.float64), np.array(grava_dominante, dtype=bool)
+    )
+    resultado = {'exactos': int(finos.size)}
+    if 'sucs' in sistemas:
+        g = grava.astype(np.float64)
+        sucs = clasificar_sucs_lote(g, 1 - g, finos, ll, ip)
+        sin_datos = np.isnan(finos) | np.isnan(ll) | np.isnan(ip)
+        resultado['sucs'] = np.where(sin_datos, SIN_CLASIFICAR, sucs).astype(np.uint8)
+    if 'aashto' in sistemas:
+        resultado['aashto'], resultado['indice_grupo'] = clasificar_aashto_lote(finos, ll, ip)
+    return resultado
+
+
+def describir_consulta(consulta):
+    """
+    Convertir una consulta en listas planas de símbolos SUCS, grupos AASHTO e IG
+
+    Los puntos sin datos suficientes (SIN_CLASIFICAR) quedan como None.
+    """
+    salida = {}
+    if 'sucs' in consulta:
+        salida['sucs'] = [SIMBOLOS_SUCS[c][0] if c < len(SIMBOLOS_SUCS) else None
+                          for c in np.ravel(consulta['sucs']).tolist()]
+    if 'aashto' in consulta:
+        salida['aashto'] = [GRUPOS_AASHTO[c][0] if c < len(GRUPOS_AASHTO) else None
+                            for c in np.ravel(consulta['aashto']).tolist()]
+        salida['indice_grupo'] = np.ravel(consulta['indice_grupo']).tolist()
+    return salida
+
+
+def firma_rejilla(finos=RESOLUCION_FINOS, ll=RESOLUCION_LL, ip=RESOLUCION_IP):
+    """Identificador de una rejilla: resolución, versión y tablas de símbolos"""
+    contenido = repr((VERSION_REJILLA, finos, ll, ip, SIMBOLOS_SUCS, GRUPOS_AASHTO))
+    return hashlib.sha1(contenido.encode('utf-8')).hexdigest()[:16]
+
+
+def obtener_rejilla(directorio=None, finos=RESOLUCION_FINOS, ll=RESOLUCION_LL, ip=RESOLUCION_IP):
+    """
+    Cargar la rejilla desde disco o construirla (y guardarla) si no existe
+
+    Args:
+        directorio: Carpeta donde se guarda el .npz; None para no usar disco
+    """
+    ruta = None
+    if directorio:
+        ruta = os.path.join(directorio, f"rejilla-clasificacion-{firma_rejilla(finos, ll, ip)}.npz")
+        if os.path.exists(ruta):
+            try:
+                return RejillaClasificacion.cargar(ruta)
+            except Exception as e:
+                print(f"⚠️  Rejilla de clasificación ilegible, se reconstruye: {e}")
+
+    rejilla = RejillaClasificacion(finos, ll, ip)
+    if ruta:
+        try:
+            rejilla.guardar(ruta)
+        except OSError as e:
+            print(f"⚠️  No se pudo guardar la rejilla de clasificación: {e}")
+    return rejilla
+
+
+class CargadorRejilla:
+    """
+    Rejilla cargada bajo demanda: la primera consulta lanza su construcción
+    (o su lectura de disco) en segundo plano, sin pasar por la precarga
+    """
+
+    def __init__(self, directorio=None, **resolucion):
+        self.directorio = directorio
+        self.resolucion = resolucion
+        self.data = None
+        self._lock = threading.Lock()
+        self._hilo = None
+
+    def load_data(self):
+        """Obtener la rejilla, construyéndola si hace falta (bloquea)"""
+        with self._lock:
+            if self.data is None:
+                self.data = obtener_rejilla(self.directorio, **self.resolucion)
+            return self.data
+
+    def obtener(self):
+        """Rejilla si ya está lista; si no, lanzar su carga en segundo plano y devolver None"""
+        if self.data is None and self._hilo is None:
+            with self._lock:
+                if self._hilo is None:
+                    self._hilo = threading.Thread(target=self._cargar, name='hsgva-rejilla', daemon=True)
+                    self._hilo.start()
+        return self.data
+
+    def _cargar(self):
+        try:
+            rejilla = self.load_data()
+            print(f"✅ Rejilla de clasificación lista ({len(rejilla)} celdas)")
+        except Exception as e:
+            print(f"⚠️  Rejilla de clasificación no disponible, se usan los motores exactos: {str(e)}")
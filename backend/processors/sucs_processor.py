@@ -0,0 +1,86 @@
+"""
+Procesador de clasificación SUCS (ASTM D2487)
+
+El motor vectorizado vive en backend.nucleo.sucs; aquí se convierten sus
+códigos en símbolos, nombres y descripciones y se clasifican lotes de
+muestras recibidos como dicts.
+"""
+
+import numpy as np
+
+from ..nucleo.sucs import SIMBOLOS_SUCS, SIN_CLASIFICAR, clasificar_sucs_lote, errores_totales
+
+
+def _arreglo(valores):
+    """float64 con NaN en lugar de None"""
+    return np.array(valores, dtype=np.float64)
+
+
+def describir_sucs(codigos, finos=None, ll=None, ip=None, cu=None, cc=None):
+    """Convertir códigos SUCS en dicts con símbolo, nombre, descripción y tipo"""
+    codigos = np.atleast_1d(codigos)
+    valores = np.broadcast_arrays(*(np.atleast_1d(_arreglo(v)) for v in (finos, ll, ip, cu, cc)), codigos)[:-1]
+
+    salida = []
+    for i, codigo in enumerate(codigos.tolist()):
+        if codigo == SIN_CLASIFICAR:
+            salida.append(None)
+            continue
+        simbolo, nombre, tipo, plantilla = SIMBOLOS_SUCS[codigo]
+        campos = dict(zip(('finos', 'll', 'ip', 'cu', 'cc'), (float(v[i]) for v in valores)))
+        salida.append({
+            'simbolo': simbolo,
+            'nombre': nombre,
+            'descripcion': plantilla.format(**campos),
+            'tipo': tipo
+        })
+    return salida
+
+
+class SucsProcessor:
+    def clasificar_lote(self, muestras, validar_total=True):
+        """
+        Clasificar según SUCS una lista de muestras
+
+        Args:
+            muestras: Lista de dict con 'grava', 'arena', 'finos' y opcionalmente
+                      'id', 'll', 'ip', 'cu' y 'cc'
+            validar_total: Exigir que grava + arena + finos sumen 100 %
+
+        Returns:
+            list: Un dict por muestra con 'id', la clasificación y 'error'
+            (un valor no numérico se trata como dato faltante y se indica en
+            el 'error' de su muestra)
+        """
+        if not muestras:
+            raise ValueError("Se requiere al menos una muestra")
+
+        columnas = {campo: np.full(len(muestras), np.nan)
+                    for campo in ('grava', 'arena', 'finos', 'll', 'ip', 'cu', 'cc')}
+        invalidos = [None] * len(muestras)
+        for i, muestra in enumerate(muestras):
+            for campo, columna in columnas.items():
+                valor = muestra.get(campo)
+                if valor is None:
+                    continue
+                try:
+                    columna[i] = float(valor)
+                except (TypeError, ValueError):
+                    invalidos[i] = f"Valor no numérico en '{campo}': {valor}"
+        codigos = clasificar_sucs_lote(**columnas)
+
+        if validar_total:
+            errores = errores_totales(columnas['grava'], columnas['arena'], columnas['finos'])
+            codigos[errores != ''] = SIN_CLASIFICAR
+        else:
+            errores = np.full(len(muestras), '', dtype=object)
+
+        descripciones = describir_sucs(codigos, columnas['finos'], columnas['ll'], columnas['ip'],
+                                       columnas['cu'], columnas['cc'])
+        resultados = []
+        for i, (muestra, descripcion) in enumerate(zip(muestras, descripciones)):
+            resultado = {'id': muestra.get('id', i + 1),
+                         'error': invalidos[i] or errores[i] or (None if descripcion else "Se requieren grava, arena y finos")}
+            resultado.update(descripcion or {})
+            resultados.append(resultado)
+        return resultados
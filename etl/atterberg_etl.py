@@ -7,6 +7,11 @@ import numpy as np
 from datetime import datetime
 import os
 
+from backend.nucleo import (SIN_ERROR, ajustar_fluidez, limite_plastico, indice_plasticidad,
+                            clase_plasticidad)
+from backend.processors.carta_plasticidad import CartaPlasticidad
+from .workbook import LazyWorkbook
+
 
 class AtterbergETL:
     """Clase para procesar datos de límites de Atterberg"""
@@ -15,47 +20,42 @@ class AtterbergETL:
         self.filepath = filepath
         self.data = None
         self.metadata = {}
+        self.timings = {}
+        
+    def extract(self, sheet_names=None):
+        """
+        Extraer datos del archivo Excel
         
-    def extract(self):
-        """Extraer datos del archivo Excel"""
+        El libro se abre una sola vez; cada hoja se parsea y limpia desde ese
+        handle la primera vez que se accede. Los tiempos por hoja quedan en
+        self.timings.
+        """
         try:
-            excel_file = pd.ExcelFile(self.filepath)
-            sheets = {}
-            
-            for sheet_name in excel_file.sheet_names:
-                df = pd.read_excel(self.filepath, sheet_name=sheet_name)
-                sheets[sheet_name] = df
-            
-            self.data = sheets
+            self.data = LazyWorkbook(self.filepath, sheet_names, on_load=self._register_metadata)
+            self.timings = self.data.timings
             return True
         except Exception as e:
             print(f"Error al extraer datos de Atterberg: {e}")
             return False
     
     def transform(self):
-        """Transformar y limpiar los datos"""
+        """Transformar y limpiar los datos (materializa todas las hojas)"""
         if not self.data:
             return False
         
         try:
-            transformed_data = {}
-            
-            for sheet_name, df in self.data.items():
-                df_clean = df.dropna(how='all')
-                df_clean = df_clean.dropna(axis=1, how='all')
-                
-                metadata = self._extract_metadata(df_clean)
-                if metadata:
-                    self.metadata[sheet_name] = metadata
-                
-                transformed_data[sheet_name] = df_clean
-            
-            self.data = transformed_data
+            self.data.load_all()
             return True
         except Exception as e:
             print(f"Error al transformar datos: {e}")
             return False
     
+    def _register_metadata(self, sheet_name, df):
+        """Registrar metadatos de una hoja al materializarla"""
+        metadata = self._extract_metadata(df)
+        if metadata:
+            self.metadata[sheet_name] = metadata
+    
     def _extract_metadata(self, df):
         """Extraer metadatos del dataframe"""
         metadata = {}
@@ -73,8 +73,12 @@ class AtterbergETL:
         
         return metadata
     
-    def process(self):
-        """Proceso ETL completo"""
+    def process(self, sheet_names=None, columns=None):
+        """
+        Proceso ETL completo
+        
+        Solo se parsean y convierten a JSON las hojas (y columnas) solicitadas.
+        """
         if not os.path.exists(self.filepath):
             return {
                 'error': 'Archivo no encontrado',
@@ -82,26 +86,40 @@ class AtterbergETL:
                 'data': None
             }
         
-        if self.extract() and self.transform():
-            return {
-                'success': True,
-                'filepath': self.filepath,
-                'sheets': list(self.data.keys()),
-                'metadata': self.metadata,
-                'data': self._prepare_for_json()
-            }
-        else:
-            return {
-                'error': 'Error en el proceso ETL',
-                'filepath': self.filepath,
-                'data': None
-            }
+        if self.extract(sheet_names):
+            try:
+                json_data = self._prepare_for_json(columns)
+            except Exception as e:
+                print(f"Error al transformar datos: {e}")
+                json_data = None
+            finally:
+                self.data.close()
+            
+            if json_data is not None:
+                return {
+                    'success': True,
+                    'filepath': self.filepath,
+                    'sheets': list(self.data.keys()),
+                    'metadata': self.metadata,
+                    'timings': self.timings,
+                    'data': json_data
+                }
+        
+        return {
+            'error': 'Error en el proceso ETL',
+            'filepath': self.filepath,
+            'data': None
+        }
     
-    def _prepare_for_json(self):
+    def _prepare_for_json(self, columns=None):
         """Preparar datos para serialización JSON"""
         json_data = {}
         
-        for sheet_name, df in self.data.items():
+        for sheet_name in self.data:
+            df = self.data[sheet_name]
+            if columns is not None:
+                df = df[[col for col in columns if col in df.columns]]
+            
             json_data[sheet_name] = df.to_dict(orient='records')
         
         return json_data
@@ -133,7 +151,7 @@ class AtterbergETL:
         
         # Calcular Índice de Plasticidad (IP)
         if result['limite_liquido'] and result['limite_plastico']:
-            result['indice_plasticidad'] = result['limite_liquido'] - result['limite_plastico']
+            result['indice_plasticidad'] = round(float(indice_plasticidad(result['limite_liquido'], result['limite_plastico'])), 2)
             result['clasificacion'] = self._classify_plasticity(result['indice_plasticidad'])
         
         result['timestamp'] = datetime.now().isoformat()
@@ -150,21 +168,12 @@ class AtterbergETL:
         if not ll_data or len(ll_data) < 2:
             return None
         
-        # Convertir a arrays numpy
-        golpes = np.array([point[0] for point in ll_data])
-        humedad = np.array([point[1] for point in ll_data])
-        
-        # Realizar regresión logarítmica
-        # w = a - b * log(N)
-        log_golpes = np.log10(golpes)
-        
-        # Ajuste lineal en escala log
-        coeffs = np.polyfit(log_golpes, humedad, 1)
-        
-        # Calcular humedad a 25 golpes
-        ll = coeffs[0] * np.log10(25) + coeffs[1]
+        # Recta de fluidez del núcleo compartido (mínimos cuadrados en log N)
+        ajuste = ajustar_fluidez([[point[0] for point in ll_data]], [[point[1] for point in ll_data]])
+        if ajuste['error'][0] != SIN_ERROR:
+            return None
         
-        return round(ll, 2)
+        return round(float(ajuste['limite_liquido'][0]), 2)
     
     def _calculate_plastic_limit(self, lp_data):
         """
@@ -174,52 +183,27 @@ class AtterbergETL:
         if not lp_data:
             return None
         
-        lp = np.mean(lp_data)
-        
-        return round(lp, 2)
+        return float(round(limite_plastico([lp_data])[0], 2))
     
     def _classify_plasticity(self, ip):
         """Clasificar según índice de plasticidad"""
         
-        if ip == 0:
-            return 'No plástico'
-        elif 0 < ip < 7:
-            return 'Baja plasticidad'
-        elif 7 <= ip < 17:
-            return 'Media plasticidad'
-        else:
-            return 'Alta plasticidad'
+        return ['No plástico', 'Baja plasticidad', 'Media plasticidad', 'Alta plasticidad'][int(clase_plasticidad(ip))]
     
-    def get_plasticity_chart_data(self):
+    def get_plasticity_chart_data(self, points=None):
         """
         Obtener datos para carta de plasticidad de Casagrande
+        
+        La geometría se construye una sola vez (backend.processors.carta_plasticidad);
+        si se dan puntos (LL, IP) se clasifican en la misma pasada.
         """
         
-        # Línea A: IP = 0.73(LL - 20)
-        ll_range = np.linspace(0, 100, 100)
-        linea_a = 0.73 * (ll_range - 20)
-        linea_a[linea_a < 0] = 0
+        chart = CartaPlasticidad()
+        chart_data = chart.geometria()
         
-        # Línea U: IP = 0.9(LL - 8)
-        linea_u = 0.9 * (ll_range - 8)
-        linea_u[linea_u < 0] = 0
-        
-        chart_data = {
-            'linea_a': {
-                'll': ll_range.tolist(),
-                'ip': linea_a.tolist()
-            },
-            'linea_u': {
-                'll': ll_range.tolist(),
-                'ip': linea_u.tolist()
-            },
-            'regiones': {
-                'CL': {'ll_min': 0, 'll_max': 50, 'descripcion': 'Arcillas de baja plasticidad'},
-                'ML': {'ll_min': 0, 'll_max': 50, 'descripcion': 'Limos de baja plasticidad'},
-                'CH': {'ll_min': 50, 'll_max': 100, 'descripcion': 'Arcillas de alta plasticidad'},
-                'MH': {'ll_min': 50, 'll_max': 100, 'descripcion': 'Limos de alta plasticidad'}
-            }
-        }
+        if points:
+            ll, ip = zip(*points)
+            chart_data['puntos'] = chart.clasificar(ll, ip)
         
         return chart_data
     
@@ -234,9 +218,11 @@ class AtterbergETL:
         golpes = np.array([point[0] for point in ll_data])
         humedad = np.array([point[1] for point in ll_data])
         
-        # Generar curva suavizada
-        log_golpes = np.log10(golpes)
-        coeffs = np.polyfit(log_golpes, humedad, 1)
+        # Generar curva suavizada con la recta de fluidez del núcleo
+        ajuste = ajustar_fluidez([golpes], [humedad])
+        if ajuste['error'][0] != SIN_ERROR:
+            return None
+        coeffs = (float(ajuste['pendiente'][0]), float(ajuste['intercepto'][0]))
         
         # Generar puntos para la curva
         golpes_curve = np.logspace(np.log10(10), np.log10(50), 50)
@@ -255,5 +241,5 @@ class AtterbergETL:
                 'slope': float(coeffs[0]),
                 'intercept': float(coeffs[1])
             },
-            'limite_liquido_25': float(coeffs[0] * np.log10(25) + coeffs[1])
+            'limite_liquido_25': float(ajuste['limite_liquido'][0])
         }
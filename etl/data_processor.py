@@ -8,13 +8,15 @@ from datetime import datetime, timedelta
 import json
 import os
 
+from backend.nucleo import (MENSAJES_ERROR_HUMEDAD, CLASIFICACIONES_HUMEDAD, SIN_ERROR,
+                            contenido_humedad, errores_humedad, clase_humedad, resolver_fases)
+
 
 class DataProcessor:
     """Clase para procesamiento general de datos"""
     
     def __init__(self):
         self.projects_data = []
-        self.cache = {}
     
     def get_dashboard_kpis(self):
         """Obtener KPIs para el dashboard"""
@@ -128,30 +130,13 @@ class DataProcessor:
             peso_humedo = float(data.get('peso_humedo', 0))
             peso_seco = float(data.get('peso_seco', 0))
             
-            # Validaciones
-            if peso_humedo <= peso_recipiente:
-                return {'error': 'El peso húmedo debe ser mayor que el peso del recipiente'}
-            
-            if peso_seco <= peso_recipiente:
-                return {'error': 'El peso seco debe ser mayor que el peso del recipiente'}
-            
-            if peso_seco > peso_humedo:
-                return {'error': 'El peso seco debe ser menor que el peso húmedo'}
+            # Validaciones y cálculos del núcleo compartido
+            error = int(errores_humedad(peso_recipiente, peso_humedo, peso_seco))
+            if error != SIN_ERROR:
+                return {'error': MENSAJES_ERROR_HUMEDAD[error]}
             
-            # Cálculos
-            peso_agua = peso_humedo - peso_seco
-            peso_suelo_seco = peso_seco - peso_recipiente
-            humedad = (peso_agua / peso_suelo_seco) * 100
-            
-            # Clasificación
-            if humedad < 10:
-                clasificacion = 'Muy Seco'
-            elif humedad < 20:
-                clasificacion = 'Seco'
-            elif humedad < 30:
-                clasificacion = 'Húmedo'
-            else:
-                clasificacion = 'Muy Húmedo'
+            humedad, peso_agua, peso_suelo_seco = (float(v) for v in contenido_humedad(peso_recipiente, peso_humedo, peso_seco))
+            clasificacion = CLASIFICACIONES_HUMEDAD[clase_humedad(humedad)]
             
             return {
                 'success': True,
@@ -190,26 +175,17 @@ class DataProcessor:
             if Wt <= 0 or Vt <= 0:
                 return {'error': 'Los valores deben ser mayores a cero'}
             
-            # Cálculos de pesos
-            Ws = Wt / (1 + w)  # Peso de sólidos
-            Ww = Wt - Ws  # Peso del agua
-            
-            # Cálculos de volúmenes
-            gamma_w = 1.0  # Densidad del agua (g/cm³)
-            Vs = Ws / (Gs * gamma_w)  # Volumen de sólidos
-            Vw = Ww / gamma_w  # Volumen de agua
-            Vv = Vt - Vs  # Volumen de vacíos
-            Va = Vv - Vw  # Volumen de aire
-            
-            # Relaciones volumétricas
-            e = Vv / Vs  # Relación de vacíos
-            n = Vv / Vt * 100  # Porosidad (%)
-            S = Vw / Vv * 100  # Grado de saturación (%)
+            # Todas las magnitudes con el resolvedor de fases del núcleo
+            fases = {nombre: float(valor[0]) for nombre, valor in resolver_fases({
+                'peso_total': [Wt], 'volumen_total': [Vt], 'humedad': [w], 'gravedad_especifica': [Gs]
+            }).items()}
             
-            # Relaciones gravimétricas
-            gamma = Wt / Vt  # Densidad total (g/cm³)
-            gamma_d = Ws / Vt  # Densidad seca (g/cm³)
-            gamma_sat = (Ws + Vv * gamma_w) / Vt  # Densidad saturada (g/cm³)
+            Ws, Ww = fases['peso_solidos'], fases['peso_agua']
+            Vs, Vv, Vw, Va = (fases[f'volumen_{v}'] for v in ('solidos', 'vacios', 'agua', 'aire'))
+            e = fases['relacion_vacios']
+            n = fases['porosidad'] * 100  # Porosidad (%)
+            S = fases['saturacion'] * 100  # Grado de saturación (%)
+            gamma, gamma_d, gamma_sat = fases['densidad'], fases['densidad_seca'], fases['densidad_saturada']
             
             return {
                 'success': True,
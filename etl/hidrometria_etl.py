@@ -7,6 +7,9 @@ import numpy as np
 from datetime import datetime
 import os
 
+from backend.processors.hidrometria_processor import HidrometriaProcessor
+from .workbook import LazyWorkbook
+
 
 class HidrometriaETL:
     """Clase para procesar datos de ensayo de hidrometría"""
@@ -15,50 +18,42 @@ class HidrometriaETL:
         self.filepath = filepath
         self.data = None
         self.metadata = {}
+        self.timings = {}
+        
+    def extract(self, sheet_names=None):
+        """
+        Extraer datos del archivo Excel
         
-    def extract(self):
-        """Extraer datos del archivo Excel"""
+        El libro se abre una sola vez; cada hoja se parsea y limpia desde ese
+        handle la primera vez que se accede. Los tiempos por hoja quedan en
+        self.timings.
+        """
         try:
-            # Leer todas las hojas del archivo
-            excel_file = pd.ExcelFile(self.filepath)
-            sheets = {}
-            
-            for sheet_name in excel_file.sheet_names:
-                df = pd.read_excel(self.filepath, sheet_name=sheet_name)
-                sheets[sheet_name] = df
-            
-            self.data = sheets
+            self.data = LazyWorkbook(self.filepath, sheet_names, on_load=self._register_metadata)
+            self.timings = self.data.timings
             return True
         except Exception as e:
             print(f"Error al extraer datos de hidrometría: {e}")
             return False
     
     def transform(self):
-        """Transformar y limpiar los datos"""
+        """Transformar y limpiar los datos (materializa todas las hojas)"""
         if not self.data:
             return False
         
         try:
-            transformed_data = {}
-            
-            for sheet_name, df in self.data.items():
-                # Limpiar datos
-                df_clean = df.dropna(how='all')  # Eliminar filas completamente vacías
-                df_clean = df_clean.dropna(axis=1, how='all')  # Eliminar columnas completamente vacías
-                
-                # Extraer metadatos si están en las primeras filas
-                metadata = self._extract_metadata(df_clean)
-                if metadata:
-                    self.metadata[sheet_name] = metadata
-                
-                transformed_data[sheet_name] = df_clean
-            
-            self.data = transformed_data
+            self.data.load_all()
             return True
         except Exception as e:
             print(f"Error al transformar datos: {e}")
             return False
     
+    def _register_metadata(self, sheet_name, df):
+        """Registrar metadatos de una hoja al materializarla"""
+        metadata = self._extract_metadata(df)
+        if metadata:
+            self.metadata[sheet_name] = metadata
+    
     def _extract_metadata(self, df):
         """Extraer metadatos del dataframe"""
         metadata = {}
@@ -82,8 +77,12 @@ class HidrometriaETL:
         """Cargar datos procesados"""
         return self.data
     
-    def process(self):
-        """Proceso ETL completo"""
+    def process(self, sheet_names=None, columns=None):
+        """
+        Proceso ETL completo
+        
+        Solo se parsean y convierten a JSON las hojas (y columnas) solicitadas.
+        """
         if not os.path.exists(self.filepath):
             return {
                 'error': 'Archivo no encontrado',
@@ -91,36 +90,61 @@ class HidrometriaETL:
                 'data': None
             }
         
-        if self.extract() and self.transform():
-            return {
-                'success': True,
-                'filepath': self.filepath,
-                'sheets': list(self.data.keys()),
-                'metadata': self.metadata,
-                'data': self._prepare_for_json()
-            }
-        else:
-            return {
-                'error': 'Error en el proceso ETL',
-                'filepath': self.filepath,
-                'data': None
-            }
+        if self.extract(sheet_names):
+            try:
+                json_data = self._prepare_for_json(columns)
+            except Exception as e:
+                print(f"Error al transformar datos: {e}")
+                json_data = None
+            finally:
+                self.data.close()
+            
+            if json_data is not None:
+                return {
+                    'success': True,
+                    'filepath': self.filepath,
+                    'sheets': list(self.data.keys()),
+                    'metadata': self.metadata,
+                    'timings': self.timings,
+                    'data': json_data
+                }
+        
+        return {
+            'error': 'Error en el proceso ETL',
+            'filepath': self.filepath,
+            'data': None
+        }
     
-    def _prepare_for_json(self):
+    def _prepare_for_json(self, columns=None):
         """Preparar datos para serialización JSON"""
         json_data = {}
         
-        for sheet_name, df in self.data.items():
-            # Convertir DataFrame a diccionario
+        for sheet_name in self.data:
+            df = self.data[sheet_name]
+            if columns is not None:
+                df = df[[col for col in columns if col in df.columns]]
+            
             json_data[sheet_name] = df.to_dict(orient='records')
         
         return json_data
     
-    def get_analysis(self):
-        """Obtener análisis de los datos de hidrometría"""
-        if not self.data:
-            self.process()
+    def get_analysis(self, sheet_names=None):
+        """
+        Obtener análisis de los datos de hidrometría
         
+        Las estadísticas se calculan directamente sobre los DataFrames de las
+        hojas solicitadas, sin convertirlos a registros JSON.
+        """
+        # Reutilizar la extracción previa solo si contiene las hojas pedidas
+        if not self.data or not set(sheet_names or []).issubset(self.data):
+            # Si falla (archivo u hojas inexistentes) self.data sigue siendo la extracción anterior
+            if not self.extract(sheet_names):
+                return {
+                    'error': 'Error al extraer datos de hidrometría',
+                    'filepath': self.filepath,
+                    'data': None
+                }
+
         analysis = {
             'total_sheets': len(self.data) if self.data else 0,
             'summary': {},
@@ -128,29 +152,42 @@ class HidrometriaETL:
         }
         
         if self.data:
-            for sheet_name, df in self.data.items():
-                analysis['summary'][sheet_name] = {
-                    'rows': len(df),
-                    'columns': len(df.columns),
-                    'column_names': df.columns.tolist()
-                }
-                
-                # Calcular estadísticas básicas para columnas numéricas
-                numeric_cols = df.select_dtypes(include=[np.number]).columns
-                if len(numeric_cols) > 0:
-                    analysis['statistics'][sheet_name] = df[numeric_cols].describe().to_dict()
+            try:
+                for sheet_name in (sheet_names or self.data):
+                    df = self.data[sheet_name]
+                    analysis['summary'][sheet_name] = {
+                        'rows': len(df),
+                        'columns': len(df.columns),
+                        'column_names': df.columns.tolist()
+                    }
+                    
+                    # Calcular estadísticas básicas para columnas numéricas
+                    numeric_cols = df.select_dtypes(include=[np.number]).columns
+                    if len(numeric_cols) > 0:
+                        analysis['statistics'][sheet_name] = df[numeric_cols].describe().to_dict()
+            finally:
+                self.data.close()
         
         return analysis
     
     def calculate_grain_size_distribution(self, data):
-        """Calcular distribución granulométrica"""
-        # Implementar cálculos específicos de hidrometría
-        # (se puede expandir según los datos específicos del Excel)
+        """
+        Calcular distribución granulométrica por la ley de Stokes
+        
+        Args:
+            data: dict con 'lecturas' [{t_min, temperatura, lr}], 'gs', 'ws' y
+                  opcionalmente 'cm', 'cc' y 'alfa'; o {'muestras': [...]}
+                  para reducir varias muestras a la vez
+        """
+        processor = HidrometriaProcessor()
+        muestras = data['muestras'] if 'muestras' in data else [data]
+        resultados = processor.calcular_distribucion_lote(muestras)
         
         result = {
             'calculated': True,
             'method': 'hidrometria',
-            'timestamp': datetime.now().isoformat()
+            'timestamp': datetime.now().isoformat(),
+            'resultados': resultados
         }
         
         return result
@@ -0,0 +1,89 @@
+"""
+Lectura perezosa de libros Excel: un único handle y hojas bajo demanda
+"""
+
+import time
+from collections.abc import Mapping
+
+import pandas as pd
+
+
+def clean_sheet(df):
+    """
+    Eliminar filas y columnas completamente vacías en una sola pasada
+
+    Equivale a dropna(how='all') seguido de dropna(axis=1, how='all'), pero
+    calcula la máscara de valores una única vez.
+    """
+    mask = df.notna().to_numpy()
+    return df.iloc[mask.any(axis=1), mask.any(axis=0)]
+
+
+class LazyWorkbook(Mapping):
+    """
+    Hojas de un libro Excel que se parsean y limpian solo al accederlas
+
+    Se comporta como un diccionario {hoja: DataFrame limpio}; cada hoja se
+    materializa una vez desde un único handle del libro.
+    """
+
+    def __init__(self, filepath, sheet_names=None, on_load=None):
+        self.filepath = filepath
+        self.timings = {}
+        self._on_load = on_load
+        self._sheets = {}
+        self._excel_file = None
+
+        excel_file = self._open()
+        if sheet_names is None:
+            self._sheet_names = list(excel_file.sheet_names)
+        else:
+            missing = [name for name in sheet_names if name not in excel_file.sheet_names]
+            if missing:
+                self.close()
+                raise ValueError(f"Hojas no encontradas en {filepath}: {missing}")
+            self._sheet_names = list(sheet_names)
+
+    def _open(self):
+        if self._excel_file is None:
+            start = time.perf_counter()
+            self._excel_file = pd.ExcelFile(self.filepath)
+            self.timings['_open'] = round(time.perf_counter() - start, 6)
+        return self._excel_file
+
+    def __getitem__(self, sheet_name):
+        if sheet_name not in self._sheets:
+            if sheet_name not in self._sheet_names:
+                raise KeyError(sheet_name)
+
+            start = time.perf_counter()
+            df = clean_sheet(self._open().parse(sheet_name))
+            self.timings[sheet_name] = round(time.perf_counter() - start, 6)
+            self._sheets[sheet_name] = df
+
+            if self._on_load is not None:
+                self._on_load(sheet_name, df)
+
+        return self._sheets[sheet_name]
+
+    def __iter__(self):
+        return iter(self._sheet_names)
+
+    def __len__(self):
+        return len(self._sheet_names)
+
+    def load_all(self):
+        """Materializar todas las hojas pendientes"""
+        for sheet_name in self._sheet_names:
+            self[sheet_name]
+        return dict(self._sheets)
+
+    def is_loaded(self, sheet_name):
+        """Indicar si la hoja ya fue materializada"""
+        return sheet_name in self._sheets
+
+    def close(self):
+        """Cerrar el handle del libro (las hojas ya cargadas se conservan)"""
+        if self._excel_file is not None:
+            self._excel_file.close()
+            self._excel_file = None
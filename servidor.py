@@ -0,0 +1,163 @@
+"""
+Servidor de producción del Sistema de Análisis Geotécnico - HSGVA
+
+Arranca gunicorn con varios procesos worker e hilos por worker. app.py y los
+datasets de Data/ (también los que las rutas derivan de ellos) se cargan una
+sola vez en el proceso maestro antes del fork, así que los workers los
+comparten por copy-on-write en lugar de parsear cada uno los libros Excel.
+Cuando cambia un libro de Data/, el maestro vuelve a cargarlo y se envía
+SIGHUP a gunicorn, que levanta workers nuevos con los datos frescos y retira
+los antiguos al terminar sus peticiones.
+
+Sin gunicorn (p. ej. en Windows) se usa el servidor de Werkzeug con hilos,
+sin modo depuración y con la recarga de datos en el mismo proceso.
+
+Uso:
+    python servidor.py
+
+Variables de entorno:
+    HSGVA_HOST      Dirección de escucha (0.0.0.0)
+    HSGVA_PUERTO    Puerto (5000)
+    HSGVA_WORKERS   Procesos worker (2 × CPUs + 1)
+    HSGVA_THREADS   Hilos por worker (4)
+    HSGVA_TIMEOUT   Segundos antes de reiniciar un worker bloqueado (120)
+    HSGVA_RECARGA   Segundos entre comprobaciones de Data/ (5; 0 = sin recarga)
+"""
+
+import gc
+import os
+import signal
+
+from backend.etl.vigilante import VigilanteDatos, INTERVALO_RECARGA
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:
+    BaseApplication = None
+
+
+def configuracion():
+    """Parámetros del servidor desde las variables de entorno"""
+    return {
+        'host': os.environ.get('HSGVA_HOST', '0.0.0.0'),
+        'puerto': int(os.environ.get('HSGVA_PUERTO', 5000)),
+        'workers': int(os.environ.get('HSGVA_WORKERS', 2 * (os.cpu_count() or 1) + 1)),
+        'threads': int(os.environ.get('HSGVA_THREADS', 4)),
+        'timeout': int(os.environ.get('HSGVA_TIMEOUT', 120)),
+        'recarga': float(os.environ.get('HSGVA_RECARGA', INTERVALO_RECARGA))
+    }
+
+
+def cargar_aplicacion():
+    """Importar app.py y esperar a que terminen de cargar todos los datasets"""
+    import app as modulo
+
+    print("⏳ Cargando datasets antes de atender peticiones...")
+    modulo.warmup.esperar()
+    preparar_derivados(modulo)
+    return modulo
+
+
+def preparar_derivados(modulo):
+    """
+    Construir en el maestro los datasets que las rutas calculan bajo demanda
+
+    Las lecturas tipadas, la humedad, los tamices por muestra y la rejilla
+    de clasificación no forman parte de la precarga; sin este paso cada
+    worker volvería a parsearlos (o a construir la rejilla) tras el fork.
+    """
+    derivados = [
+        ('Lecturas de hidrometría', modulo.hidrometria_etl.get_lecturas),
+        ('Humedad', modulo.hidrometria_etl.get_humedad_data),
+        ('Tamices por muestra', modulo.clasificacion_etl.get_tamices_por_muestra),
+        ('Rejilla de clasificación', modulo.rejilla_clasificacion.load_data)
+    ]
+    for etiqueta, funcion in derivados:
+        try:
+            funcion()
+        except Exception as e:
+            print(f"⚠️  {etiqueta}: no se pudo preparar ({str(e)})")
+    print(f"✅ Datasets derivados listos ({modulo.datasets.estadisticas()['entradas']} en caché)")
+
+
+def datasets_afectados(modulo, rutas):
+    """Datasets de la precarga cuyos libros están entre las rutas cambiadas"""
+    libros = {
+        'hidrometria': modulo.hidrometria_etl.filepath,
+        'clasificacion': modulo.clasificacion_etl.filepath,
+        'atterberg': modulo.atterberg_etl.filepath
+    }
+    cambiadas = {os.path.abspath(r) for r in rutas}
+    return [nombre for nombre, ruta in libros.items() if os.path.abspath(ruta) in cambiadas]
+
+
+def recargar_datos(modulo, rutas):
+    """Recargar los datasets afectados; devuelve False si ninguno lo estaba"""
+    nombres = datasets_afectados(modulo, rutas)
+    if not nombres:
+        return False
+    modulo.warmup.recargar(*nombres)
+    preparar_derivados(modulo)
+    return True
+
+
+if BaseApplication is not None:
+    class ServidorHSGVA(BaseApplication):
+        """Aplicación gunicorn con app.py precargada en el maestro"""
+
+        def __init__(self, conf):
+            self.conf = conf
+            self.modulo = None
+            super().__init__()
+
+        def load_config(self):
+            opciones = {
+                'bind': f"{self.conf['host']}:{self.conf['puerto']}",
+                'workers': self.conf['workers'],
+                'threads': self.conf['threads'],
+                'worker_class': 'gthread' if self.conf['threads'] > 1 else 'sync',
+                'timeout': self.conf['timeout'],
+                'graceful_timeout': self.conf['timeout'],
+                'preload_app': True,
+                'when_ready': self.al_iniciar
+            }
+            for clave, valor in opciones.items():
+                self.cfg.set(clave, valor)
+
+        def load(self):
+            # Con preload_app gunicorn llama a load() una sola vez, en el maestro
+            if self.modulo is None:
+                self.modulo = cargar_aplicacion()
+                # Los objetos ya cargados pasan a la generación permanente: el
+                # GC de los workers no escribe en ellos y sus páginas siguen
+                # compartidas
+                gc.freeze()
+            return self.modulo.app
+
+        def al_iniciar(self, arbitro):
+            """Vigilar Data/ desde el maestro una vez que los workers arrancaron"""
+            def al_cambiar(rutas):
+                if recargar_datos(self.modulo, rutas):
+                    gc.freeze()
+                    # Workers nuevos desde el maestro actualizado; los viejos terminan lo que tienen
+                    os.kill(arbitro.pid, signal.SIGHUP)
+
+            if VigilanteDatos(self.modulo.DATA_DIR, al_cambiar, self.conf['recarga']).iniciar():
+                print(f"👀 Recarga de datos activa: Data/ se revisa cada {self.conf['recarga']:g} s")
+
+
+def servir_werkzeug(conf):
+    """Servidor de respaldo en un solo proceso cuando gunicorn no está instalado"""
+    modulo = cargar_aplicacion()
+    VigilanteDatos(modulo.DATA_DIR, lambda rutas: recargar_datos(modulo, rutas), conf['recarga']).iniciar()
+    modulo.app.run(host=conf['host'], port=conf['puerto'], debug=False, threaded=True, use_reloader=False)
+
+
+if __name__ == '__main__':
+    conf = configuracion()
+    if BaseApplication is None:
+        print("⚠️  gunicorn no está disponible: se usa el servidor de Werkzeug (un proceso, con hilos)")
+        servir_werkzeug(conf)
+    else:
+        print(f"🚀 gunicorn: {conf['workers']} workers × {conf['threads']} hilos en {conf['host']}:{conf['puerto']}")
+        ServidorHSGVA(conf).run()
@@ -0,0 +1,215 @@
+"""
+Script para comprobar el clasificador AASHTO vectorizado
+
+Compara el motor de backend/nucleo/aashto.py con las dos
+implementaciones escalares que reemplaza (ClasificacionProcessor y el ETL
+legado), copiadas aquí tal como estaban, sobre una rejilla densa de F200,
+LL e IP, y mide el tiempo de reclasificar un proyecto grande.
+"""
+
+import time
+from collections import Counter
+
+import numpy as np
+
+from backend.processors.aashto_processor import AashtoProcessor, clasificar_aashto_lote, describir_aashto
+
+
+def referencia_processor(F, LL, IP):
+    """ClasificacionProcessor.clasificar_aashto antes del motor vectorizado"""
+    if F <= 35:
+        IG = 0
+    else:
+        a = max(0, F - 35)
+        b = max(0, F - 15)
+        c = max(0, LL - 40)
+        d = max(0, IP - 10)
+        IG = (a * 0.2) + (0.005 * a * c) + (0.01 * b * d)
+        IG = max(0, min(20, round(IG)))
+
+    if F <= 35:
+        if F <= 15 and IP <= 6:
+            grupo, descripcion = 'A-1-a', 'Fragmentos de roca, grava y arena'
+        elif F <= 25 and IP <= 6:
+            grupo, descripcion = 'A-1-b', 'Grava y arena'
+        elif F <= 10 and IP == 0:
+            grupo, descripcion = 'A-3', 'Arena fina'
+        elif IP <= 10:
+            grupo, descripcion = 'A-2-4', 'Grava y arena limosa o arcillosa'
+        else:
+            grupo, descripcion = 'A-2-7', 'Grava y arena arcillosa'
+    elif LL <= 40:
+        grupo, descripcion = ('A-4', 'Suelos limosos') if IP <= 10 else ('A-6', 'Suelos arcillosos')
+    elif IP <= 10:
+        grupo, descripcion = 'A-5', 'Suelos limosos elásticos'
+    else:
+        grupo = 'A-7-5' if IP <= (LL - 30) else 'A-7-6'
+        descripcion = 'Suelos arcillosos elásticos'
+
+    if IG == 0:
+        calificacion = 'Excelente a Bueno'
+    elif IG <= 4:
+        calificacion = 'Bueno a Regular'
+    elif IG <= 8:
+        calificacion = 'Regular a Malo'
+    else:
+        calificacion = 'Malo'
+
+    return {
+        'grupo': f"{grupo} ({int(IG)})" if IG > 0 else grupo,
+        'indice_grupo': int(IG),
+        'descripcion': descripcion,
+        'calificacion': calificacion
+    }
+
+
+def referencia_legado(f, ll, ip):
+    """etl.clasificacion_etl.classify_aashto antes del motor vectorizado: (grupo, IG)"""
+    if f <= 35:
+        ig = 0
+    else:
+        term1 = (f - 35) * (0.2 + 0.005 * (ll - 40)) if ll > 40 else 0
+        term2 = 0.01 * (f - 15) * (ip - 10) if f > 15 and ip > 10 else 0
+        ig = int(max(0, min(20, round(term1 + term2))))
+
+    if f <= 35:
+        if f <= 15:
+            grupo = 'A-1-a' if ll == 0 and ip == 0 else 'A-1-b'
+        elif f <= 25:
+            grupo = 'A-2-4' if ll <= 40 else 'A-2-6'
+        else:
+            grupo = 'A-3'
+    elif ll <= 40:
+        grupo = 'A-4' if ip <= 10 else 'A-5'
+    elif ip <= 10:
+        grupo = 'A-6'
+    else:
+        grupo = 'A-7-5' if ip <= (ll - 30) else 'A-7-6'
+    return grupo, ig
+
+
+def rejilla():
+    """Combinaciones de F200, LL e IP que cruzan todos los límites de las reglas"""
+    finos = np.arange(0, 100.5, 2.5)
+    ll = np.arange(0, 90.5, 2.5)
+    ip = np.arange(0, 50.5, 0.5)
+    F, LL, IP = np.meshgrid(finos, ll, ip, indexing='ij')
+    F, LL, IP = F.ravel(), LL.ravel(), IP.ravel()
+    fisico = IP <= LL
+    return F[fisico], LL[fisico], IP[fisico]
+
+
+def test_paridad_processor():
+    print("\n1. Paridad con ClasificacionProcessor (sin tamices N° 10/N° 40)")
+    F, LL, IP = rejilla()
+    codigos, ig = clasificar_aashto_lote(F, LL, IP)
+    motor = describir_aashto(codigos, ig)
+
+    diferencias = 0
+    for f, ll, ip, resultado in zip(F.tolist(), LL.tolist(), IP.tolist(), motor):
+        esperado = referencia_processor(f, ll, ip)
+        if {k: resultado[k] for k in esperado} != esperado:
+            diferencias += 1
+            if diferencias <= 5:
+                print(f"   ❌ F={f} LL={ll} IP={ip}: {resultado} != {esperado}")
+
+    assert diferencias == 0, f"{diferencias} diferencias con ClasificacionProcessor"
+    print(f"   ✅ {len(F)} combinaciones idénticas")
+
+
+def test_paridad_legado():
+    print("\n2. Comparación con el ETL legado")
+    F, LL, IP = rejilla()
+    codigos, ig = clasificar_aashto_lote(F, LL, IP)
+    motor = describir_aashto(codigos, ig)
+
+    coinciden = 0
+    discrepancias = Counter()
+    for f, ll, ip, resultado in zip(F.tolist(), LL.tolist(), IP.tolist(), motor):
+        legado = referencia_legado(f, ll, ip)
+        procesador = referencia_processor(f, ll, ip)
+        grupo_motor = resultado['grupo'].split(' ')[0]
+
+        # Donde las dos implementaciones antiguas coincidían, el motor debe coincidir con ambas
+        if legado == (procesador['grupo'].split(' ')[0], procesador['indice_grupo']):
+            assert (grupo_motor, resultado['indice_grupo']) == legado, (f, ll, ip, resultado, legado)
+            coinciden += 1
+        else:
+            discrepancias[(f"{legado[0]} ({legado[1]})", resultado['grupo'])] += 1
+
+    print(f"   ✅ {coinciden} combinaciones donde las implementaciones antiguas coincidían: idénticas")
+    print(f"   ℹ️  {sum(discrepancias.values())} combinaciones donde el legado difería (legado → motor):")
+    for (legado, motor_grupo), n in discrepancias.most_common(8):
+        print(f"      {legado:<11} → {motor_grupo:<11} {n}")
+
+
+def test_tamices():
+    print("\n3. Criterios completos con tamices N° 10 y N° 40")
+    casos = [
+        # (F200, LL, IP, p10, p40, grupo esperado)
+        (10, 0, 0, 40, 20, 'A-1-a'),
+        (20, 25, 4, 80, 45, 'A-1-b'),
+        (8, 0, 0, 100, 90, 'A-3'),
+        (30, 35, 8, 100, 80, 'A-2-4'),
+        (30, 45, 8, 100, 80, 'A-2-5'),
+        (30, 35, 15, 100, 80, 'A-2-6'),
+        (30, 50, 15, 100, 80, 'A-2-7'),
+        (60, 35, 15, 100, 95, 'A-6'),
+    ]
+    F, LL, IP, P10, P40, esperados = zip(*casos)
+    codigos, ig = clasificar_aashto_lote(F, LL, IP, P10, P40)
+    for caso, resultado in zip(casos, describir_aashto(codigos, ig)):
+        grupo = resultado['grupo'].split(' ')[0]
+        assert grupo == caso[-1], (caso, resultado)
+        print(f"   ✅ F={caso[0]} LL={caso[1]} IP={caso[2]} N°10={caso[3]} N°40={caso[4]}: {resultado['grupo']}")
+
+
+def test_lote_valores_invalidos():
+    print("\n4. Lote con valores no numéricos")
+    resultados = AashtoProcessor().clasificar_lote([
+        {'id': 'M-1', 'finos': 60, 'll': 35, 'ip': 15},
+        {'id': 'M-2', 'finos': 'N/D', 'll': 35, 'ip': 15},
+        {'id': 'M-3', 'finos': '60', 'll': 35, 'ip': 15},
+    ])
+    assert resultados[0]['grupo'].startswith('A-6') and resultados[0]['error'] is None, resultados[0]
+    assert 'grupo' not in resultados[1] and 'finos' in resultados[1]['error'], resultados[1]
+    assert resultados[2]['grupo'] == resultados[0]['grupo'], resultados[2]
+    for r in resultados:
+        print(f"   ✅ {r['id']}: {r.get('grupo')} (error: {r['error']})")
+
+
+def test_rendimiento():
+    print("\n5. Reclasificación de un proyecto grande")
+    rng = np.random.default_rng(0)
+    n = 10000
+    muestras = [{'finos': f, 'll': ll, 'ip': ip}
+                for f, ll, ip in zip(rng.uniform(0, 100, n), rng.uniform(10, 80, n), rng.uniform(0, 40, n))]
+
+    t0 = time.perf_counter()
+    codigos, ig = clasificar_aashto_lote(*(np.array([m[c] for m in muestras]) for c in ('finos', 'll', 'ip')))
+    t_motor = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    AashtoProcessor().clasificar_lote(muestras)
+    t_lote = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for m in muestras:
+        referencia_processor(m['finos'], m['ll'], m['ip'])
+    t_escalar = time.perf_counter() - t0
+
+    print(f"   Motor (códigos):        {t_motor * 1000:8.2f} ms")
+    print(f"   Lote con descripciones: {t_lote * 1000:8.2f} ms")
+    print(f"   Escalar (referencia):   {t_escalar * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("PRUEBA DE CLASIFICACIÓN AASHTO VECTORIZADA")
+    print("=" * 60)
+    test_paridad_processor()
+    test_paridad_legado()
+    test_tamices()
+    test_lote_valores_invalidos()
+    test_rendimiento()
+    print("\n✅ Todas las comprobaciones pasaron")
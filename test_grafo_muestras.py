@@ -0,0 +1,113 @@
+"""
+Script para comprobar el grafo incremental de cálculo por muestra
+
+Carga los ensayos de Limites de Atterberg.xlsx en GrafoMuestras, edita
+recipientes de LL y LP y comprueba que solo se recalculan los nodos aguas
+abajo de la edición, que la propagación se corta cuando el IP no cambia y
+que los valores de los nodos coinciden con AtterbergProcessor y con los
+motores SUCS y AASHTO.
+"""
+
+import os
+
+from backend.etl.atterberg_etl import AtterbergETL
+from backend.processors.grafo_muestras import GrafoMuestras, REGLAS_MUESTRA
+from backend.processors.atterberg_processor import AtterbergProcessor
+from backend.processors.sucs_processor import SucsProcessor
+from backend.processors.aashto_processor import AashtoProcessor
+
+
+RUTA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Data', 'Limites de Atterberg.xlsx')
+
+# Fracciones explícitas para que la muestra llegue a clasificarse
+FRACCIONES = {'grava': 10.0, 'arena': 30.0, 'finos': 60.0}
+
+
+def grafo_contado():
+    """Grafo cuyas reglas anotan qué nodos se recalculan"""
+    calculados = []
+
+    def contar(nombre, funcion):
+        def envoltura(*args):
+            calculados.append(nombre)
+            return funcion(*args)
+        return envoltura
+
+    reglas = [(nombre, dependencias, contar(nombre, funcion)) for nombre, dependencias, funcion in REGLAS_MUESTRA]
+    return GrafoMuestras(reglas), calculados
+
+
+def entradas_libro():
+    datos = AtterbergETL(RUTA).load_data()
+    assert datos, "No se pudieron leer los ensayos de Atterberg"
+    return GrafoMuestras.entradas_atterberg(datos)
+
+
+def test_edicion_lp():
+    print("\n1. Editar un recipiente de LP")
+    grafo, calculados = grafo_contado()
+    grafo.cargar('M-1', **entradas_libro())
+    antes = grafo.valores('M-1')
+    calculados.clear()
+
+    ensayo = antes['ensayos_lp'][0]
+    cambios = grafo.editar_ensayo('M-1', 'lp', 0, recipiente_suelo_s=ensayo['recipiente_suelo_s'] - 0.05)
+
+    assert set(cambios) == {'w_lp', 'lp', 'ip'}, cambios
+    # Sin fracciones no hay clasificación: se evalúan pero siguen en None
+    assert set(calculados) == {'w_lp', 'lp', 'ip', 'sucs', 'clasificacion_aashto'}, calculados
+    assert grafo.valor('M-1', 'll') == antes['ll'] and grafo.valor('M-1', 'w_ll') == antes['w_ll']
+    print(f"   ✅ Cambiaron {sorted(cambios)}; LP {antes['lp']} → {cambios['lp']}, IP {antes['ip']} → {cambios['ip']}")
+
+
+def test_ip_sin_cambios():
+    print("\n2. Edición que no altera el IP")
+    grafo, calculados = grafo_contado()
+    grafo.cargar('M-1', **entradas_libro(), **FRACCIONES)
+    antes = grafo.valores('M-1')
+    recalculos = grafo.recalculos
+    calculados.clear()
+
+    # Mismos recipientes en otro orden: cambia w_lp, no el promedio
+    cambios = grafo.editar('M-1', ensayos_lp=antes['ensayos_lp'][::-1])
+
+    assert set(cambios) == {'w_lp'}, cambios
+    assert calculados == ['w_lp', 'lp'], calculados
+    assert grafo.recalculos - recalculos == 2
+    assert grafo.valor('M-1', 'sucs') == antes['sucs'] and grafo.valor('M-1', 'aashto') == antes['aashto']
+    print(f"   ✅ Solo {calculados} recalculados; SUCS {antes['sucs']} y AASHTO {antes['aashto']} intactos")
+
+
+def test_paridad():
+    print("\n3. Valores de los nodos frente a los procesadores")
+    grafo = GrafoMuestras()
+    entradas = entradas_libro()
+    grafo.cargar('M-1', **entradas, **FRACCIONES)
+    # Editar un recipiente de LL para comparar también tras un recálculo parcial
+    grafo.editar_ensayo('M-1', 'll', 1, recipiente_suelo_h=entradas['ensayos_ll'][1]['recipiente_suelo_h'] + 0.5)
+    valores = grafo.valores('M-1')
+    assert not grafo.errores('M-1'), grafo.errores('M-1')
+
+    processor = AtterbergProcessor()
+    puntos = [{'golpes': e['n_golpes'], 'humedad': w} for e, w in zip(valores['ensayos_ll'], valores['w_ll'])]
+    ll = processor.calcular_limite_liquido_lote([{'puntos': puntos}])[0]['limite_liquido']
+    lp = processor.calcular_limite_plastico(valores['w_lp'])
+    ip = processor.calcular_indice_plasticidad(ll, lp)['ip']
+    assert (valores['ll'], valores['lp'], valores['ip']) == (ll, lp, ip), (valores['ll'], valores['lp'], valores['ip'], ll, lp, ip)
+
+    muestra = dict(FRACCIONES, ll=ll, ip=ip)
+    sucs = SucsProcessor().clasificar_lote([muestra])[0]
+    aashto = AashtoProcessor().clasificar_lote([muestra])[0]
+    assert valores['sucs'] == sucs['simbolo'], (valores['sucs'], sucs)
+    assert valores['aashto'] == aashto['grupo'].split(' ')[0] and valores['ig'] == aashto['indice_grupo'], aashto
+    print(f"   ✅ LL={ll} LP={lp} IP={ip} → SUCS {valores['sucs']}, AASHTO {valores['aashto']} (IG {valores['ig']})")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("PRUEBA DEL GRAFO INCREMENTAL POR MUESTRA")
+    print("=" * 60)
+    test_edicion_lp()
+    test_ip_sin_cambios()
+    test_paridad()
+    print("\n✅ Todas las comprobaciones pasaron")
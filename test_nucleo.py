@@ -0,0 +1,283 @@
+"""
+Script para comprobar el núcleo numérico compartido (backend/nucleo)
+
+Compara el núcleo, y las capas que ahora lo llaman (procesadores del backend
+y ETL legado), con las implementaciones escalares que reemplaza, copiadas
+aquí tal como estaban, y mide el camino por lotes frente al escalar.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.interpolate import interp1d
+
+from backend import nucleo
+from backend.etl.atterberg_etl import AtterbergETL as AtterbergETLBackend
+from backend.processors.humedad_processor import HumedadProcessor
+from backend.processors.atterberg_processor import AtterbergProcessor
+from etl.atterberg_etl import AtterbergETL
+from etl.data_processor import DataProcessor
+
+
+# ----------------------------------------------------------------------------
+# Implementaciones anteriores al núcleo
+# ----------------------------------------------------------------------------
+
+def referencia_humedad(peso_recipiente, peso_humedo, peso_seco):
+    """HumedadProcessor.calcular_humedad / DataProcessor.calculate_moisture_content"""
+    if peso_humedo <= peso_recipiente:
+        return 'El peso húmedo debe ser mayor que el peso del recipiente'
+    if peso_seco <= peso_recipiente:
+        return 'El peso seco debe ser mayor que el peso del recipiente'
+    if peso_seco > peso_humedo:
+        return 'El peso seco debe ser menor que el peso húmedo'
+
+    peso_agua = peso_humedo - peso_seco
+    peso_suelo_seco = peso_seco - peso_recipiente
+    humedad = (peso_agua / peso_suelo_seco) * 100
+    if humedad < 10:
+        clasificacion = 'Muy Seco'
+    elif humedad < 20:
+        clasificacion = 'Seco'
+    elif humedad < 30:
+        clasificacion = 'Húmedo'
+    else:
+        clasificacion = 'Muy Húmedo'
+    return round(humedad, 2), round(peso_agua, 2), round(peso_suelo_seco, 2), clasificacion
+
+
+def referencia_ll_polyfit(ll_data):
+    """etl.atterberg_etl._calculate_liquid_limit"""
+    golpes = np.array([p[0] for p in ll_data])
+    humedad = np.array([p[1] for p in ll_data])
+    coeffs = np.polyfit(np.log10(golpes), humedad, 1)
+    return round(coeffs[0] * np.log10(25) + coeffs[1], 2)
+
+
+def referencia_ll_interp(datos):
+    """AtterbergProcessor.calcular_limite_liquido / generar_curva_fluidez (interp1d)"""
+    golpes = [d['golpes'] for d in datos]
+    humedades = [d['humedad'] for d in datos]
+    f = interp1d(np.log10(golpes), humedades, kind='linear', fill_value='extrapolate')
+    return round(float(f(np.log10(25))), 2)
+
+
+def referencia_plasticidad(ip):
+    """AtterbergProcessor.calcular_indice_plasticidad (IP > 0)"""
+    if ip < 7:
+        return 'Baja Plasticidad'
+    elif ip < 17:
+        return 'Media Plasticidad'
+    return 'Alta Plasticidad'
+
+
+def referencia_fases(Wt, Vt, w, Gs):
+    """DataProcessor.calculate_soil_phases (sin redondeo)"""
+    w = w / 100
+    Ws = Wt / (1 + w)
+    Ww = Wt - Ws
+    Vs = Ws / Gs
+    Vw = Ww
+    Vv = Vt - Vs
+    return {
+        'solidos': Ws, 'agua': Ww, 'vacios': Vv, 'aire': Vv - Vw,
+        'relacion_vacios': Vv / Vs, 'porosidad': Vv / Vt * 100, 'saturacion': Vw / Vv * 100,
+        'seca': Ws / Vt, 'saturada': (Ws + Vv) / Vt
+    }
+
+
+def muestras_fluidez(n, rng):
+    """Ensayos de LL con 2 a 6 puntos que rodean a 25 golpes"""
+    muestras = []
+    for _ in range(n):
+        puntos = rng.integers(2, 7)
+        golpes = np.sort(rng.choice(np.arange(10, 45), puntos, replace=False))
+        golpes[0], golpes[-1] = min(golpes[0], 20), max(golpes[-1], 30)
+        ll = rng.uniform(20, 90)
+        humedad = ll - rng.uniform(5, 25) * np.log10(golpes / 25) + rng.normal(0, 0.8, puntos)
+        muestras.append([{'golpes': int(g), 'humedad': round(float(w), 2)} for g, w in zip(golpes, humedad)])
+    return muestras
+
+
+# ----------------------------------------------------------------------------
+# Paridad
+# ----------------------------------------------------------------------------
+
+def test_paridad_humedad():
+    print("\n1. Humedad: núcleo vs. procesador y ETL legado anteriores")
+    pesos = np.arange(10, 60, 2.5)
+    R, H, S = (v.ravel() for v in np.meshgrid(pesos, pesos, pesos, indexing='ij'))
+
+    processor = HumedadProcessor()
+    legado = DataProcessor()
+    lote = processor.calcular_humedad_lote({'peso_recipiente': R, 'peso_humedo': H, 'peso_seco': S})
+
+    for r, h, s, fila in zip(R.tolist(), H.tolist(), S.tolist(), lote):
+        esperado = referencia_humedad(r, h, s)
+        if isinstance(esperado, str):
+            assert fila['error'] == esperado, (r, h, s, fila)
+            assert legado.calculate_moisture_content({'peso_recipiente': r, 'peso_humedo': h, 'peso_seco': s})['error'] == esperado
+            continue
+        obtenido = (fila['humedad'], fila['peso_agua'], fila['peso_suelo_seco'], fila['clasificacion'])
+        assert obtenido == esperado, (r, h, s, obtenido, esperado)
+
+    # Los caminos escalares sobre una muestra de casos válidos
+    for r, h, s in [(10.0, 50.0, 45.0), (12.5, 80.0, 60.0), (20.0, 21.0, 20.5)]:
+        esperado = referencia_humedad(r, h, s)
+        escalar = processor.calcular_humedad(r, h, s)
+        legacy = legado.calculate_moisture_content({'peso_recipiente': r, 'peso_humedo': h, 'peso_seco': s})
+        for resultado in (escalar, legacy):
+            assert (resultado['humedad'], resultado['peso_agua'], resultado['peso_suelo_seco'],
+                    resultado['clasificacion']) == esperado
+    print(f"   ✅ {len(R)} combinaciones de pesos idénticas (incluidos los mensajes de error)")
+
+
+def test_paridad_limite_liquido():
+    print("\n2. Límite líquido: recta de fluidez en lote, interpolación en el escalar")
+    rng = np.random.default_rng(0)
+    muestras = muestras_fluidez(3000, rng)
+
+    processor = AtterbergProcessor()
+    legado = AtterbergETL('')
+    lote = processor.calcular_limite_liquido_lote([{'puntos': m} for m in muestras])
+
+    dos_puntos = diferentes = 0
+    for muestra, resultado in zip(muestras, lote):
+        polyfit = referencia_ll_polyfit([(p['golpes'], p['humedad']) for p in muestra])
+        assert resultado['limite_liquido'] == polyfit, (muestra, resultado, polyfit)
+        assert legado._calculate_liquid_limit([(p['golpes'], p['humedad']) for p in muestra]) == polyfit
+
+        # El endpoint de una muestra conserva interp1d, que coincide con la recta solo con 2 puntos
+        assert processor.calcular_limite_liquido(muestra) == referencia_ll_interp(muestra)
+        assert processor.generar_curva_fluidez(muestra)['limite_liquido'] == referencia_ll_interp(muestra)
+        if len(muestra) == 2:
+            assert referencia_ll_interp(muestra) == polyfit
+            dos_puntos += 1
+        elif referencia_ll_interp(muestra) != polyfit:
+            diferentes += 1
+
+    print(f"   ✅ {len(muestras)} ensayos: lote y ETL legado = polyfit del ETL legado; escalar = interp1d")
+    print(f"   ✅ {dos_puntos} ensayos de 2 puntos: ambos métodos coinciden")
+    print(f"   ℹ️  {diferentes} ensayos de 3+ puntos donde interp1d (tramo entre vecinos) difería de la recta")
+
+
+def test_paridad_plasticidad():
+    print("\n3. Límite plástico, IP y clase de plasticidad")
+    processor = AtterbergProcessor()
+    legado = AtterbergETL('')
+    rng = np.random.default_rng(1)
+
+    for _ in range(500):
+        humedades = rng.uniform(10, 40, rng.integers(1, 5)).round(2).tolist()
+        esperado = round(np.mean(humedades), 2)
+        assert processor.calcular_limite_plastico(humedades) == esperado
+        assert legado._calculate_plastic_limit(humedades) == esperado
+
+    nombres_legado = {'Baja Plasticidad': 'Baja plasticidad', 'Media Plasticidad': 'Media plasticidad',
+                      'Alta Plasticidad': 'Alta plasticidad'}
+    for ip in np.arange(0.25, 60, 0.25).tolist():
+        esperado = referencia_plasticidad(ip)
+        assert processor.calcular_indice_plasticidad(20 + ip, 20)['clasificacion'] == esperado
+        assert legado._classify_plasticity(ip) == nombres_legado[esperado]
+    assert processor.calcular_indice_plasticidad(20, 25)['ip'] == 0
+    assert legado._classify_plasticity(0) == 'No plástico'
+    print("   ✅ LP, IP y clases idénticos en procesador y ETL legado")
+
+
+def test_paridad_fases():
+    print("\n4. Relaciones de fases del ETL legado con el resolvedor del núcleo")
+    rng = np.random.default_rng(2)
+    legado = DataProcessor()
+    for Wt, Vt, w, Gs in zip(rng.uniform(100, 400, 500), rng.uniform(60, 200, 500),
+                             rng.uniform(0, 40, 500), rng.uniform(2.55, 2.8, 500)):
+        resultado = legado.calculate_soil_phases({'peso_total': Wt, 'volumen_total': Vt,
+                                                  'humedad': w, 'gravedad_especifica': Gs})
+        esperado = referencia_fases(Wt, Vt, w, Gs)
+        obtenido = {
+            'solidos': resultado['pesos']['solidos'], 'agua': resultado['pesos']['agua'],
+            'vacios': resultado['volumenes']['vacios'], 'aire': resultado['volumenes']['aire'],
+            **resultado['relaciones_volumetricas'],
+            'seca': resultado['densidades']['seca'], 'saturada': resultado['densidades']['saturada']
+        }
+        for clave, valor in obtenido.items():
+            decimales = 3 if clave in ('relacion_vacios', 'seca', 'saturada') else 2
+            assert abs(valor - esperado[clave]) <= 10 ** -decimales, (clave, valor, esperado[clave])
+    print("   ✅ 500 probetas: mismas magnitudes (al redondeo del informe)")
+
+
+def test_paridad_etl_backend():
+    print("\n5. w% de los ensayos del ETL del backend")
+    rng = np.random.default_rng(3)
+    r = rng.uniform(10, 20, 1000).round(2)
+    s = (r + rng.uniform(0, 30, 1000)).round(2)
+    s[::50] = r[::50]  # sin suelo seco
+    h = (s + rng.uniform(0, 15, 1000)).round(2)
+    tabla = pd.DataFrame({'ensayo': np.arange(1, 1001), 'recipiente': r,
+                          'recipiente_suelo_h': h, 'recipiente_suelo_s': s})
+    ensayos = AtterbergETLBackend._calcular_ensayos(tabla, 'Límite Líquido')
+
+    ws = s - r
+    esperado = np.round(np.where(ws != 0, (h - s) / np.where(ws != 0, ws, 1) * 100, 0.0), 2)
+    assert np.array_equal([e['w_percent'] for e in ensayos], esperado)
+    print("   ✅ 1000 ensayos idénticos (0 % donde no hay suelo seco)")
+
+
+# ----------------------------------------------------------------------------
+# Microbenchmarks
+# ----------------------------------------------------------------------------
+
+def medir(funcion, repeticiones=3):
+    mejor = np.inf
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor
+
+
+def test_rendimiento():
+    print("\n6. Lote del núcleo frente a los caminos escalares anteriores (10 000 muestras)")
+    rng = np.random.default_rng(4)
+    n = 10000
+
+    r = rng.uniform(10, 20, n)
+    s = r + rng.uniform(5, 30, n)
+    h = s + rng.uniform(0, 15, n)
+    t_escalar = medir(lambda: [referencia_humedad(a, b, c) for a, b, c in zip(r.tolist(), h.tolist(), s.tolist())])
+    t_nucleo = medir(lambda: (nucleo.errores_humedad(r, h, s), nucleo.clase_humedad(nucleo.contenido_humedad(r, h, s)[0])))
+    print(f"   Humedad        escalar {t_escalar * 1000:8.2f} ms   núcleo {t_nucleo * 1000:7.2f} ms   x{t_escalar / t_nucleo:6.1f}")
+
+    muestras = muestras_fluidez(n, rng)
+    pares = [[(p['golpes'], p['humedad']) for p in m] for m in muestras]
+    golpes = nucleo.matriz([[p['golpes'] for p in m] for m in muestras])
+    humedad = nucleo.matriz([[p['humedad'] for p in m] for m in muestras])
+    t_polyfit = medir(lambda: [referencia_ll_polyfit(p) for p in pares], 1)
+    t_interp = medir(lambda: [referencia_ll_interp(m) for m in muestras], 1)
+    t_nucleo = medir(lambda: nucleo.ajustar_fluidez(golpes, humedad))
+    print(f"   LL (polyfit)   escalar {t_polyfit * 1000:8.2f} ms   núcleo {t_nucleo * 1000:7.2f} ms   x{t_polyfit / t_nucleo:6.1f}")
+    print(f"   LL (interp1d)  escalar {t_interp * 1000:8.2f} ms   núcleo {t_nucleo * 1000:7.2f} ms   x{t_interp / t_nucleo:6.1f}")
+
+    ip = rng.uniform(0.1, 60, n)
+    t_escalar = medir(lambda: [referencia_plasticidad(v) for v in ip.tolist()])
+    t_nucleo = medir(lambda: nucleo.clase_plasticidad(ip))
+    print(f"   Plasticidad    escalar {t_escalar * 1000:8.2f} ms   núcleo {t_nucleo * 1000:7.2f} ms   x{t_escalar / t_nucleo:6.1f}")
+
+    Wt, Vt, w, Gs = rng.uniform(100, 400, n), rng.uniform(60, 200, n), rng.uniform(0, 40, n), rng.uniform(2.55, 2.8, n)
+    t_escalar = medir(lambda: [referencia_fases(*v) for v in zip(Wt.tolist(), Vt.tolist(), w.tolist(), Gs.tolist())])
+    t_nucleo = medir(lambda: nucleo.resolver_fases({'peso_total': Wt, 'volumen_total': Vt,
+                                                    'humedad': w / 100, 'gravedad_especifica': Gs}))
+    print(f"   Fases          escalar {t_escalar * 1000:8.2f} ms   núcleo {t_nucleo * 1000:7.2f} ms   x{t_escalar / t_nucleo:6.1f}")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("PRUEBA DEL NÚCLEO NUMÉRICO COMPARTIDO")
+    print("=" * 60)
+    test_paridad_humedad()
+    test_paridad_limite_liquido()
+    test_paridad_plasticidad()
+    test_paridad_fases()
+    test_paridad_etl_backend()
+    test_rendimiento()
+    print("\n✅ Todas las comprobaciones pasaron")
@@ -0,0 +1,119 @@
+"""
+Script para comprobar la rejilla precalculada de clasificación SUCS / AASHTO
+
+Compara RejillaClasificacion.consultar con los motores exactos
+(consultar_exacto) sobre un barrido aleatorio de 200 000 puntos, puntos
+sobre las fronteras de las reglas y puntos fuera de la rejilla o sin datos
+(que deben quedar sin clasificar), y mide el tiempo de ambas consultas.
+"""
+
+import time
+
+import numpy as np
+
+from backend.processors.rejilla_clasificacion import (
+    EXACTO, CargadorRejilla, RejillaClasificacion, consultar_exacto, describir_consulta
+)
+
+
+REJILLA = RejillaClasificacion()
+
+
+def comparar(finos, ll, ip, grava):
+    """Número de diferencias por sistema entre la rejilla y los motores exactos"""
+    rejilla = REJILLA.consultar(finos, ll, ip, grava)
+    exacto = consultar_exacto(finos, ll, ip, grava)
+    return {clave: int((rejilla[clave] != exacto[clave]).sum()) for clave in ('sucs', 'aashto', 'indice_grupo')}
+
+
+def test_barrido_aleatorio():
+    print("\n1. Barrido aleatorio de 200 000 puntos")
+    rng = np.random.default_rng(0)
+    n = 200000
+    finos, ll, ip = rng.uniform(0, 100, n), rng.uniform(0, 120, n), rng.uniform(0, 80, n)
+    grava = rng.random(n) < 0.5
+
+    diferencias = comparar(finos, ll, ip, grava)
+    assert not any(diferencias.values()), diferencias
+    print(f"   ✅ Sin diferencias ({REJILLA.fraccion_exacta()} de celdas exactas)")
+
+
+def test_fronteras():
+    print("\n2. Puntos sobre las fronteras de las reglas")
+    # Valores redondos (caen en nodos de la rejilla) y sobre la línea A
+    finos = np.repeat([4.0, 5.0, 10.0, 12.0, 15.0, 25.0, 35.0, 50.0, 50.5], 40)
+    ll = np.tile(np.arange(0.0, 120.0, 3.0), 9)
+    ip = np.clip(0.73 * (ll - 20), 0, 80)
+    for grava in (False, True):
+        for desplazamiento in (0.0, 4.0, 7.0):
+            diferencias = comparar(finos, ll, np.minimum(ip + desplazamiento, 80), grava)
+            assert not any(diferencias.values()), (grava, desplazamiento, diferencias)
+    print(f"   ✅ {len(finos) * 6} puntos sin diferencias")
+
+
+def test_fuera_de_rango():
+    print("\n3. Puntos fuera de la rejilla y sin datos")
+    finos = np.array([-1.0, 101.0, 60.0, 60.0, np.nan, 60.0])
+    ll = np.array([30.0, 30.0, 150.0, 30.0, 30.0, np.nan])
+    ip = np.array([10.0, 10.0, 10.0, 95.0, 10.0, 10.0])
+    diferencias = comparar(finos, ll, ip, False)
+    assert not any(diferencias.values()), diferencias
+    assert REJILLA.consultar(finos, ll, ip)['exactos'] == len(finos)
+    print(f"   ✅ {describir_consulta(REJILLA.consultar(finos, ll, ip))['sucs']}")
+
+
+def test_sin_datos():
+    print("\n4. Puntos sin finos, LL o IP")
+    finos = np.array([np.nan, 60.0, 8.0, 60.0])
+    ll = np.array([20.0, np.nan, 30.0, 40.0])
+    ip = np.array([5.0, 10.0, np.nan, 20.0])
+    for consulta in (REJILLA.consultar(finos, ll, ip), consultar_exacto(finos, ll, ip)):
+        salida = describir_consulta(consulta)
+        assert salida['sucs'] == [None, None, None, 'CL'], salida
+        assert salida['aashto'] == [None, None, None, 'A-6'], salida
+        assert salida['indice_grupo'][:3] == [0, 0, 0], salida
+    print(f"   ✅ {describir_consulta(REJILLA.consultar(finos, ll, ip))}")
+
+
+def test_cargador():
+    print("\n5. Carga bajo demanda")
+    cargador = CargadorRejilla(None, finos=(0.0, 100.0, 5.0), ll=(0.0, 120.0, 5.0), ip=(0.0, 80.0, 5.0))
+    cargador.obtener()
+    cargador._hilo.join()
+    rejilla = cargador.obtener()
+    assert rejilla is not None and rejilla.capas['aashto'].shape == (20, 24, 16)
+    assert (rejilla.capas['aashto'] == EXACTO).any()
+    print(f"   ✅ Rejilla de {len(rejilla)} celdas cargada en segundo plano")
+
+
+def test_rendimiento():
+    print("\n6. Rejilla frente a motores exactos")
+    rng = np.random.default_rng(1)
+    for n in (100, 5000, 200000):
+        finos, ll, ip = rng.uniform(0, 100, n), rng.uniform(0, 120, n), rng.uniform(0, 80, n)
+        repeticiones = max(1, 20000 // n)
+
+        t0 = time.perf_counter()
+        for _ in range(repeticiones):
+            REJILLA.consultar(finos, ll, ip)
+        t_rejilla = (time.perf_counter() - t0) / repeticiones
+
+        t0 = time.perf_counter()
+        for _ in range(repeticiones):
+            consultar_exacto(finos, ll, ip)
+        t_exacto = (time.perf_counter() - t0) / repeticiones
+
+        print(f"   {n:>7} puntos: rejilla {t_rejilla * 1000:8.2f} ms, exacto {t_exacto * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("PRUEBA DE LA REJILLA DE CLASIFICACIÓN")
+    print("=" * 60)
+    test_barrido_aleatorio()
+    test_fronteras()
+    test_fuera_de_rango()
+    test_sin_datos()
+    test_cargador()
+    test_rendimiento()
+    print("\n✅ Todas las comprobaciones pasaron")
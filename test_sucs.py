@@ -0,0 +1,34 @@
+"""
+Script para comprobar SucsProcessor.clasificar_lote con datos de entrada sucios
+
+Un lote válido con una muestra que trae un valor no numérico ('NP', '12,5')
+debe clasificar el resto de muestras e indicar el problema solo en el
+'error' de esa muestra.
+"""
+
+from backend.processors.sucs_processor import SucsProcessor
+
+
+def test_lote_valores_invalidos():
+    print("\n1. Lote con valores no numéricos")
+    resultados = SucsProcessor().clasificar_lote([
+        {'id': 'M-1', 'grava': 10, 'arena': 30, 'finos': 60, 'll': 40, 'ip': 20},
+        {'id': 'M-2', 'grava': '12,5', 'arena': 27.5, 'finos': 60, 'll': 40, 'ip': 20},
+        {'id': 'M-3', 'grava': 10, 'arena': 30, 'finos': 60, 'll': 'NP', 'ip': 20},
+        {'id': 'M-4', 'grava': '10', 'arena': '30', 'finos': '60', 'll': '40', 'ip': '20'},
+    ])
+    assert resultados[0]['simbolo'] == 'CL' and resultados[0]['error'] is None, resultados[0]
+    assert 'simbolo' not in resultados[1] and 'grava' in resultados[1]['error'], resultados[1]
+    # Sin LL el suelo fino se queda en M/C, con el valor rechazado en el error
+    assert resultados[2]['simbolo'] == 'M/C' and 'll' in resultados[2]['error'], resultados[2]
+    assert resultados[3]['simbolo'] == 'CL' and resultados[3]['error'] is None, resultados[3]
+    for r in resultados:
+        print(f"   ✅ {r['id']}: {r.get('simbolo')} (error: {r['error']})")
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("PRUEBA DEL CLASIFICADOR SUCS POR LOTES")
+    print("=" * 60)
+    test_lote_valores_invalidos()
+    print("\n✅ Todas las comprobaciones pasaron")